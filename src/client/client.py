@@ -20,15 +20,19 @@ class Client:
         self.host = host
         self.is_connected = False
         self.sock = None
+        # Given by the REST login, presented in the first frame
+        self.session_token: Optional[str] = None
 
     # pylint: disable=broad-exception-caught
     def init_connection(self) -> None:
         """
-        Init socket connection
+        Init socket connection, the session is started by the first frame
         """
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.sock.connect((self.host, self.port))
+            if self.session_token:
+                self.send_data(Commands.SESSION, self.session_token)
             self.is_connected = True
         except Exception as error:
             logging.error(error)
@@ -1,13 +1,25 @@
 """Module for api controller"""
 
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, unique
-from functools import lru_cache
-from typing import Callable, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import requests
 
 from src.client.controller import global_variables
 from src.client.controller.event_manager import EventManager
-from src.client.view.custom_widget.custom_avatar_label import AvatarStatus
-from src.tools.utils import Themes
+from src.client.view.custom_widget.avatar_decoder import AvatarDecoder
+from src.client.view.custom_widget.custom_avatar_label import (
+    AvatarStatus,
+    avatar_pixmap_cache,
+)
+from src.tools.constant import AVATAR_DECODE_SIZES, AVATAR_FRAME_BUDGET, MAX_SYNC_GAP
+from src.tools.message_store import MessageStore
+from src.tools.single_flight import SingleFlight
+from src.tools.user_directory import UserDirectory
+from src.tools.utils import theme
 
 
 @unique
@@ -22,18 +34,26 @@ class ApiStatus(Enum):
     FORBIDDEN = 403
 
 
-theme = Themes()
-
-
+# pylint: disable=too-many-public-methods
+# pylint: disable=too-many-instance-attributes
 class ApiController:
     """
     Api controller class.
     """
 
+    PICTURES_WORKERS = 8
+    SYNC_PAGE_SIZE = 50
+
     def __init__(self, ui, event_manager: EventManager) -> None:
         self.ui = ui
         self.is_connected = False
         self.event_manager = event_manager
+        self.message_store: Optional[MessageStore] = None
+        self.reply_flight = SingleFlight()
+        self.user_directory = UserDirectory()
+        self.avatar_decoder = AvatarDecoder(
+            avatar_pixmap_cache, AVATAR_DECODE_SIZES, AVATAR_FRAME_BUDGET
+        )
 
     def send_form(self, callback: Callable) -> bool:
         """
@@ -50,7 +70,7 @@ class ApiController:
             return ApiStatus.FORBIDDEN
 
         # Send login form to the server
-        status_code, is_connected = callback(username, password)
+        status_code, is_connected, session_token = callback(username, password)
 
         # Check if the login is successful and if the user is not already connected
         if status_code != 200 or is_connected:
@@ -58,6 +78,12 @@ class ApiController:
 
         self.ui.client.user_name = username
 
+        # The server marks the user as connected from the first frame of the session
+        self.ui.client.session_token = session_token
+        if session_token:
+            self.is_connected = True
+            return ApiStatus.SUCCESS
+
         # Update login status to connected
         if self.send_login_status(username=username, status=True):
             self.is_connected = True
@@ -86,18 +112,19 @@ class ApiController:
         """
         return self.ui.backend.get_last_message_id()
 
-    @lru_cache
-    def get_first_message_id(self, user1: str, user2: str) -> int:
+    def get_rooms(self) -> List[str]:
         """
-        Backend request for getting first message id
-
-        Args:
-            username (str): username
+        Get the rooms of the server, only the home room for older APIs
 
         Returns:
-            int: return first message id
+            List[str]: the room names
         """
-        return self.ui.backend.get_first_message_id(user1, user2)
+        try:
+            rooms = self.ui.backend.get_rooms()
+        except requests.exceptions.RequestException as error:
+            logging.error(error)
+            rooms = False
+        return rooms or ["home"]
 
     def get_user_icon(
         self,
@@ -117,7 +144,25 @@ class ApiController:
             username = self.ui.client.user_name
 
         # Get user icon from the server
-        if content := self.ui.backend.get_user_icon(username):
+        self.set_user_icon(
+            username, self.ui.backend.get_user_icon(username), update_personal_avatar
+        )
+
+    def set_user_icon(
+        self,
+        username: str,
+        content: Union[bool, bytes],
+        update_personal_avatar: Optional[bool] = False,
+    ) -> None:
+        """
+        Store a user icon fetched from the backend
+
+        Args:
+            username (str): username
+            content (Union[bool, bytes]): picture in bytes, False if not found
+            update_personal_avatar (Optional[bool], optional): Defaults to False.
+        """
+        if content:
             self.ui.users_pict[username] = content
 
             # Update the personnal avatar if True
@@ -131,13 +176,66 @@ class ApiController:
         else:
             self.ui.users_pict[username] = ""
 
-    def update_user_connected(self, username: str, content: bytes) -> None:
+    def fetch_picture(self, username: str) -> Union[bool, bytes]:
+        """
+        Backend request for the picture of a user, decoded in the calling thread
+
+        Args:
+            username (str): username
+
+        Returns:
+            Union[bool, bytes]: picture in bytes, False if not found
+        """
+        content = self.ui.backend.get_user_icon(username)
+        if content:
+            self.avatar_decoder.decode(content)
+        return content
+
+    def get_avatar(self, username: str) -> Optional[Union[str, bytes]]:
+        """
+        Picture of a user displayed on screen
+
+        Args:
+            username (str): username
+
+        Returns:
+            Optional[Union[str, bytes]]: the picture, empty if the user has none,
+            None if not fetched yet
+        """
+        return self.ui.users_pict.get(username)
+
+    def sync_user_directory(self) -> UserDirectory:
+        """
+        Update the local copy of the user directory with the changes since
+        its version, the whole directory is fetched by older APIs
+
+        Returns:
+            UserDirectory: the directory
+        """
+        directory = self.user_directory
+        directory.load()
+        if delta := self.ui.backend.get_users_delta(directory.version):
+            # Up to date
+            if delta["version"] == directory.version:
+                return directory
+            directory.apply_delta(delta)
+        elif usernames := self.ui.backend.get_all_users_username():
+            directory.replace(usernames)
+        else:
+            return directory
+        directory.save()
+        return directory
+
+    def update_user_connected(
+        self, username: str, content: bytes, notify: Optional[bool] = True
+    ) -> None:
         """
         Update global user variables with user content bytes
 
         Args:
             username (str): username
             content (bytes): picture in bytes
+            notify (Optional[bool], optional): emit the GUI events. Defaults to True.
         """
         if (
             username in self.ui.users_connected.keys()
@@ -148,8 +246,9 @@ class ApiController:
             self.ui.users_connected["username"] = False
             global_variables.user_disconnect[username] = [content, False]
 
-        self.event_manager.event_users_connected()
-        self.event_manager.event_users_disconnected()
+        if notify:
+            self.event_manager.event_users_connected()
+            self.event_manager.event_users_disconnected()
 
     def get_older_messages(
         self, start: int, number: int, user1: str, user2: str
@@ -166,12 +265,249 @@ class ApiController:
 
         return older_messages["messages"]
 
+    def open_message_store(self, username: str, last_message_id: Optional[int]) -> None:
+        """
+        Open the local store of the user, rebuilt if too far behind the server
+
+        Args:
+            username (str): username
+            last_message_id (Optional[int]): last message id of the server
+        """
+        try:
+            self.message_store = MessageStore(username)
+        except sqlite3.Error as error:
+            logging.error("Unable to open the message store: %s", error)
+            return
+
+        stored_id = self.message_store.get_last_message_id()
+        if not last_message_id or (
+            stored_id is not None and int(last_message_id) - stored_id > MAX_SYNC_GAP
+        ):
+            self.message_store.clear()
+
+    def close_message_store(self) -> None:
+        """
+        Close the local store of the user
+        """
+        if message_store := self.message_store:
+            self.message_store = None
+            message_store.close()
+
+    def get_local_messages(self, conversation: str, number: int) -> List[dict]:
+        """
+        Get the last messages of a conversation from the local store
+
+        Args:
+            conversation (str): the room or the user of the conversation
+            number (int): number of messages
+
+        Returns:
+            List[dict]: the messages, newest first
+        """
+        if not self.message_store:
+            return []
+        return self.message_store.get_last_messages(conversation, number)
+
+    def sync_conversation(
+        self, conversation: str, last_message_id: Optional[int], number: int
+    ) -> List[dict]:
+        """
+        Fetch the messages of a conversation newer than the local ones
+
+        Args:
+            conversation (str): the room or the user of the conversation
+            last_message_id (Optional[int]): last message id of the server
+            number (int): number of messages if nothing is stored
+
+        Returns:
+            List[dict]: the new messages, newest first
+        """
+        # In case of empty database
+        if not last_message_id:
+            return []
+
+        username = self.ui.client.user_name
+        start = int(last_message_id) + 1
+        message_store = self.message_store
+        if not message_store or not (
+            coverage := message_store.get_coverage(conversation)
+        ):
+            new_messages = self.get_older_messages(
+                start, number, username, conversation
+            )
+            if message_store:
+                message_store.add_page(conversation, new_messages, start, number)
+                message_store.synced_conversations.add(conversation)
+            return new_messages
+
+        _, stored_id, _ = coverage
+
+        # Page backward until the last stored message, ids are global so
+        # no more than start - 1 - last stored id messages are missing
+        new_messages, page_start, is_complete = [], start, False
+        while (missing := page_start - 1 - stored_id) > 0:
+            page_size = min(missing, self.SYNC_PAGE_SIZE)
+            messages = self.get_older_messages(
+                page_start, page_size, username, conversation
+            )
+            new_messages += messages
+            if len(messages) < page_size:
+                is_complete = True
+                break
+            page_start = messages[-1]["message_id"]
+
+        message_store.add_page(
+            conversation, new_messages, start, len(new_messages) + int(is_complete)
+        )
+        message_store.synced_conversations.add(conversation)
+        return [
+            message for message in new_messages if message["message_id"] > stored_id
+        ]
+
+    def get_history_page(
+        self, start: int, number: int, conversation: str
+    ) -> List[dict]:
+        """
+        Get the messages older than start, from the local store when possible
+
+        Args:
+            start (int): the messages are older than this id
+            number (int): number of messages
+            conversation (str): the room or the user of the conversation
+
+        Returns:
+            List[dict]: the messages, newest first
+        """
+        if (
+            self.message_store
+            and (
+                messages := self.message_store.get_older_messages(
+                    start, number, conversation
+                )
+            )
+            is not None
+        ):
+            return messages
+
+        messages = self.get_older_messages(
+            start, number, self.ui.client.user_name, conversation
+        )
+        if self.message_store:
+            self.message_store.add_page(conversation, messages, start, number)
+        return messages
+
+    def store_message(self, message: dict) -> None:
+        """
+        Store a message received from the server
+
+        Args:
+            message (dict): the message
+        """
+        if self.message_store:
+            self.message_store.add_live_message(message)
+
+    def store_reaction(self, message_id: int, reaction_nb: int) -> None:
+        """
+        Store the number of reactions of a message
+
+        Args:
+            message_id (int): id of the message
+            reaction_nb (int): number of reactions
+        """
+        if self.message_store:
+            self.message_store.update_reaction(message_id, reaction_nb)
+
     def get_older_message(self, message_id: int) -> dict:
         """
         Get older message from the server
         """
         older_message = self.ui.backend.get_older_message(message_id)
-        return older_message["message"]
+        return older_message["message"] if older_message else []
+
+    def get_messages_by_ids(self, message_ids: List[int]) -> Dict[int, dict]:
+        """
+        Get several messages from the server in one request
+
+        Args:
+            message_ids (List[int]): ids of the messages
+
+        Returns:
+            Dict[int, dict]: the messages found by id
+        """
+        if response := self.ui.backend.get_messages_by_ids(message_ids):
+            messages = response["messages"]
+        else:
+            # Older API, one request per message
+            with ThreadPoolExecutor(max_workers=self.PICTURES_WORKERS) as executor:
+                messages = [
+                    message
+                    for older_message in executor.map(
+                        self.get_older_message, message_ids
+                    )
+                    for message in older_message
+                ]
+        return {message["message_id"]: message for message in messages}
+
+    def get_reply_targets(
+        self, messages: List[dict], known_ids: Iterable[int] = ()
+    ) -> Dict[int, dict]:
+        """
+        Get the messages replied by a page of messages, one batch per level
+        of a reply chain, from the local store when possible
+
+        Args:
+            messages (List[dict]): the page of messages
+            known_ids (Iterable[int], optional): ids already displayed.
+
+        Returns:
+            Dict[int, dict]: the replied messages by id
+        """
+        reply_targets: Dict[int, dict] = {}
+        known_ids = set(known_ids) | {message["message_id"] for message in messages}
+        missing_ids = {
+            message["response_id"] for message in messages if message["response_id"]
+        }
+        while missing_ids := missing_ids - known_ids:
+            found = (
+                self.message_store.get_messages(list(missing_ids))
+                if self.message_store
+                else {}
+            )
+            if remote_ids := missing_ids - found.keys():
+                fetched = {
+                    message_id: message
+                    for message_id, message in self.reply_flight.do_many(
+                        remote_ids, self.get_messages_by_ids
+                    ).items()
+                    if message
+                }
+                if self.message_store:
+                    self.message_store.add_messages(list(fetched.values()))
+                found.update(fetched)
+
+            reply_targets.update(found)
+            known_ids |= missing_ids
+            missing_ids = {
+                message["response_id"]
+                for message in found.values()
+                if message["response_id"]
+            }
+        return reply_targets
+
+    def with_reply_targets(
+        self, messages: List[dict], known_ids: Iterable[int] = ()
+    ) -> Tuple[List[dict], Dict[int, dict]]:
+        """
+        Page of messages with the messages they reply to
+
+        Args:
+            messages (List[dict]): the page of messages
+            known_ids (Iterable[int], optional): ids already displayed.
+
+        Returns:
+            Tuple[List[dict], Dict[int, dict]]: the page and the replied messages
+        """
+        return messages, self.get_reply_targets(messages, known_ids)
 
     def get_all_dm_users_username(self, username: str) -> list:
         """
@@ -182,14 +518,50 @@ class ApiController:
         """
         return self.ui.backend.get_all_dm_users_username(username)
 
-    def add_sender_picture(self, sender_id: str) -> None:
-        """Add sender picture to the list of sender pictures
+    def get_dm_metadata(
+        self, username: str, dm_list: List[str], last_message_id: Optional[int]
+    ) -> Dict[str, dict]:
+        """
+        Get the unread status and the last activity of the dm of the user
 
         Args:
-            sender_id (str): sender identifier
+            username (str): username
+            dm_list (List[str]): usernames of the dm
+            last_message_id (Optional[int]): last message id of the database
+
+        Returns:
+            Dict[str, dict]: metadata by conversation
         """
-        if sender_id not in list(self.ui.users_pict.keys()):
-            self.get_user_icon(sender_id)
+        if metadata := self.ui.backend.get_dm_metadata(username):
+            return {
+                conversation["username"]: conversation
+                for conversation in metadata["conversations"]
+            }
+
+        # Older API, only fetch the last message of each conversation. All of
+        # them are needed to order the list and show the unread ones
+        if not last_message_id:
+            return {}
+
+        def get_last_message(dm: str) -> dict:
+            messages = self.get_older_messages(last_message_id + 1, 1, username, dm)
+            if not messages:
+                return {"username": dm, "last_message_id": 0, "unread": 0}
+            message = messages[0]
+            return {
+                "username": dm,
+                "last_message_id": message["message_id"],
+                "last_activity": message["created_at"],
+                "unread": int(
+                    message["receiver"] == username and message["is_readed"] is False
+                ),
+            }
+
+        with ThreadPoolExecutor(max_workers=self.PICTURES_WORKERS) as executor:
+            return {
+                conversation["username"]: conversation
+                for conversation in executor.map(get_last_message, dm_list)
+            }
 
     def update_is_readed_status(
         self, sender: str, receiver: str, is_readed=True
@@ -203,6 +575,33 @@ class ApiController:
             is_readed (bool, optional): Bool status. Defaults to True.
         """
         self.ui.backend.update_is_readed_status(sender, receiver, is_readed)
+        if self.message_store and is_readed:
+            self.message_store.mark_as_read(sender, receiver)
+
+    def send_read_receipts(self, senders: List[str], receiver: str) -> None:
+        """
+        Mark the messages of several conversations as read, in one request
+
+        Args:
+            senders (List[str]): senders of the read messages
+            receiver (str): receiver name
+        """
+        status_code = self.ui.backend.update_is_readed_status_batch(
+            [{"sender": sender, "receiver": receiver} for sender in senders]
+        )
+        if status_code != 200:
+            # Older API, one request per conversation
+            with ThreadPoolExecutor(max_workers=self.PICTURES_WORKERS) as executor:
+                list(
+                    executor.map(
+                        self.update_is_readed_status, senders, [receiver] * len(senders)
+                    )
+                )
+            return
+
+        if self.message_store:
+            for sender in senders:
+                self.message_store.mark_as_read(sender, receiver)
 
     def remove_empty_char_from_entry(self) -> tuple:
         """
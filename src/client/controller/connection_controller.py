@@ -1,15 +1,18 @@
 """Module for connection controller"""
 
 import contextlib
-from typing import Callable
+import logging
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
 
-from PySide6.QtCore import Qt
+import requests
 
 from src.client.controller import global_variables
 from src.client.controller.api_controller import ApiStatus
 from src.client.view.custom_widget.custom_avatar_label import AvatarStatus
 from src.client.view.layout.login_layout import LoginLayout
 from src.tools.commands import Commands
+from src.tools.pipeline import Pipeline
 
 
 class ConnectionController:
@@ -17,9 +20,14 @@ class ConnectionController:
     Connection controller class.
     """
 
+    NB_OF_MESSAGES = 20
+    # Most recent conversations prefetched, they are the visible ones of the list
+    NB_OF_PREFETCHED_DM = 3
+
     def __init__(self, parent, ui):
         self.ui = ui
         self.parent = parent
+        self.bootstrap: Optional[Pipeline] = None
 
     def login(self) -> None:
         """
@@ -28,8 +36,8 @@ class ConnectionController:
         self.parent.clear()
         if not hasattr(self.ui, "login_form") or not self.ui.login_form:
             self.ui.login_form = LoginLayout(theme=self.parent.theme)
-            self.ui.scroll_area.main_layout.addLayout(self.ui.login_form)
-            self.ui.scroll_area.main_layout.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+            self.ui.scroll_area.main_layout.insertLayout(0, self.ui.login_form)
+            self.ui.scroll_area.message_list.hide()
 
             # Connect signals
             self.ui.login_form.password_entry.returnPressed.connect(
@@ -61,7 +69,12 @@ class ConnectionController:
         """
         Update the layout if login succeed
         """
-        status = callback(backend_callback)
+        try:
+            status = callback(backend_callback)
+        except requests.exceptions.RequestException as error:
+            # The API is unreachable
+            logging.error(error)
+            status = None
         if status == ApiStatus.SUCCESS:
             self.handle_sucess_gui_conn()
         elif status == ApiStatus.FORBIDDEN:
@@ -77,9 +90,14 @@ class ConnectionController:
 
     def handle_sucess_gui_conn(self):
         """
-        Show GUI panels if login succeed
+        Start the login bootstrap, GUI panels are shown once connected
         """
         self.clean_gui_and_connect(update_avatar=True)
+
+    def show_connected_gui(self) -> None:
+        """
+        Show GUI panels if the connection to the server succeed
+        """
         self.parent.show_left_layout()
         self.parent.show_right_layout()
         self.parent.show_footer_layout()
@@ -87,11 +105,6 @@ class ConnectionController:
         self.ui.header.frame_research.show()
         self.ui.header.frame_research.clearFocus()
         self.ui.header.avatar.height_, self.ui.header.avatar.width_ = 20, 20
-        self.ui.header.avatar.update_picture(
-            status=AvatarStatus.ACTIVATED,
-            content=self.ui.users_pict[self.ui.client.user_name],
-        )
-        self.ui.header.avatar.show()
         self.ui.header.welcome_label.setText(f"{self.ui.client.user_name}")
         self.ui.header.welcome_label.show()
         self.ui.header.separator.show()
@@ -107,53 +120,211 @@ class ConnectionController:
 
     def clean_gui_and_connect(self, update_avatar: bool) -> None:
         """
-        Clean GUI
+        Clean GUI and run the login bootstrap, independent steps run concurrently
 
         Args:
             update_avatar (bool): update user avatar
         """
         self.ui.users_connected[self.ui.client.user_name] = True
 
-        if self.parent.tcp_controller.is_connected_to_server():
-            self.parent.init_working_signals()
+        username = self.ui.client.user_name
+        api_controller = self.parent.api_controller
+
+        self.bootstrap = Pipeline("bootstrap", interactive_step="home_page")
+        self.bootstrap.add_step(
+            "tcp_connect",
+            fetch=lambda _: self.parent.tcp_controller.is_connected_to_server(),
+            apply=self.on_tcp_connected,
+        )
+        self.bootstrap.add_step(
+            "own_avatar",
+            fetch=lambda _: self.ui.backend.get_user_icon(username),
+            apply=partial(self.on_own_avatar_fetched, update_avatar),
+            apply_after=("tcp_connect",),
+            # The messages are displayed with the placeholder avatar meanwhile
+            critical=False,
+        )
+        self.bootstrap.add_step(
+            "rooms",
+            fetch=lambda _: api_controller.get_rooms(),
+            apply=self.parent.room_controller.display_rooms,
+            apply_after=("tcp_connect",),
+        )
+        self.bootstrap.add_step(
+            "users",
+            fetch=lambda _: api_controller.sync_user_directory(),
+        )
+        self.bootstrap.add_step(
+            "dm_list",
+            fetch=lambda _: api_controller.get_all_dm_users_username(username),
+        )
+        self.bootstrap.add_step(
+            "last_message_id",
+            fetch=lambda _: api_controller.get_last_message_id(),
+            apply=self.on_last_message_id_fetched,
+        )
+        self.bootstrap.add_step(
+            "message_store",
+            fetch=lambda results: api_controller.open_message_store(
+                username, results["last_message_id"]
+            ),
+            depends_on=("last_message_id",),
+        )
+        self.bootstrap.add_step(
+            "local_home_page",
+            fetch=lambda _: api_controller.with_reply_targets(
+                api_controller.get_local_messages("home", self.NB_OF_MESSAGES)
+            ),
+            apply=self.display_first_page,
+            depends_on=("message_store",),
+            apply_after=("rooms",),
+        )
+        self.bootstrap.add_step(
+            "home_page",
+            fetch=lambda results: api_controller.with_reply_targets(
+                api_controller.sync_conversation(
+                    "home", results["last_message_id"], self.NB_OF_MESSAGES
+                )
+            ),
+            apply=partial(self.parent.messages_controller.on_history_fetched, "home"),
+            depends_on=("message_store",),
+            apply_after=("local_home_page",),
+        )
+        self.bootstrap.add_step(
+            "dm_metadata",
+            fetch=lambda results: api_controller.get_dm_metadata(
+                username,
+                [
+                    dm
+                    for dm in results["dm_list"]["usernames"]
+                    if dm not in results["rooms"]
+                ],
+                results["last_message_id"],
+            ),
+            apply=self.display_dm_metadata,
+            depends_on=("dm_list", "last_message_id", "rooms"),
+            apply_after=("home_page",),
+        )
+        self.bootstrap.start()
+
+    def on_tcp_connected(self, is_connected: bool) -> None:
+        """
+        Bootstrap step: start the socket session
+
+        Args:
+            is_connected (bool): True if the client is connected to the server
+        """
+        if not is_connected:
+            self.bootstrap.cancel()
+            self.ui.login_form.error_label.setText(
+                "Enable to join the server, please try again later"
+            )
+            return
+
+        self.parent.init_working_signals()
+        # Without session, the server is told of the connection by the first message
+        if not self.ui.client.session_token:
             self.ui.client.send_data(Commands.HELLO_WORLD, Commands.HELLO_WORLD.name)
-            self.ui.login_form = None
-            self.parent.clear()
-            self.parent.api_controller.get_user_icon(
-                update_personal_avatar=update_avatar
+        self.ui.login_form = None
+        self.parent.clear()
+        self.ui.scroll_area.message_list.show()
+        self.ui.left_nav_widget.info_disconnected_label.show()
+        self.ui.footer_widget.reply_entry_action.triggered.connect(lambda: None)
+        self.show_connected_gui()
+
+    def on_own_avatar_fetched(self, update_avatar: bool, content: bytes) -> None:
+        """
+        Bootstrap step: display the user avatar
+
+        Args:
+            update_avatar (bool): update the footer avatar
+            content (bytes): the avatar picture
+        """
+        self.parent.api_controller.set_user_icon(
+            self.ui.client.user_name, content, update_personal_avatar=update_avatar
+        )
+        self.ui.header.avatar.update_picture(
+            status=AvatarStatus.ACTIVATED,
+            content=self.ui.users_pict[self.ui.client.user_name],
+        )
+        self.ui.header.avatar.show()
+
+    def display_first_page(self, page: Tuple[List[dict], Dict[int, dict]]) -> None:
+        """
+        Bootstrap step: display the last stored messages of a conversation
+
+        Args:
+            page (Tuple[List[dict], Dict[int, dict]]): messages, newest first,
+            and replied messages
+        """
+        older_messages, reply_targets = page
+        self.parent.messages_controller.display_older_messages(
+            older_messages, display=True, reverse=True, reply_targets=reply_targets
+        )
+
+    def on_last_message_id_fetched(self, last_message_id: Optional[int]) -> None:
+        """
+        Bootstrap step: store the last message id, start of the history pages
+
+        Args:
+            last_message_id (Optional[int]): last message id of the database
+        """
+        messages_controller = self.parent.messages_controller
+        messages_controller.last_message_id = (
+            int(last_message_id) if last_message_id else None
+        )
+        # Loaded by the bootstrap itself
+        messages_controller.history_requested.add("home")
+
+    def display_dm_metadata(self, metadata: Dict[str, dict]) -> None:
+        """
+        Bootstrap step: add the direct messages with their unread status,
+        the history of a conversation is fetched when opened or hovered
+
+        Args:
+            metadata (Dict[str, dict]): metadata by conversation
+        """
+        # The most recent conversation is inserted last, on top of the list
+        conversations = sorted(
+            metadata.values(),
+            key=lambda conversation: conversation.get("last_message_id") or 0,
+        )
+        for conversation in conversations:
+            dm = conversation["username"]
+            self.parent.add_gui_for_mp_layout(
+                dm,
+                self.parent.avatar_loader_controller.create_avatar_label(
+                    dm, status=AvatarStatus.DEACTIVATED
+                ),
             )
-            self.ui.left_nav_widget.info_disconnected_label.show()
-            self.parent.fetch_all_users_username()
-            self.parent.fetch_all_rooms()
-
-            # Get older messages from the server
-            dm_list = self.parent.messages_controller.get_all_dm_users_username()[
-                "usernames"
-            ]
-
-            last_message_id = self.parent.api_controller.get_last_message_id()
-
-            # In case of empty database
-            if last_message_id:
-                last_message_id = int(last_message_id)
-            else:
-                return
-            nb_of_messages = 20
-            for dm in dm_list:
-                self.parent.messages_controller.fetch_older_messages(
-                    start=last_message_id + 1, number=nb_of_messages, username=dm
-                )
+            if conversation.get("unread"):
+                self.parent.avatar_controller.update_pixmap_avatar(dm, AvatarStatus.DM)
+                self.parent.read_state_controller.set_unread(dm)
 
-            self.ui.footer_widget.reply_entry_action.triggered.connect(lambda: None)
+        for conversation in conversations[-self.NB_OF_PREFETCHED_DM :]:
+            self.parent.messages_controller.load_history(conversation["username"])
 
     def logout(self) -> None:
         """
         Disconnect the client
         """
-        # Update backend connection status
-        self.parent.api_controller.send_login_status(
-            username=self.ui.client.user_name, status=False
-        )
+        if self.bootstrap:
+            self.bootstrap.cancel()
+            self.bootstrap = None
+
+        # Send the pending read receipts and reactions
+        self.parent.read_state_controller.clear()
+        self.parent.react_controller.flush_reactions(force=True)
+
+        # Update backend connection status, a session ends with the socket
+        if not self.ui.client.session_token:
+            try:
+                self.parent.api_controller.send_login_status(
+                    username=self.ui.client.user_name, status=False
+                )
+            except requests.exceptions.RequestException as error:
+                logging.error(error)
+        self.ui.client.session_token = None
         self.parent.api_controller.is_connected = False
 
         # Socket disconnection
@@ -166,10 +337,19 @@ class ConnectionController:
         global_variables.user_connected.clear()
         global_variables.user_disconnect.clear()
         self.ui.users_pict.clear()
+        self.parent.room_controller.clear()
+        self.parent.room_icons.clear()
+        self.parent.avatar_loader_controller.clear()
         self.ui.users_connected.clear()
         self.parent.dm_avatar_dict.clear()
         self.ui.right_nav_widget.room_list.clear()
         self.parent.messages_dict.clear()
+        self.parent.messages_controller.history_requested.clear()
+        self.parent.pagination_controller.clear()
+        self.parent.history_window_controller.clear()
+        self.parent.pending_controller.clear()
+        self.parent.messages_controller.last_message_id = None
+        self.parent.api_controller.close_message_store()
 
         # UI update
         self.parent.update_buttons()
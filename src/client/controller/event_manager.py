@@ -15,6 +15,7 @@ class EventManager(QObject):
     users_connected_signal = Signal()
     users_disconnected_signal = Signal()
     react_message_signal = Signal()
+    api_state_signal = Signal(object)
 
     def event_coming_message(self) -> None:
         """
@@ -39,3 +40,12 @@ class EventManager(QObject):
         Emit a signal when a message is reacted.
         """
         self.react_message_signal.emit()
+
+    def event_api_state(self, state) -> None:
+        """
+        Emit a signal when the state of the API circuit changes.
+
+        Args:
+            state (CircuitState): the new state
+        """
+        self.api_state_signal.emit(state)
@@ -5,8 +5,8 @@ from functools import partial
 from threading import Thread
 from typing import List, Optional
 
-from PySide6.QtCore import QEvent, QSize, QTimer
-from PySide6.QtGui import QEnterEvent, QIcon, Qt
+from PySide6.QtCore import QSize, QTimer
+from PySide6.QtGui import QAction, QEnterEvent, QIcon, Qt
 from PySide6.QtWidgets import (
     QHBoxLayout,
     QLabel,
@@ -17,17 +17,32 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from src.client.controller import global_variables
 from src.client.controller.api_controller import ApiController
 from src.client.controller.connection_controller import ConnectionController
 from src.client.controller.event_manager import EventManager
 from src.client.controller.messages_controller.avatar_controller import AvatarController
+from src.client.controller.messages_controller.avatar_loader_controller import (
+    AvatarLoaderController,
+)
+from src.client.controller.messages_controller.history_window_controller import (
+    HistoryWindowController,
+)
 from src.client.controller.messages_controller.messages_controller import (
     MessagesController,
 )
+from src.client.controller.messages_controller.pagination_controller import (
+    PaginationController,
+)
+from src.client.controller.messages_controller.pending_controller import (
+    PendingController,
+)
 from src.client.controller.messages_controller.reaction_controller import (
     ReactController,
 )
+from src.client.controller.messages_controller.read_state_controller import (
+    ReadStateController,
+)
+from src.client.controller.messages_controller.room_controller import RoomController
 from src.client.controller.messages_controller.router_controller import RouterController
 from src.client.controller.tcp_controller import TcpServerController
 from src.client.controller.user_profile_controller import UserProfileController
@@ -36,6 +51,7 @@ from src.client.view.custom_widget.custom_button import CustomQPushButton
 from src.client.view.custom_widget.custom_line_edit import CustomQLineEdit
 from src.client.view.layout.body_scroll_area import BodyScrollArea
 from src.client.view.layout.message_layout import MessageLayout
+from src.tools.circuit_breaker import CircuitState
 from src.tools.utils import (
     GenericColor,
     Icon,
@@ -53,6 +69,8 @@ class GuiController:
     GUI controller class.
     """
 
+    MAX_SEARCH_RESULTS = 20
+
     # pylint: disable=too-many-arguments
     def __init__(
         self,
@@ -67,7 +85,7 @@ class GuiController:
         self.theme = theme
         self.theme_board = None
         self.worker_thread = None
-        self.room_icon = None
+        self.room_icons: dict[str, AvatarLabel] = {}
         self.is_focused = None
 
         self.messages_dict: dict[str, List[MessageLayout]] = messages_dict
@@ -78,12 +96,20 @@ class GuiController:
         self.api_controller = api_controller
         self.tcp_controller = tcp_controller
         self.messages_controller = MessagesController(self, ui, self.messages_dict)
+        self.pagination_controller = PaginationController(self, ui, self.messages_dict)
+        self.history_window_controller = HistoryWindowController(self, ui)
+        self.pending_controller = PendingController(self, ui)
         self.react_controller = ReactController(self, ui, self.messages_dict)
+        self.read_state_controller = ReadStateController(self, ui)
+        self.room_controller = RoomController(self, ui)
         self.router_controller = RouterController(self, ui)
         self.avatar_controller = AvatarController(self, ui, self.dm_avatar_dict)
+        self.avatar_loader_controller = AvatarLoaderController(self, ui)
         self.user_profile_controller = UserProfileController(self, ui)
         self.connection_controller = ConnectionController(self, ui)
 
+        self.event_manager.api_state_signal.connect(self.update_api_state)
+
     def init_working_signals(self) -> None:
         """
         Init signals for incoming messages
@@ -110,6 +136,23 @@ class GuiController:
         # Update buttons status
         self.update_buttons()
 
+    def update_api_state(self, state: CircuitState) -> None:
+        """
+        Callback to show the state of the API circuit
+
+        Args:
+            state (CircuitState): the new state
+        """
+        if state == CircuitState.CLOSED:
+            self.ui.api_state_label.hide()
+            return
+        self.ui.api_state_label.setText(
+            "API unavailable, retrying..."
+            if state == CircuitState.HALF_OPEN
+            else "API unavailable"
+        )
+        self.ui.api_state_label.show()
+
     def update_scroll_bar(self) -> None:
         """
         Callback to handle scroll bar update
@@ -126,6 +169,7 @@ class GuiController:
                 for j in reversed(range(layout.count())):
                     layout.itemAt(j).widget().deleteLater()
         self.ui.scroll_area.main_layout.update()
+        self.ui.scroll_area.model.clear()
 
     def hide_left_layouts_buttons(self) -> None:
         """
@@ -229,6 +273,7 @@ class GuiController:
         self.ui.footer_widget.entry.setPlaceholderText(lock_message)
 
     # pylint: disable=line-too-long
+    # pylint: disable=too-many-statements
     def add_gui_for_mp_layout(
         self, room_name: str, icon, switch_frame: Optional[bool] = False
     ) -> None:
@@ -245,7 +290,6 @@ class GuiController:
             direct_message_widget = CustomQPushButton()
             direct_message_widget.setToolTip("Open direct message")
             direct_message_widget.setFixedHeight(50)
-            direct_message_widget.setStyleSheet("border: 1px solid transparent;")
             direct_message_layout = QHBoxLayout(direct_message_widget)
             direct_message_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
             direct_message_layout.setSpacing(12)
@@ -253,6 +297,7 @@ class GuiController:
             icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
             close_button = CustomQPushButton()
+            close_button.setObjectName("dm_close_button")
             close_button.setToolTip("Close")
             close_button.clicked.connect(direct_message_widget.deleteLater)
             close_button.setFixedHeight(30)
@@ -261,54 +306,27 @@ class GuiController:
                 icon_from_svg(Icon.CLOSE.value, color=self.theme.text_color)
             )
             close_button.setIcon(close_icon)
-            retain = close_button.sizePolicy()
-            retain.setRetainSizeWhenHidden(True)
-            close_button.setSizePolicy(retain)
-            close_button.hide()
-
-            def hover(event: QEvent, user_widget, close_button: CustomQPushButton):
-                if isinstance(event, QEnterEvent):
-                    color = self.theme.background_color
-                else:
-                    color = self.theme.inner_color
-                style_ = """
-                QWidget {{
-                background-color: {color};
-                border-radius: 8px;
-                border: 0px solid transparent;
-                }} 
-                """
-                user_widget.setStyleSheet(style_.format(color=color))
-                # pylint: disable=expression-not-assigned
-                close_button.show() if isinstance(
-                    event, QEnterEvent
-                ) else close_button.hide()
-
-            direct_message_widget.enterEvent = partial(
-                hover, user_widget=direct_message_widget, close_button=close_button
-            )
-            direct_message_widget.leaveEvent = partial(
-                hover, user_widget=direct_message_widget, close_button=close_button
-            )
+            close_button.reveal_on_hover(direct_message_widget)
+
+            def prefetch(event: QEnterEvent) -> None:
+                # Once, the next crossings of the entry are left to Qt
+                del direct_message_widget.enterEvent
+                # The user is likely to open the conversation
+                self.messages_controller.load_history(room_name)
+                CustomQPushButton.enterEvent(direct_message_widget, event)
+
+            direct_message_widget.enterEvent = prefetch
 
             partial_room_name = check_str_len(room_name)
 
             btn = QLabel(partial_room_name)
+            btn.setObjectName("entry_name")
+            direct_message_widget.set_entry("dm", icon, btn)
             self.dm_avatar_dict[room_name] = icon
             direct_message_widget.clicked.connect(
                 partial(self.update_gui_for_mp_layout, room_name)
             )
 
-            style_ = """
-            QLabel {{
-            text-align: left;
-            font-weight: bold;
-            border-radius: 8px;
-            border: 0px solid transparent;
-            }} 
-            """
-            btn.setStyleSheet(style_.format(color=self.theme.background_color))
-            btn.update()
             btn.setContentsMargins(0, 0, 0, 0)
 
             direct_message_layout.addWidget(icon)
@@ -344,7 +362,7 @@ class GuiController:
         # Update reply entry
         self.ui.footer_widget.reply_entry_action.triggered.emit()
 
-        if room_name != "home":
+        if not self.room_controller.is_room(room_name):
             # Update avatar status with iddle
             self.avatar_controller.update_pixmap_avatar(
                 room_name,
@@ -352,14 +370,16 @@ class GuiController:
                 if room_name in self.ui.users_connected.keys()
                 else AvatarStatus.DEACTIVATED,
             )
-            self.api_controller.update_is_readed_status(
-                room_name, self.ui.client.user_name
-            )
+            self.read_state_controller.mark_as_read(room_name)
         else:
-            self.room_icon.update_pixmap(
-                AvatarStatus.IDLE,
-                background_color=self.theme.rgb_background_color_rooms,
-            )
+            self.room_controller.subscribe(room_name)
+            if room_icon := self.room_icons.get(room_name):
+                room_icon.update_pixmap(
+                    AvatarStatus.IDLE,
+                    background_color=self.theme.rgb_background_color_rooms,
+                )
+
+        self.messages_controller.load_history(room_name)
 
         old_widget = self.ui.scroll_area
         old_widget.hide()
@@ -370,7 +390,7 @@ class GuiController:
         self.ui.body_layout.removeWidget(old_widget)
         self.ui.body_layout.insertWidget(index, widget)
 
-        type_room = "Rooms" if room_name == "home" else "Messages"
+        type_room = "Rooms" if self.room_controller.is_room(room_name) else "Messages"
         self.ui.frame_name.setText(f"{type_room} \n| {room_name}")
         self.ui.frame_research.setPlaceholderText(
             f"Search in {type_room} | {room_name}"
@@ -382,71 +402,60 @@ class GuiController:
         self.ui.scroll_area.show()
         self.ui.scroll_area.scrollToBottom()
 
-    def fetch_all_users_username(self):
-        """
-        Fetch all users picture from backend
+    def add_room_button(self, room_name: str) -> None:
         """
-        usernames: List[str] = self.ui.backend.get_all_users_username()
-        for username in usernames:
-            self.api_controller.add_sender_picture(username)
+        Add the button of a room, the other rooms than home can be left
 
-    def fetch_all_rooms(self):
-        """
-        Fetch all rooms
+        Args:
+            room_name (str): room name
         """
         room_widget = CustomQPushButton()
+        room_widget.setToolTip(f"Display {room_name} room")
         room_widget.setFixedHeight(50)
         room_layout = QHBoxLayout(room_widget)
         room_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         room_layout.setContentsMargins(0, 0, 0, 0)
 
-        divider = QIcon(
-            icon_from_svg(Icon.SEPARATOR_HORIZ.value, color=self.theme.background_color)
-        )
-        divider_label = QLabel()
-        divider_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        divider_label.setPixmap(divider.pixmap(20, 20))
-
-        self.room_icon = AvatarLabel(
+        room_icon = AvatarLabel(
             content=ImageAvatar.ROOM.value,
             status=AvatarStatus.DEACTIVATED,
         )
-        self.room_icon.setToolTip("Display home room")
-
-        self.room_icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        room_widget.clicked.connect(lambda: self.update_gui_for_mp_layout("home"))
-
-        def hover(event: QEvent, user_widget):
-            if isinstance(event, QEnterEvent):
-                color = self.theme.background_color
-            else:
-                color = self.theme.rooms_color
-            style_ = """
-            QWidget {{
-            font-weight: bold;
-            text-align: center;
-            background-color: {color};
-            border-radius: 8px;
-            border: 1px solid transparent;
-            }} 
-            """
-            user_widget.setStyleSheet(style_.format(color=color))
+        room_widget.set_entry("room", room_icon)
+        self.room_icons[room_name] = room_icon
 
-        room_widget.enterEvent = partial(hover, user_widget=room_widget)
-        room_widget.leaveEvent = partial(hover, user_widget=room_widget)
+        room_icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        room_widget.clicked.connect(partial(self.update_gui_for_mp_layout, room_name))
 
-        style_ = """
-            QWidget {{
-            font-weight: bold;
-            text-align: center;
-            border: 1px solid transparent;
-            }} 
-            """
-        room_widget.setStyleSheet(style_.format())
+        if room_name != self.room_controller.DEFAULT_ROOM:
+            leave_action = QAction("Leave room", room_widget)
+            leave_action.triggered.connect(
+                partial(self.room_controller.unsubscribe, room_name)
+            )
+            room_widget.addAction(leave_action)
+            room_widget.setContextMenuPolicy(Qt.ContextMenuPolicy.ActionsContextMenu)
 
-        room_layout.addWidget(self.room_icon, alignment=Qt.AlignmentFlag.AlignCenter)
+            # --- Add Body Scroll Area --- #
+            self.ui.body_gui_dict[room_name] = BodyScrollArea(
+                name=room_name, gui_controller=self
+            )
+        if room_name not in self.messages_dict.keys():
+            self.messages_dict[room_name] = OrderedDict()
+
+        room_layout.addWidget(room_icon, alignment=Qt.AlignmentFlag.AlignCenter)
         self.ui.rooms_widget.main_layout.addWidget(room_widget)
-        self.ui.rooms_widget.main_layout.addWidget(divider_label)
+
+        # The home room is separated from the others
+        if room_name == self.room_controller.DEFAULT_ROOM:
+            divider = QIcon(
+                icon_from_svg(
+                    Icon.SEPARATOR_HORIZ.value, color=self.theme.background_color
+                )
+            )
+            divider_label = QLabel()
+            divider_label.setObjectName("rooms_divider")
+            divider_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            divider_label.setPixmap(divider.pixmap(20, 20))
+            self.ui.rooms_widget.main_layout.addWidget(divider_label)
 
     def focus_in_message(self, message: MessageLayout) -> None:
         """
@@ -455,31 +464,31 @@ class GuiController:
         Args:
             message (MessageLayout): message layout
         """
-        style_sheet_main = message.main_widget.styleSheet()
-        style_sheet_left = message.left_widget.styleSheet()
+        # The replied message may have been unloaded and rebuilt since
+        message = (
+            self.history_window_controller.get_message(
+                self.ui.scroll_area.name, message.message_id
+            )
+            or message
+        )
+        highlight = (message.background_color, message.border_color)
 
         self.update_stylesheet_with_reply(message)
 
-        def callback(
-            message: MessageLayout, style_sheet_main_: str, style_sheet_left_: str
-        ) -> None:
+        def callback(message: MessageLayout, highlight_: tuple) -> None:
             """
-            Callback to update stylesheet
+            Callback to restore the highlight
 
             Args:
                 message (MessageLayout): message layout to update
-                style_sheet_main_ (str): style sheet
-                style_sheet_left_ (str): style sheet
+                highlight_ (tuple): background and border colors
             """
-            message.main_widget.setStyleSheet(style_sheet_main_)
-            message.left_widget.setStyleSheet(style_sheet_left_)
+            message.set_highlight(*highlight_)
             self.is_focused = False
 
-        self.ui.scroll_area.ensureWidgetVisible(message.main_widget)
+        self.ui.scroll_area.scroll_to_message(message)
 
-        QTimer.singleShot(
-            1000, partial(callback, message, style_sheet_main, style_sheet_left)
-        )
+        QTimer.singleShot(1000, partial(callback, message, highlight))
 
     def update_stylesheet_with_reply(self, message: MessageLayout) -> None:
         """
@@ -488,14 +497,7 @@ class GuiController:
         Args:
             message (MessageLayout): message layout
         """
-        message.main_widget.setStyleSheet(
-            f"color: {self.theme.title_color};\
-            margin-bottom: 1px;\
-            margin-right: 2px;\
-            background-color: {self.theme.inner_color};\
-            border-left: 0px solid;"
-        )
-        message.left_widget.setStyleSheet("border-left: 0px solid")
+        message.set_highlight(self.theme.inner_color)
 
     def update_stylesheet_with_focus_event(
         self, message: MessageLayout, border_color: str
@@ -507,21 +509,7 @@ class GuiController:
             message (MessageLayout): message layout
             border_color (str): border color
         """
-        message.main_widget.setStyleSheet(
-            f"color: {self.theme.title_color};\
-            margin-bottom: 1px;\
-            margin-right: 2px;\
-            background-color: {self.theme.inner_color};"
-        )
-        message.left_widget.setStyleSheet(
-            f"""QWidget{{
-                border-left: 2px solid;\
-                border-color: {border_color};
-            }}
-            AvatarLabel{{
-                border: 0px solid;
-            }}"""
-        )
+        message.set_highlight(self.theme.inner_color, border_color)
 
     # pylint: disable=too-many-locals
     # pylint: disable=too-many-statements
@@ -542,79 +530,50 @@ class GuiController:
             self.ui.header.frame_research.reset_layout()
             return
 
-        # Get all users
-        users = self.ui.users_pict.keys()
-
-        def hover(event: QEvent, user_widget) -> None:
-            if isinstance(event, QEnterEvent):
-                color = self.theme.background_color
-            else:
-                color = self.theme.search_color
-
-            style_ = """
-            QWidget {{
-            background-color: {color};
-            border-radius: 8px;
-            border: 0px solid {color};
-            }} 
-            """
-            user_widget.setStyleSheet(style_.format(color=color))
-            user_widget.update()
+        # Get the users from the local directory
+        users = self.api_controller.user_directory.search(
+            text_from_research,
+            self.MAX_SEARCH_RESULTS,
+            excluded=("server", self.ui.client.user_name),
+        )
 
         nb_users = 0
         for user in users:
-            # If the user is in the research text bar
-            if (
-                text_from_research in user
-                and user != "server"
-                and user != self.ui.client.user_name
-            ):
-                nb_users += 1
-                self.ui.header.frame_research_list.show()
-                self.ui.header.frame_research.update_layout()
-                user_widget = CustomQPushButton()
-                content = (
-                    global_variables.user_connected[user][0]
-                    if user in global_variables.user_connected
-                    else global_variables.user_disconnect[user][0]
-                )
-                dm_pic = AvatarLabel(
-                    content=content,
-                    status=AvatarStatus.IDLE,
-                )
+            nb_users += 1
+            self.ui.header.frame_research_list.show()
+            self.ui.header.frame_research.update_layout()
+            user_widget = CustomQPushButton()
+            dm_pic = self.avatar_loader_controller.create_avatar_label(
+                user, status=AvatarStatus.IDLE
+            )
 
-                def callback(user, dm_pic):
-                    self.add_gui_for_mp_layout(user, dm_pic, True)
-                    self.ui.header.frame_research.clear()
-                    self.ui.header.frame_research_list.hide()
-                    self.ui.header.frame_research.reset_layout()
-                    self.ui.header.frame_research.clearFocus()
-
-                user_widget.clicked.connect(partial(callback, user, dm_pic))
-                user_widget.enterEvent = partial(hover, user_widget=user_widget)
-                user_widget.leaveEvent = partial(hover, user_widget=user_widget)
-                user_widget.setContentsMargins(5, 0, 0, 0)
-                user_widget.setFixedHeight(30)
-                user_layout = QHBoxLayout(user_widget)
-
-                user_pic = AvatarLabel(
-                    content=content, status=AvatarStatus.IDLE, height=20, width=20
-                )
+            def callback(user, dm_pic):
+                self.add_gui_for_mp_layout(user, dm_pic, True)
+                self.ui.header.frame_research.clear()
+                self.ui.header.frame_research_list.hide()
+                self.ui.header.frame_research.reset_layout()
+                self.ui.header.frame_research.clearFocus()
 
-                user_layout.setContentsMargins(0, 0, 0, 0)
-                user = check_str_len(user)
-                label = QLabel(user)
-                label.setStyleSheet(
-                    f"font-weight: bold;\
-                    background-color: transparent;\
-                    color: {self.theme.title_color};"
-                )
-                user_layout.addWidget(user_pic)
-                user_layout.addWidget(label)
-                user_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
-                item = QListWidgetItem()
-                self.ui.header.frame_research_list.addItem(item)
-                self.ui.header.frame_research_list.setItemWidget(item, user_widget)
+            user_widget.clicked.connect(partial(callback, user, dm_pic))
+            user_widget.setContentsMargins(5, 0, 0, 0)
+            user_widget.setFixedHeight(30)
+            user_layout = QHBoxLayout(user_widget)
+
+            user_pic = self.avatar_loader_controller.create_avatar_label(
+                user, status=AvatarStatus.IDLE, height=20, width=20
+            )
+
+            user_layout.setContentsMargins(0, 0, 0, 0)
+            user = check_str_len(user)
+            label = QLabel(user)
+            label.setObjectName("search_entry_name")
+            user_widget.set_entry("search", user_pic, label)
+            user_layout.addWidget(user_pic)
+            user_layout.addWidget(label)
+            user_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
+            item = QListWidgetItem()
+            self.ui.header.frame_research_list.addItem(item)
+            self.ui.header.frame_research_list.setItemWidget(item, user_widget)
         if not nb_users:
             self.ui.header.frame_research_list.hide()
             self.ui.header.frame_research.reset_layout()
@@ -643,6 +602,7 @@ class GuiController:
         if self.theme_board and self.theme_board.isVisible():
             return
         self.theme_board = QWidget()
+        self.theme_board.setObjectName("theme_board")
 
         height = 250
         self.theme_board.setFixedSize(QSize(240, height))
@@ -654,11 +614,6 @@ class GuiController:
             - 5,
         )
         self.theme_board.setContentsMargins(0, 0, 0, 0)
-        self.theme_board.setStyleSheet(
-            f"background-color: {self.theme.background_color};\
-            border-radius: 8px;\
-            border: 1px solid {self.theme.nav_color};"
-        )
         theme_board_layout = QVBoxLayout(self.theme_board)
         theme_board_layout.setContentsMargins(15, 15, 15, 15)
         theme_board_layout.setSpacing(5)
@@ -670,7 +625,6 @@ class GuiController:
             CustomQLineEdit(
                 text=getattr(self.theme, self.theme.list_colors[i]),
                 place_holder_text="#",
-                radius=4,
             )
             for i in range(len(list_theme_label))
         ]
@@ -678,18 +632,14 @@ class GuiController:
         for label in list_theme_label:
             label.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
             label.setAlignment(Qt.AlignmentFlag.AlignLeft)
-            label.setStyleSheet(
-                f"color: {self.theme.title_color};\
-                font-weight: bold;\
-                border: 0px solid"
-            )
+            label.setObjectName("theme_color_label")
         for line_edit in list_theme_line_edit:
+            line_edit.setObjectName("theme_color_entry")
             line_edit.setFixedSize(QSize(120, 15))
             line_edit.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
 
         for label, line_edit in zip(list_theme_label, list_theme_line_edit):
             widget = QWidget()
-            widget.setStyleSheet("border: 0px solid;")
             layout = QHBoxLayout(widget)
             layout.setContentsMargins(5, 0, 5, 0)
             layout.setSpacing(0)
@@ -699,10 +649,7 @@ class GuiController:
 
         # Update layout
         update_widget = QWidget()
-        update_widget.setStyleSheet(
-            f"border: 0px solid;\
-            background-color: {self.theme.search_color};"
-        )
+        update_widget.setObjectName("theme_actions")
         update_layout = QHBoxLayout(update_widget)
         update_layout.setContentsMargins(5, 5, 5, 5)
 
@@ -712,20 +659,20 @@ class GuiController:
         )
         update_button = self._create_theme_button(" Custom", 80, 40, theme_icon)
         update_button.clicked.connect(
-            partial(self.theme.create_custom_theme, self, list_theme_line_edit)
+            partial(self.theme.create_custom_theme, list_theme_line_edit)
         )
         # Black theme
         black_icon = QIcon(icon_from_svg(Icon.STATUS.value, color="#000000"))
         black_theme_button = self._create_theme_button("", 30, 30, black_icon)
         black_theme_button.clicked.connect(
-            partial(self.theme.switch_theme, self, Themes.ThemeColor.BLACK)
+            partial(self.theme.switch_theme, Themes.ThemeColor.BLACK)
         )
 
         # White theme
         white_icon = QIcon(icon_from_svg(Icon.STATUS.value, color="#ffffff"))
         white_theme_button = self._create_theme_button("", 30, 30, white_icon)
         white_theme_button.clicked.connect(
-            partial(self.theme.switch_theme, self, Themes.ThemeColor.WHITE)
+            partial(self.theme.switch_theme, Themes.ThemeColor.WHITE)
         )
         # close button
         close_icon = QIcon(
@@ -744,6 +691,40 @@ class GuiController:
         self.ui.main_layout.addChildWidget(self.theme_board)
         self.theme_board.setFocus()
 
+    def update_theme(self) -> None:
+        """
+        Restyle the widgets built by the controller after a switch of theme
+        """
+        # The badges are composited again, the decoded pictures are kept
+        labels = self.ui.findChildren(AvatarLabel)
+        self.avatar_loader_controller.update_theme(labels)
+        for label in labels:
+            label.refresh()
+
+        close_icon = icon_from_svg(Icon.CLOSE.value, color=self.theme.text_color)
+        for close_button in self.ui.right_nav_widget.right_nav_widget.findChildren(
+            CustomQPushButton, "dm_close_button"
+        ):
+            close_button.setIcon(close_icon)
+        if divider_label := self.ui.rooms_widget.main_widget.findChild(
+            QLabel, "rooms_divider"
+        ):
+            divider_label.setPixmap(
+                icon_from_svg(
+                    Icon.SEPARATOR_HORIZ.value, color=self.theme.background_color
+                ).pixmap(20, 20)
+            )
+
+        for body in self.ui.body_gui_dict.values():
+            body.message_list.itemDelegate().update_icons()
+            body.message_list.viewport().update()
+
+        # Displayed again with the colors of the new theme
+        if self.theme_board and self.theme_board.isVisible():
+            self.theme_board.hide()
+            self.theme_board.deleteLater()
+            self.display_theme_board()
+
     def _create_theme_button(
         self, text: str, w: int, h: int, icon: QIcon
     ) -> CustomQPushButton:
@@ -8,7 +8,6 @@ from src.client.controller.event_manager import EventManager
 from src.client.controller.gui_controller import GuiController
 from src.client.controller.tcp_controller import TcpServerController
 from src.client.view.layout.message_layout import MessageLayout
-from src.tools.commands import Commands
 from src.tools.utils import Themes
 
 
@@ -50,11 +49,8 @@ class MainController:
                 message_id = int(message_id[0])
                 global_variables.reply_id = ""
 
-            self.ui.client.send_data(
-                Commands.MESSAGE,
-                message,
-                receiver=receiver,
-                response_id=message_id or None,
+            self.gui_controller.pending_controller.send_message(
+                message, receiver, response_id=message_id or None
             )
             self.ui.footer_widget.reply_entry_action.triggered.emit()
             self.ui.footer_widget.entry.clear()
@@ -3,12 +3,11 @@
 from functools import partial
 from typing import List, Optional, Union
 
-from PySide6.QtCore import QEvent, Qt
-from PySide6.QtGui import QEnterEvent
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QHBoxLayout, QLabel, QLayout, QWidget
 
 from src.client.controller import global_variables
-from src.client.view.custom_widget.custom_avatar_label import AvatarLabel, AvatarStatus
+from src.client.view.custom_widget.custom_avatar_label import AvatarStatus
 from src.client.view.custom_widget.custom_button import CustomQPushButton
 from src.tools.utils import check_str_len
 
@@ -39,7 +38,6 @@ class AvatarController:
         """
         id_, _ = payload.split(":", 1)
         self.clear_avatar("user_inline", self.ui.left_nav_widget, f"{id_}_layout")
-        self.parent.api_controller.add_sender_picture(id_)
         user_disconnect[id_] = [user_connected[id_][0], False]
         self.ui.users_connected.pop(id_)
 
@@ -62,30 +60,57 @@ class AvatarController:
             user_disconnect (dict[str, List[Union[str, bool]]]): dict of disconnected users
         """
         id_, _ = payload.split(":", 1)
+        self.add_connected_users([id_], user_disconnect)
 
-        # In case of new user not register before
-        if id_ not in self.ui.users_pict.keys():
-            self.parent.api_controller.add_sender_picture(id_)
+    def add_presence_snapshot(
+        self, payload: str, user_disconnect: dict[str, List[Union[str, bool]]]
+    ) -> None:
+        """
+        Add the icons of every online user from a PRESENCE SNAPSHOT message
 
-        # Remove user's icon disconnected from the disconnected layout
-        if id_ in user_disconnect:
-            self.clear_avatar(
-                "user_offline", self.ui.left_nav_widget, f"{id_}_layout_disconnected"
-            )
-            user_disconnect.pop(id_)
+        Args:
+            payload (str): payload of the command, the usernames separated by ";"
+            user_disconnect (dict[str, List[Union[str, bool]]]): dict of disconnected users
+        """
+        _, roster = payload.split(":", 1)
+        self.add_connected_users(
+            [username for username in roster.split(";") if username], user_disconnect
+        )
 
-        if (
-            id_ in self.dm_avatar_dict.keys()
-            and self.dm_avatar_dict[id_].status != AvatarStatus.DM
-        ):
-            self.dm_avatar_dict[id_].update_pixmap(AvatarStatus.ACTIVATED)
+    def add_connected_users(
+        self, usernames: List[str], user_disconnect: dict[str, List[Union[str, bool]]]
+    ) -> None:
+        """
+        Add the user icons to the connected layout, the GUI is updated once.
+        The avatars of new users are fetched by the avatar loader once their
+        entry is displayed, not in the router thread
 
-        # Add the user icon to the connected layout
-        if id_ not in self.ui.users_connected.keys():
-            self.ui.users_connected[id_] = True
-            self.parent.api_controller.update_user_connected(
-                id_, self.ui.users_pict[id_]
-            )
+        Args:
+            usernames (List[str]): the connected users
+            user_disconnect (dict[str, List[Union[str, bool]]]): dict of disconnected users
+        """
+        for id_ in usernames:
+            # Remove user's icon disconnected from the disconnected layout
+            if id_ in user_disconnect:
+                self.clear_avatar(
+                    "user_offline",
+                    self.ui.left_nav_widget,
+                    f"{id_}_layout_disconnected",
+                )
+                user_disconnect.pop(id_)
+
+            if (
+                id_ in self.dm_avatar_dict.keys()
+                and self.dm_avatar_dict[id_].status != AvatarStatus.DM
+            ):
+                self.dm_avatar_dict[id_].update_pixmap(AvatarStatus.ACTIVATED)
+
+            # Add the user icon to the connected layout
+            if id_ not in self.ui.users_connected.keys():
+                self.ui.users_connected[id_] = True
+                self.parent.api_controller.update_user_connected(
+                    id_, self.ui.users_pict.get(id_, ""), notify=False
+                )
 
         self.parent.event_manager.event_users_connected()
 
@@ -94,6 +119,7 @@ class AvatarController:
         Callback to update gui with input connected avatar
         """
         user_connected_dict = global_variables.user_connected.copy()
+        avatar_loader = self.parent.avatar_loader_controller
 
         for user, data in user_connected_dict.items():
             if data[1] is True:
@@ -102,45 +128,20 @@ class AvatarController:
             # Layout
             user_widget = CustomQPushButton()
             user_widget.setFixedHeight(50)
-            user_widget.setStyleSheet("border: none")
             user_layout = QHBoxLayout(user_widget)
             user_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
             user_layout.setSpacing(10)
             user_layout.setContentsMargins(5, 0, 0, 0)
             username = user
             user_layout.setObjectName(f"{username}_layout")
-            content = data[0]
-
-            # pylint: disable=cell-var-from-loop
-            def hover(event: QEvent, user_widget):
-                if isinstance(event, QEnterEvent):
-                    color = self.parent.theme.background_color
-                    user_pic.update_pixmap(
-                        AvatarStatus.ACTIVATED,
-                        background_color=self.parent.theme.rgb_background_color_innactif,
-                    )
-                else:
-                    color = self.parent.theme.inner_color
-                    user_pic.update_pixmap(
-                        AvatarStatus.ACTIVATED,
-                        background_color=self.parent.theme.rgb_background_color_actif,
-                    )
-                style_ = """
-                QWidget {{
-                background-color: {color};
-                border-radius: 8px;
-                border: 1px solid {color};
-                }} 
-                """
-                user_widget.setStyleSheet(style_.format(color=color))
-
-            # Create avatar label
-            user_pic, dm_pic = AvatarLabel(
-                content=content,
+
+            # Create avatar label, with a placeholder until the avatar is fetched
+            user_pic, dm_pic = avatar_loader.create_avatar_label(
+                username,
                 status=AvatarStatus.ACTIVATED,
                 background_color=self.parent.theme.rgb_background_color_actif,
-            ), AvatarLabel(
-                content=content,
+            ), avatar_loader.create_avatar_label(
+                username,
                 status=AvatarStatus.ACTIVATED,
                 background_color=self.parent.theme.rgb_background_color_actif,
             )
@@ -148,11 +149,11 @@ class AvatarController:
             # Update picture alignment
             user_pic.setAlignment(Qt.AlignmentFlag.AlignCenter)
             dm_pic.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            user_pic.setStyleSheet("border: 0px;")
 
             # Avoid gui troubles with bigger username
             username_label = check_str_len(username)
             user_name = QLabel(username_label)
+            user_name.setObjectName("entry_name")
 
             if (
                 username in self.dm_avatar_dict.keys()
@@ -163,34 +164,20 @@ class AvatarController:
                     background_color=self.parent.theme.rgb_background_color_actif,
                 )
 
-            # StyleSheet
-            style_ = """
-            QLabel {{
-            text-align: left;
-            font-weight: bold;
-            border-radius: 8px;
-            border: 1px solid;
-            border-color: transparent;
-            }} 
-            """
-            # Add user menu
-            if username != self.ui.client.user_name:
+            # Add user menu, the entry of the user is not highlighted
+            if username == self.ui.client.user_name:
+                user_widget.set_entry("self", user_pic, user_name)
+            else:
+                user_widget.set_entry("online", user_pic, user_name)
                 user_widget.setToolTip("Open direct message")
-                user_widget.enterEvent = partial(hover, user_widget=user_widget)
-                user_widget.leaveEvent = partial(hover, user_widget=user_widget)
+                user_pic.set_hover(
+                    user_widget,
+                    background_color=self.parent.theme.rgb_background_color_innactif,
+                )
 
                 user_widget.clicked.connect(
                     partial(self.parent.add_gui_for_mp_layout, username, dm_pic, True)
                 )
-                hover_ = """
-                QPushButton:hover {{
-                text-decoration: underline;
-                }}
-                """
-                style_ = f"{style_}{hover_}"
-            user_name.setStyleSheet(
-                style_.format(color=self.parent.theme.background_color)
-            )
 
             # Add widgets to the layout
             user_layout.addWidget(user_pic)
@@ -203,6 +190,7 @@ class AvatarController:
         Callback to update gui with input disconnected avatar
         """
         user_disconnected_dict = global_variables.user_disconnect.copy()
+        avatar_loader = self.parent.avatar_loader_controller
 
         for user, data in user_disconnected_dict.items():
             if data[1] is True:
@@ -211,41 +199,7 @@ class AvatarController:
             user_widget = CustomQPushButton()
             user_widget.setToolTip("Open direct message")
             user_widget.setFixedHeight(50)
-            style_ = """
-            QWidget {{
-            border-radius: 8px;
-            border: 0px solid {color};
-            }} 
-            """
-
-            def hover(event: QEvent, user_widget, user_pic: AvatarLabel):
-                if isinstance(event, QEnterEvent):
-                    color = self.parent.theme.background_color
-                    user_pic.graphicsEffect().setEnabled(False)
-                    user_pic.update_pixmap(
-                        AvatarStatus.DEACTIVATED,
-                        background_color=self.parent.theme.rgb_background_color_innactif,
-                    )
-                else:
-                    color = self.parent.theme.inner_color
-                    user_pic.graphicsEffect().setEnabled(True)
-                    user_pic.update_pixmap(
-                        AvatarStatus.DEACTIVATED,
-                        background_color=self.parent.theme.rgb_background_color_actif,
-                    )
-                style_ = """
-                QWidget {{
-                background-color: {color};
-                border-radius: 8px;
-                border: 0px solid {color};
-                }} 
-                """
-                user_widget.setStyleSheet(style_.format(color=color))
-                user_widget.update()
-
-            user_widget.setStyleSheet(
-                style_.format(color=self.parent.theme.background_color)
-            )
+
             user_widget.setContentsMargins(0, 0, 0, 0)
 
             user_layout = QHBoxLayout(user_widget)
@@ -253,51 +207,35 @@ class AvatarController:
             user_layout.setSpacing(10)
             user_layout.setContentsMargins(5, 0, 0, 0)
             username = user
-            content = data[0]
             user_layout.setObjectName(f"{username}_layout_disconnected")
 
-            # Create avatar label
-            user_pic, dm_pic = AvatarLabel(
-                content=content,
-                status=AvatarStatus.DEACTIVATED,
-            ), AvatarLabel(content=content, status=AvatarStatus.DEACTIVATED)
-
-            user_widget.enterEvent = partial(
-                hover, user_widget=user_widget, user_pic=user_pic
-            )
-            user_widget.leaveEvent = partial(
-                hover, user_widget=user_widget, user_pic=user_pic
+            # Create avatar label, with a placeholder until the avatar is fetched
+            user_pic, dm_pic = avatar_loader.create_avatar_label(
+                username, status=AvatarStatus.DEACTIVATED
+            ), avatar_loader.create_avatar_label(
+                username, status=AvatarStatus.DEACTIVATED
             )
 
-            # Update picture
+            # Faded, unless the entry is hovered
             user_pic.set_opacity(0.2)
+            user_pic.set_hover(
+                user_widget,
+                background_color=self.parent.theme.rgb_background_color_innactif,
+            )
             user_pic.setAlignment(Qt.AlignmentFlag.AlignCenter)
             dm_pic.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            user_pic.setStyleSheet(
-                f"border: 0px solid;\
-                border-color: {self.parent.theme.background_color};"
-            )
 
             # Avoid gui troubles with bigger username
             username_label = check_str_len(username)
             user_name = QLabel(username_label)
+            user_name.setObjectName("entry_name")
             user_name.setContentsMargins(0, 0, 0, 0)
+            user_widget.set_entry("offline", user_pic, user_name)
 
             # Add user menu
             user_widget.clicked.connect(
                 partial(self.parent.add_gui_for_mp_layout, username, dm_pic, True)
             )
-            style_ = """
-            QLabel {{
-            text-align: left;
-            font-weight: bold;
-            border-radius: 8px;
-            border: 1px solid;
-            border-color: {color};
-            }}
-            """
-            user_name.setStyleSheet(style_.format(color="transparent"))
-
             # Add widgets to the layout
             user_layout.addWidget(user_pic)
             user_layout.addWidget(user_name)
@@ -0,0 +1,252 @@
+"""Module for avatar loader controller"""
+
+import contextlib
+import time
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QThreadPool
+
+from src.client.controller import global_variables
+from src.client.view.custom_widget.custom_avatar_label import AvatarLabel
+from src.tools.utils import Icon, icon_from_svg, theme
+from src.tools.workers import run_in_background
+
+
+class FailedFetch(NamedTuple):
+    """
+    Failures to fetch the avatar of a user
+    """
+
+    nb_of_failures: int
+    # Time after which the avatar is fetched again
+    retry_at: float
+
+
+class AvatarLoaderController:
+    """
+    Avatar loader controller class.
+
+    The avatar of an unknown user is replaced by a placeholder, the picture
+    is fetched when the avatar is painted for the first time, i.e. when it
+    becomes visible, and swapped in once fetched and decoded in background.
+    A failed fetch is tried again when the avatar is painted after a delay,
+    doubled at each failure.
+    """
+
+    # Maximum number of avatars fetched at the same time
+    MAX_WORKERS = 4
+    PLACEHOLDER_SIZE = 76
+    # Delay before fetching again an avatar after a failure, in seconds
+    RETRY_DELAY = 2.0
+    MAX_RETRY_DELAY = 60.0
+    clock: Callable[[], float] = staticmethod(time.monotonic)
+
+    def __init__(self, parent, ui) -> None:
+        self.parent = parent
+        self.ui = ui
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(self.MAX_WORKERS)
+        self.in_flight: Set[str] = set()
+        # Label or message row, and callback, waiting for an avatar
+        self.waiting: Dict[
+            str, List[Tuple[Any, Callable[[Union[str, bytes]], None]]]
+        ] = {}
+        self.failures: Dict[str, FailedFetch] = {}
+        self._placeholder: Optional[bytes] = None
+
+    @property
+    def placeholder(self) -> bytes:
+        """
+        Picture displayed until the avatar is fetched, rendered once
+
+        Returns:
+            bytes: the picture
+        """
+        if self._placeholder is None:
+            pixmap = icon_from_svg(Icon.USER_ICON.value, theme.title_color).pixmap(
+                self.PLACEHOLDER_SIZE, self.PLACEHOLDER_SIZE
+            )
+            data = QByteArray()
+            buffer = QBuffer(data)
+            buffer.open(QIODevice.WriteOnly)
+            pixmap.save(buffer, "PNG")
+            self._placeholder = data.data()
+        return self._placeholder
+
+    def update_theme(self, labels: Iterable[AvatarLabel]) -> None:
+        """
+        Render the placeholder again in the colors of the new theme, and swap
+        it in the labels displaying the previous one
+
+        Args:
+            labels (Iterable[AvatarLabel]): the labels
+        """
+        previous, self._placeholder = self._placeholder, None
+        if previous is None:
+            return
+        for label in labels:
+            if label.content is previous:
+                label.content = self.placeholder
+
+    def get_avatar(self, username: str) -> Union[str, bytes]:
+        """
+        Picture of a user if known, the placeholder otherwise
+
+        Args:
+            username (str): username
+
+        Returns:
+            Union[str, bytes]: the picture, the placeholder if the user has none
+        """
+        return self.parent.api_controller.get_avatar(username) or self.placeholder
+
+    def watch(
+        self,
+        username: str,
+        label: Any,
+        callback: Callable[[Union[str, bytes]], None],
+    ) -> None:
+        """
+        Fetch the avatar of a user when the label becomes visible
+
+        Args:
+            username (str): username
+            label (Any): label or message row displaying the placeholder,
+                with an on_visible hook called once painted
+            callback (Callable[[Union[str, bytes]], None]): called with the avatar
+        """
+        if username in self.ui.users_pict:
+            return
+        label.on_visible = partial(self.request, username, callback, label)
+
+    def create_avatar_label(self, username: str, **kwargs) -> AvatarLabel:
+        """
+        Create the avatar label of a user, with a placeholder if unknown
+
+        Args:
+            username (str): username
+
+        Returns:
+            AvatarLabel: the label
+        """
+        label = AvatarLabel(content=self.get_avatar(username), **kwargs)
+        self.watch(username, label, partial(self.update_label, label))
+        return label
+
+    def request(
+        self,
+        username: str,
+        callback: Optional[Callable[[Union[str, bytes]], None]] = None,
+        label: Optional[Any] = None,
+    ) -> None:
+        """
+        Fetch and decode the avatar of a user in background, once for all widgets
+
+        Args:
+            username (str): username
+            callback (Optional[Callable[[Union[str, bytes]], None]], optional):
+            called with the avatar.
+            label (Optional[Any], optional): label or message row displaying the
+            placeholder, watched again if the fetch fails.
+        """
+        if username in self.ui.users_pict:
+            if callback:
+                callback(self.ui.users_pict[username] or self.placeholder)
+            return
+
+        # Failed recently, fetched again when painted after the delay
+        failure = self.failures.get(username)
+        if failure and self.clock() < failure.retry_at:
+            if label is not None and callback:
+                self.watch(username, label, callback)
+            return
+
+        callbacks = self.waiting.setdefault(username, [])
+        if callback:
+            callbacks.append((label, callback))
+        if username in self.in_flight:
+            return
+        self.in_flight.add(username)
+        run_in_background(
+            self.parent.api_controller.fetch_picture,
+            username,
+            on_result=partial(self.on_avatar_fetched, username),
+            on_error=partial(self.on_avatar_failed, username),
+            pool=self.pool,
+        )
+
+    def on_avatar_fetched(self, username: str, content: Union[bool, bytes]) -> None:
+        """
+        Store the avatar and swap it in the waiting widgets
+
+        Args:
+            username (str): username
+            content (Union[bool, bytes]): the picture, False if not found
+        """
+        self.in_flight.discard(username)
+        self.failures.pop(username, None)
+        # The user logged out in the meantime
+        if username not in self.waiting:
+            return
+
+        if username not in self.ui.users_pict:
+            if (
+                username in self.ui.users_connected
+                or username in global_variables.user_disconnect
+            ):
+                # The entry of the user is waiting for the avatar as well
+                self.ui.users_pict[username] = content or ""
+            else:
+                self.parent.api_controller.set_user_icon(username, content)
+
+        avatar = self.ui.users_pict[username] or self.placeholder
+        for _, callback in self.waiting.pop(username):
+            callback(avatar)
+
+    def on_avatar_failed(self, username: str, _: Exception) -> None:
+        """
+        Forget the waiting widgets, they keep the placeholder and fetch the
+        avatar again once painted after the delay
+
+        Args:
+            username (str): username
+        """
+        self.in_flight.discard(username)
+        failure = self.failures.get(username)
+        nb_of_failures = failure.nb_of_failures + 1 if failure else 1
+        delay = min(self.RETRY_DELAY * 2 ** (nb_of_failures - 1), self.MAX_RETRY_DELAY)
+        self.failures[username] = FailedFetch(nb_of_failures, self.clock() + delay)
+        for label, callback in self.waiting.pop(username, ()):
+            if label is not None:
+                self.watch(username, label, callback)
+
+    def update_label(self, label: AvatarLabel, content: Union[str, bytes]) -> None:
+        """
+        Swap the avatar of a label
+
+        Args:
+            label (AvatarLabel): the label
+            content (Union[str, bytes]): the avatar
+        """
+        # The label may have been deleted while the avatar was fetched
+        with contextlib.suppress(RuntimeError):
+            label.set_content(content)
+
+    def clear(self) -> None:
+        """
+        Forget the waiting widgets and the failures
+        """
+        self.waiting.clear()
+        self.failures.clear()
@@ -0,0 +1,113 @@
+"""Module for history window controller"""
+
+import logging
+from itertools import chain
+from typing import Optional
+
+from PySide6.QtCore import QPoint
+
+from src.client.view.layout.message_layout import MessageLayout, MessageRecord
+from src.tools.history_window import HistoryWindow
+
+
+class HistoryWindowController:
+    """
+    History window controller class.
+
+    Each conversation keeps a window of materialized messages around the
+    visible ones, the messages scrolled far out of view are swapped for
+    compact records and rebuilt once scrolled back.
+    """
+
+    # Number of messages kept materialized in each conversation
+    WINDOW_SIZE = 200
+
+    def __init__(self, parent, ui) -> None:
+        self.parent = parent
+        self.ui = ui
+        self.window = HistoryWindow(self.WINDOW_SIZE)
+
+    def materialize(self, room_name: str, record: MessageRecord) -> MessageLayout:
+        """
+        Rebuild the message of a record
+
+        Args:
+            room_name (str): the room or the user of the conversation
+            record (MessageRecord): the compact message
+
+        Returns:
+            MessageLayout: the message
+        """
+        response_model = (
+            self.get_message(room_name, record.response_id)
+            if record.response_id
+            else None
+        )
+        message = MessageLayout.from_record(self.parent, record, response_model)
+        message.is_displayed = True
+        room = self.parent.messages_dict.get(room_name, {})
+        if room.get(record.message_id) is record:
+            room[record.message_id] = message
+        self.window.rematerialized += 1
+        return message
+
+    def get_message(self, room_name: str, message_id: int) -> Optional[MessageLayout]:
+        """
+        Message of a conversation, rebuilt if it is a record
+
+        Args:
+            room_name (str): the room or the user of the conversation
+            message_id (int): id of the message
+
+        Returns:
+            Optional[MessageLayout]: the message, None if unknown
+        """
+        message = self.parent.messages_dict.get(room_name, {}).get(message_id)
+        if not isinstance(message, MessageRecord):
+            return message
+
+        scroll_area = self.ui.body_gui_dict.get(room_name)
+        row = scroll_area.model.row_of(message) if scroll_area else -1
+        if row >= 0:
+            return scroll_area.model.materialize(row)
+        return self.materialize(room_name, message)
+
+    def trim(self, scroll_area) -> None:
+        """
+        Swap the messages out of the window of a conversation for records,
+        once more messages than the window are materialized
+
+        Args:
+            scroll_area (BodyScrollArea): the conversation
+        """
+        model = scroll_area.model
+        nb_of_materialized = model.nb_of_materialized
+        if nb_of_materialized <= self.window.size:
+            return
+        nb_of_rows = model.rowCount()
+
+        list_view = scroll_area.message_list
+        first_visible = list_view.indexAt(QPoint(0, 0)).row()
+        last_visible = list_view.indexAt(
+            QPoint(0, list_view.viewport().height() - 1)
+        ).row()
+        start, end = self.window.get_window(
+            nb_of_rows,
+            first_visible if first_visible >= 0 else 0,
+            last_visible if last_visible >= 0 else nb_of_rows - 1,
+        )
+
+        room = self.parent.messages_dict.get(scroll_area.name, {})
+        nb_of_dematerialized = 0
+        for row in chain(range(start), range(end, nb_of_rows)):
+            if record := model.dematerialize(row):
+                room[record.message_id] = record
+                nb_of_dematerialized += 1
+        self.window.record_trim(nb_of_dematerialized, nb_of_materialized)
+
+    def clear(self) -> None:
+        """
+        Log the stats of the session
+        """
+        logging.info("History window: %s", self.window.get_stats())
+        self.window.clear()
@@ -1,16 +1,17 @@
 """Module for messages controller"""
 
-import logging
+from datetime import datetime, timezone
 from functools import partial
-from typing import List, Optional, OrderedDict, Union
+from typing import Dict, List, Optional, OrderedDict, Set, Tuple, Union
 
 from PySide6.QtCore import QTimer
 
 from src.client.client import Client
 from src.client.controller import global_variables
-from src.client.view.custom_widget.custom_avatar_label import AvatarLabel, AvatarStatus
+from src.client.view.custom_widget.custom_avatar_label import AvatarStatus
 from src.client.view.layout.message_layout import MessageLayout
 from src.tools.utils import GenericColor
+from src.tools.workers import run_in_background
 
 
 class MessagesController:
@@ -23,6 +24,10 @@ class MessagesController:
         self.ui = ui
         self.messages_dict = messages_dict
 
+        # Conversations loaded lazily, on open or on hover
+        self.last_message_id: Optional[int] = None
+        self.history_requested: Set[str] = set()
+
     # pylint: disable=too-many-arguments
     # pylint: disable=too-many-locals
     def diplay_self_message_on_gui(
@@ -60,7 +65,7 @@ class MessagesController:
             message = MessageLayout(
                 self.parent,
                 comming_msg,
-                content=self.ui.users_pict[sender],
+                content=self.parent.api_controller.get_avatar(sender),
                 message_id=message_id,
                 nb_react=nb_react,
                 date=date,
@@ -74,15 +79,15 @@ class MessagesController:
                     message, border_color=self.parent.theme.emoji_color
                 )
         else:
-            message = self.messages_dict[frame_name][message_id]
+            message = self.parent.history_window_controller.get_message(
+                frame_name, message_id
+            )
 
         # Display message on gui on the frame
         if display:
-            if reverse:
-                self.ui.body_gui_dict[frame_name].main_layout.insertLayout(0, message)
-            else:
-                self.ui.body_gui_dict[frame_name].main_layout.addLayout(message)
+            self.ui.body_gui_dict[frame_name].add_message(message, at_top=reverse)
             message.is_displayed = True
+            self.parent.pagination_controller.track_message(frame_name, message_id)
 
         self.ui.footer_widget.entry.clear()
 
@@ -95,10 +100,28 @@ class MessagesController:
         older_messages: dict,
         display: Optional[bool] = True,
         reverse: Optional[bool] = False,
+        reply_targets: Optional[Dict[int, dict]] = None,
     ) -> None:
         """
         Update gui with older messages
+
+        Args:
+            older_messages (dict): the messages
+            display (Optional[bool], optional): Defaults to True.
+            reverse (Optional[bool], optional): Defaults to False.
+            reply_targets (Optional[Dict[int, dict]], optional): messages replied
+            by the page, fetched in one batch if None.
         """
+        if reply_targets is None:
+            reply_targets = self.parent.api_controller.get_reply_targets(
+                older_messages,
+                {
+                    message_id
+                    for room in self.messages_dict.values()
+                    for message_id in room
+                },
+            )
+
         sender_list: list[str] = []
 
         for message in older_messages:
@@ -121,15 +144,16 @@ class MessagesController:
                 message["is_readed"],
                 message["response_id"],
             )
+            is_room = self.parent.room_controller.is_room(receiver)
             if (
-                receiver != "home"
+                not is_room
                 and sender != self.ui.client.user_name
                 and receiver != self.ui.client.user_name
             ):
                 continue
 
-            if receiver == "home":
-                dict_name = "home"
+            if is_room:
+                dict_name = receiver
             else:
                 dict_name = receiver if sender == self.ui.client.user_name else sender
 
@@ -137,14 +161,24 @@ class MessagesController:
             if dict_name not in self.messages_dict.keys():
                 self.messages_dict[dict_name] = OrderedDict()
 
-            if response_id and response_id not in self.messages_dict[dict_name]:
-                older_message = self.parent.api_controller.get_older_message(
-                    response_id
+            if (
+                response_id
+                and response_id not in self.messages_dict[dict_name]
+                and response_id in reply_targets
+            ):
+                self.display_older_messages(
+                    [reply_targets[response_id]],
+                    display=False,
+                    reverse=True,
+                    reply_targets=reply_targets,
                 )
-                self.display_older_messages(older_message, display=False, reverse=True)
 
             message_model = (
-                self.messages_dict[dict_name][response_id] if response_id else None
+                self.parent.history_window_controller.get_message(
+                    dict_name, response_id
+                )
+                if response_id
+                else None
             )
 
             # Add a special char to handle the ":" in the message
@@ -154,12 +188,12 @@ class MessagesController:
             if sender not in sender_list:
                 sender_list.append(sender)
 
-            # Display message on gui on the home frame
-            if receiver == "home":
+            # Display message on gui on the room frame
+            if is_room:
                 self.diplay_self_message_on_gui(
                     sender,
                     message,
-                    frame_name="home",
+                    frame_name=receiver,
                     message_id=message_id,
                     nb_react=int(reaction_nb),
                     date=date,
@@ -172,9 +206,8 @@ class MessagesController:
                 direct_message_name = (
                     receiver if sender == self.ui.client.user_name else sender
                 )
-                icon = AvatarLabel(
-                    content=self.ui.users_pict[direct_message_name],
-                    status=AvatarStatus.DEACTIVATED,
+                icon = self.parent.avatar_loader_controller.create_avatar_label(
+                    direct_message_name, status=AvatarStatus.DEACTIVATED
                 )
                 self.parent.add_gui_for_mp_layout(direct_message_name, icon)
 
@@ -183,6 +216,7 @@ class MessagesController:
                     self.parent.avatar_controller.update_pixmap_avatar(
                         direct_message_name, AvatarStatus.DM
                     )
+                    self.parent.read_state_controller.set_unread(direct_message_name)
 
                 self.diplay_self_message_on_gui(
                     sender,
@@ -200,9 +234,11 @@ class MessagesController:
         if self.ui.client.user_name in sender_list:
             sender_list.remove(self.ui.client.user_name)
 
+    # pylint: disable=too-many-branches
     def diplay_coming_message_on_gui(self) -> None:
         """
-        Callback to update gui with input messages
+        Callback to update gui with input messages, the replied message is
+        fetched in background if unknown
         """
         if not global_variables.comming_msg["message"]:
             return None
@@ -214,6 +250,13 @@ class MessagesController:
 
         receiver = global_variables.comming_msg["receiver"]
 
+        # The message sent by the user is already displayed as pending
+        if self.acknowledge_pending_message(receiver, message, message_id):
+            global_variables.comming_msg = dict.fromkeys(
+                global_variables.comming_msg, ""
+            )
+            return None
+
         if response_id := global_variables.comming_msg["response_id"]:
             response_id = int(response_id)
             if receiver == self.ui.client.user_name:
@@ -221,20 +264,18 @@ class MessagesController:
             else:
                 response_model_receiver = receiver
 
-            if (
-                response_id
-                and response_id not in self.messages_dict[response_model_receiver]
-            ):
-                older_message = self.parent.api_controller.get_older_message(
-                    response_id
-                )
-                self.display_older_messages(older_message, display=False, reverse=True)
-            message_model = self.messages_dict[response_model_receiver][response_id]
+            message_model = self.parent.history_window_controller.get_message(
+                response_model_receiver, response_id
+            )
 
+        # Fetched in the worker pool of the avatars, swapped in once decoded
+        self.parent.avatar_loader_controller.request(global_variables.comming_msg["id"])
         message = MessageLayout(
             self.parent,
             global_variables.comming_msg,
-            content=self.ui.users_pict[global_variables.comming_msg["id"]],
+            content=self.parent.api_controller.get_avatar(
+                global_variables.comming_msg["id"]
+            ),
             message_id=message_id
             if global_variables.comming_msg["id"] != "server"
             else None,
@@ -244,8 +285,8 @@ class MessagesController:
             self.parent.update_stylesheet_with_focus_event(
                 message, border_color=self.parent.theme.emoji_color
             )
-            if global_variables.comming_msg["receiver"] == "home":
-                self.parent.room_icon.update_pixmap(
+            if room_icon := self.parent.room_icons.get(receiver):
+                room_icon.update_pixmap(
                     AvatarStatus.DM,
                     background_color=self.parent.theme.rgb_background_color_rooms,
                 )
@@ -257,12 +298,14 @@ class MessagesController:
         else:
             update_avatar = False
 
-        if receiver not in {"home", self.ui.client.user_name}:
+        if (
+            not self.parent.room_controller.is_room(receiver)
+            and receiver != self.ui.client.user_name
+        ):
             self.parent.add_gui_for_mp_layout(
                 receiver,
-                AvatarLabel(
-                    content=self.ui.users_pict[global_variables.comming_msg["id"]],
-                    status=AvatarStatus.DM,
+                self.parent.avatar_loader_controller.create_avatar_label(
+                    global_variables.comming_msg["id"], status=AvatarStatus.DM
                 ),
             )
 
@@ -272,6 +315,7 @@ class MessagesController:
                 AvatarStatus.DM,
                 background_color=self.parent.theme.rgb_background_color_actif,
             )
+            self.parent.read_state_controller.set_unread(receiver)
 
         # Init dict key
         if receiver not in self.messages_dict.keys():
@@ -279,44 +323,213 @@ class MessagesController:
 
         self.messages_dict[receiver][message_id] = message
 
-        self.ui.body_gui_dict[receiver].main_layout.addLayout(message)
+        self.ui.body_gui_dict[receiver].add_message(message)
         message.is_displayed = True
+        self.parent.pagination_controller.track_message(receiver, message.message_id)
+
+        if response_id and message_model is None:
+            self.fetch_reply_target(message, response_model_receiver, response_id)
 
         # Clear the dict values
         global_variables.comming_msg = dict.fromkeys(global_variables.comming_msg, "")
         return None
 
-    def add_older_messages_on_scroll(self) -> None:
+    def fetch_reply_target(
+        self, message: MessageLayout, room_name: str, response_id: int
+    ) -> None:
         """
-        Add older messages on scroll
+        Fetch the message replied by an incoming message in background, the
+        incoming message is displayed without preview until then
+
+        Args:
+            message (MessageLayout): the incoming message
+            room_name (str): the room or the user of the conversation
+            response_id (int): id of the replied message
         """
-        # To avoid multiple scroll event, fetch the first message id
-        first_id = self.parent.api_controller.get_first_message_id(
-            self.ui.scroll_area.name, self.ui.client.user_name
+        run_in_background(
+            self.parent.api_controller.get_reply_targets,
+            [{"message_id": message.message_id, "response_id": response_id}],
+            tuple(self.messages_dict.get(room_name, ())),
+            on_result=partial(
+                self.on_reply_target_fetched, room_name, message.message_id, response_id
+            ),
+        )
+
+    def on_reply_target_fetched(
+        self,
+        room_name: str,
+        message_id: int,
+        response_id: int,
+        reply_targets: Dict[int, dict],
+    ) -> None:
+        """
+        Add the preview of the replied message to the incoming message
+
+        Args:
+            room_name (str): the room or the user of the conversation
+            message_id (int): id of the incoming message
+            response_id (int): id of the replied message
+            reply_targets (Dict[int, dict]): the replied messages by id
+        """
+        history_window_controller = self.parent.history_window_controller
+        # The user logged out in the meantime
+        if not (
+            message := history_window_controller.get_message(room_name, message_id)
+        ):
+            return
+
+        if response_id not in self.messages_dict[room_name]:
+            if response_id not in reply_targets:
+                return
+            self.display_older_messages(
+                [reply_targets[response_id]],
+                display=False,
+                reverse=True,
+                reply_targets=reply_targets,
+            )
+        message.response_model = history_window_controller.get_message(
+            room_name, response_id
         )
-        try:
-            message_id_list = list(
-                self.messages_dict[self.ui.scroll_area.name].values()
+        if (
+            message.response_model
+            and message.response_model.sender_ == self.ui.client.user_name
+        ):
+            self.parent.update_stylesheet_with_focus_event(
+                message, border_color=self.parent.theme.emoji_color
             )
-        except KeyError:
-            logging.debug("No messages to display")
-            return True
+        message.refresh(resize=True)
 
-        message_id_list.sort(key=lambda x: x.message_id)
+    def acknowledge_pending_message(
+        self, receiver: str, message: str, message_id: int
+    ) -> bool:
+        """
+        Give its id to the pending message matching the incoming one
 
-        last_message_id = next(
-            (message.message_id for message in message_id_list if message.is_displayed)
+        Args:
+            receiver (str): the room or the user of the conversation
+            message (str): the message
+            message_id (int): id of the message
+
+        Returns:
+            bool: True if the incoming message was pending
+        """
+        if global_variables.comming_msg["id"] != self.ui.client.user_name:
+            return False
+        response_id = global_variables.comming_msg["response_id"]
+        message_layout = self.parent.pending_controller.acknowledge(
+            receiver, message, int(response_id) if response_id else None, message_id
         )
+        if not message_layout:
+            return False
 
-        # If the first id is the same as the last message id,
-        # it means that we have reached the end of the messages
-        if first_id == last_message_id:
-            return True
+        if receiver not in self.messages_dict.keys():
+            self.messages_dict[receiver] = OrderedDict()
+        self.messages_dict[receiver][message_id] = message_layout
+        self.parent.pagination_controller.track_message(receiver, message_id)
+        return True
 
-        self.parent.fetch_older_messages(
-            last_message_id, 4, self.ui.scroll_area.name, display=True
+    def add_older_messages_on_scroll(self) -> None:
+        """
+        Add older messages on scroll, before the top is reached
+        """
+        self.parent.pagination_controller.on_scroll(self.ui.scroll_area)
+
+    def load_history(self, room_name: str) -> None:
+        """
+        Display the stored messages of a conversation and fetch the newer ones
+        in background, only once
+
+        Args:
+            room_name (str): the room or the user of the conversation
+        """
+        if room_name in self.history_requested:
+            return
+        self.history_requested.add(room_name)
+
+        api_controller = self.parent.api_controller
+        nb_of_messages = self.parent.connection_controller.NB_OF_MESSAGES
+        known_ids = set(self.messages_dict.get(room_name, ()))
+        run_in_background(
+            lambda: api_controller.with_reply_targets(
+                [
+                    message
+                    for message in api_controller.get_local_messages(
+                        room_name, nb_of_messages
+                    )
+                    if message["message_id"] not in known_ids
+                ],
+                known_ids,
+            ),
+            on_result=partial(self.on_local_history_fetched, room_name),
+            on_error=partial(self.on_history_failed, room_name),
+        )
+
+    def on_local_history_fetched(
+        self, room_name: str, page: Tuple[List[dict], Dict[int, dict]]
+    ) -> None:
+        """
+        Display the stored messages of a conversation then fetch the newer ones
+
+        Args:
+            room_name (str): the room or the user of the conversation
+            page (Tuple[List[dict], Dict[int, dict]]): messages and replied messages
+        """
+        # The user logged out in the meantime
+        if room_name not in self.history_requested:
+            return
+
+        messages, reply_targets = page
+        self.display_older_messages(
+            messages, display=True, reverse=True, reply_targets=reply_targets
+        )
+
+        api_controller = self.parent.api_controller
+        last_message_id = self.last_message_id
+        # The messages of a room are only pushed once subscribed
+        is_room = self.parent.room_controller.is_room(room_name)
+        known_ids = set(self.messages_dict.get(room_name, ()))
+        run_in_background(
+            lambda: api_controller.with_reply_targets(
+                api_controller.sync_conversation(
+                    room_name,
+                    api_controller.get_last_message_id()
+                    if is_room
+                    else last_message_id,
+                    self.parent.connection_controller.NB_OF_MESSAGES,
+                ),
+                known_ids,
+            ),
+            on_result=partial(self.on_history_fetched, room_name),
+            on_error=partial(self.on_history_failed, room_name),
+        )
+
+    def on_history_failed(self, room_name: str, _: Exception) -> None:
+        """
+        Fetch the history again when the conversation is opened next time
+
+        Args:
+            room_name (str): the room or the user of the conversation
+        """
+        self.history_requested.discard(room_name)
+
+    def on_history_fetched(
+        self, room_name: str, page: Tuple[List[dict], Dict[int, dict]]
+    ) -> None:
+        """
+        Display the messages newer than the stored ones
+
+        Args:
+            room_name (str): the room or the user of the conversation
+            page (Tuple[List[dict], Dict[int, dict]]): messages and replied messages
+        """
+        # The user logged out in the meantime
+        if room_name not in self.history_requested:
+            return
+
+        new_messages, reply_targets = page
+        self.display_older_messages(
+            new_messages[::-1], display=True, reverse=False, reply_targets=reply_targets
         )
-        return None
 
     def handle_message(self, payload: str) -> None:
         """
@@ -341,6 +554,23 @@ class MessagesController:
         global_variables.comming_msg["receiver"] = receiver.replace(" ", "")
         global_variables.comming_msg["message"] = message.replace("$replaced$", ":")
 
+        self.parent.api_controller.store_message(
+            {
+                "message_id": int(message_id),
+                "sender": sender,
+                "receiver": global_variables.comming_msg["receiver"],
+                "message": message,
+                "reaction_nb": 0,
+                "created_at": datetime.now(timezone.utc).strftime(
+                    "%Y-%m-%dT%H:%M:%S.%f%z"
+                ),
+                "is_readed": global_variables.comming_msg["receiver"]
+                != self.ui.client.user_name,
+                "response_id": int(payload_fields[4])
+                if len(payload_fields) == 5
+                else None,
+            }
+        )
         self.parent.event_manager.event_coming_message()
 
     def get_all_dm_users_username(self) -> dict[str, list[str]]:
@@ -351,22 +581,6 @@ class MessagesController:
             self.ui.client.user_name
         )
 
-    def fetch_older_messages(
-        self, start: int, number: int, username: str, display=True
-    ) -> None:
-        """
-        Fetch older messages from the server
-
-        Args:
-            start (int): start offset
-            number (int): number of messages
-        """
-        older_messages_list: List = self.parent.api_controller.get_older_messages(
-            start, number, self.ui.client.user_name, username
-        )
-
-        self.display_older_messages(older_messages_list, display, reverse=True)
-
     def reply_to_message(self, message: MessageLayout) -> None:
         """
         Reply to a message
@@ -377,8 +591,7 @@ class MessagesController:
         # Update reply entry
         self.ui.footer_widget.reply_entry_action.triggered.emit()
 
-        style_sheet_main = message.main_widget.styleSheet()
-        style_sheet_left = message.left_widget.styleSheet()
+        highlight = (message.background_color, message.border_color)
 
         self.parent.update_stylesheet_with_focus_event(
             message, border_color=GenericColor.RED.value
@@ -387,11 +600,9 @@ class MessagesController:
         def callback(
             message: MessageLayout,
             older_room_name: str,
-            style_sheet_main_: str,
-            style_sheet_left_: str,
+            highlight_: tuple,
         ):
-            message.main_widget.setStyleSheet(style_sheet_main_)
-            message.left_widget.setStyleSheet(style_sheet_left_)
+            message.set_highlight(*highlight_)
             global_variables.reply_id = ""
             older_room_name = older_room_name.replace("\n", "")
             self.ui.footer_widget.entry.setPlaceholderText(older_room_name)
@@ -403,9 +614,7 @@ class MessagesController:
         )
         self.ui.footer_widget.entry.setFocus()
         self.ui.footer_widget.reply_entry_action.triggered.connect(
-            partial(
-                callback, message, older_room_name, style_sheet_main, style_sheet_left
-            )
+            partial(callback, message, older_room_name, highlight)
         )
         global_variables.reply_id = f"#{message.message_id}/"
 
@@ -0,0 +1,227 @@
+"""Module for pagination controller"""
+
+import logging
+import math
+import time
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QTimer
+
+from src.tools.workers import run_in_background
+
+
+# pylint: disable=too-few-public-methods
+class PaginationCursor:
+    """
+    Pagination state of a conversation.
+    """
+
+    def __init__(self) -> None:
+        # Oldest message displayed, the next page is older than it
+        self.oldest_id: Optional[int] = None
+        # The first message of the conversation is displayed
+        self.is_exhausted = False
+        self.is_loading = False
+
+        # Scroll velocity, in pixels per second toward the top
+        self.velocity = 0.0
+        self.last_position: Optional[int] = None
+        self.last_scroll_at = 0.0
+
+        # Duration of the last page request, in seconds
+        self.fetch_duration = 0.2
+
+
+class PaginationController:
+    """
+    Pagination controller class.
+
+    Fetch the older messages of a conversation before the top is reached,
+    the page is large enough to cover the scroll during the next request.
+    """
+
+    MIN_PAGE_SIZE = 10
+    MAX_PAGE_SIZE = 50
+    # Distance from the top triggering the next page, in screens
+    PREFETCH_SCREENS = 2
+    # Above this delay between two scroll events, the velocity is reset
+    VELOCITY_TIMEOUT = 0.5
+    VELOCITY_SMOOTHING = 0.5
+
+    def __init__(self, parent, ui, messages_dict: dict) -> None:
+        self.parent = parent
+        self.ui = ui
+        self.messages_dict = messages_dict
+        self.cursors: Dict[str, PaginationCursor] = {}
+
+    def get_cursor(self, room_name: str) -> PaginationCursor:
+        """
+        Get the cursor of a conversation
+
+        Args:
+            room_name (str): the room or the user of the conversation
+
+        Returns:
+            PaginationCursor: the cursor
+        """
+        if room_name not in self.cursors:
+            self.cursors[room_name] = PaginationCursor()
+        return self.cursors[room_name]
+
+    def track_message(self, room_name: str, message_id: Optional[int]) -> None:
+        """
+        Move the cursor if the displayed message is older than the oldest one
+
+        Args:
+            room_name (str): the room or the user of the conversation
+            message_id (Optional[int]): id of the displayed message
+        """
+        if message_id is None:
+            return
+        cursor = self.get_cursor(room_name)
+        if cursor.oldest_id is None or message_id < cursor.oldest_id:
+            cursor.oldest_id = message_id
+
+    def on_scroll(self, scroll_area) -> None:
+        """
+        Update the scroll velocity and fetch the next page if the top is near
+
+        Args:
+            scroll_area (BodyScrollArea): the scrolled conversation
+        """
+        cursor = self.get_cursor(scroll_area.name)
+        position = scroll_area.verticalScrollBar().sliderPosition()
+        now = time.perf_counter()
+
+        elapsed = now - cursor.last_scroll_at
+        if cursor.last_position is None or elapsed > self.VELOCITY_TIMEOUT:
+            cursor.velocity = 0.0
+        elif elapsed > 0:
+            velocity = max(cursor.last_position - position, 0) / elapsed
+            cursor.velocity += self.VELOCITY_SMOOTHING * (velocity - cursor.velocity)
+        cursor.last_position, cursor.last_scroll_at = position, now
+
+        self.prefetch(scroll_area)
+
+    def prefetch(self, scroll_area) -> None:
+        """
+        Fetch the next page if the top is near
+
+        Args:
+            scroll_area (BodyScrollArea): the conversation
+        """
+        cursor = self.get_cursor(scroll_area.name)
+        if cursor.is_loading or cursor.is_exhausted or cursor.oldest_id is None:
+            return
+
+        scroll_bar = scroll_area.verticalScrollBar()
+        distance = scroll_bar.sliderPosition() - scroll_bar.minimum()
+        if distance > self.PREFETCH_SCREENS * scroll_bar.pageStep():
+            return
+
+        self.fetch_next_page(scroll_area.name, self.get_page_size(scroll_area))
+
+    def get_page_size(self, scroll_area) -> int:
+        """
+        Number of messages covering one screen and the scroll during a request
+
+        Args:
+            scroll_area (BodyScrollArea): the conversation
+
+        Returns:
+            int: the page size
+        """
+        cursor = self.get_cursor(scroll_area.name)
+        nb_of_messages = len(self.messages_dict.get(scroll_area.name, ())) or 1
+        message_height = max(scroll_area.content_height() / nb_of_messages, 1)
+        pixels = (
+            cursor.velocity * cursor.fetch_duration
+            + scroll_area.verticalScrollBar().pageStep()
+        )
+        return min(
+            max(math.ceil(pixels / message_height), self.MIN_PAGE_SIZE),
+            self.MAX_PAGE_SIZE,
+        )
+
+    def fetch_next_page(self, room_name: str, page_size: int) -> None:
+        """
+        Fetch the messages older than the cursor in background
+
+        Args:
+            room_name (str): the room or the user of the conversation
+            page_size (int): number of messages
+        """
+        cursor = self.get_cursor(room_name)
+        cursor.is_loading = True
+
+        api_controller = self.parent.api_controller
+        oldest_id = cursor.oldest_id
+        known_ids = set(self.messages_dict.get(room_name, ()))
+        run_in_background(
+            lambda: api_controller.with_reply_targets(
+                api_controller.get_history_page(oldest_id, page_size, room_name),
+                known_ids,
+            ),
+            on_result=partial(
+                self.on_page_fetched, cursor, room_name, page_size, time.perf_counter()
+            ),
+            on_error=lambda _: setattr(cursor, "is_loading", False),
+        )
+
+    # pylint: disable=too-many-arguments
+    def on_page_fetched(
+        self,
+        cursor: PaginationCursor,
+        room_name: str,
+        page_size: int,
+        started_at: float,
+        page: Tuple[List[dict], Dict[int, dict]],
+    ) -> None:
+        """
+        Display the page above the displayed messages, at the same position
+
+        Args:
+            cursor (PaginationCursor): cursor of the request
+            room_name (str): the room or the user of the conversation
+            page_size (int): number of messages requested
+            started_at (float): start of the request
+            page (Tuple[List[dict], Dict[int, dict]]): messages and replied messages
+        """
+        # The user logged out in the meantime
+        if self.cursors.get(room_name) is not cursor:
+            return
+        messages, reply_targets = page
+        cursor.is_loading = False
+        cursor.fetch_duration = time.perf_counter() - started_at
+
+        # Messages already displayed, the page did not move past the cursor
+        older_messages = [
+            message
+            for message in messages
+            if cursor.oldest_id is None or message["message_id"] < cursor.oldest_id
+        ]
+        if len(older_messages) < len(messages):
+            logging.warning(
+                "%s: %d messages of the page are not older than %s",
+                room_name,
+                len(messages) - len(older_messages),
+                cursor.oldest_id,
+            )
+        cursor.is_exhausted = len(messages) < page_size or not older_messages
+
+        if scroll_area := self.ui.body_gui_dict.get(room_name):
+            scroll_area.keep_position()
+        self.parent.messages_controller.display_older_messages(
+            older_messages, display=True, reverse=True, reply_targets=reply_targets
+        )
+
+        # The page may not fill the screen
+        if scroll_area and scroll_area is self.ui.scroll_area:
+            QTimer.singleShot(0, partial(self.prefetch, scroll_area))
+
+    def clear(self) -> None:
+        """
+        Reset the cursors
+        """
+        self.cursors.clear()
@@ -0,0 +1,201 @@
+"""Module for pending messages controller"""
+
+import logging
+import statistics
+import time
+from collections import deque
+from functools import partial
+from typing import Deque, Dict, Optional, Tuple
+
+from PySide6.QtCore import QTimer
+
+from src.client.view.layout.message_layout import MessageLayout
+from src.tools.commands import Commands
+
+
+# pylint: disable=too-few-public-methods
+class PendingMessage:
+    """
+    Message displayed before its echo from the server.
+    """
+
+    def __init__(
+        self, room_name: str, message: str, response_id: Optional[int], layout
+    ) -> None:
+        self.room_name = room_name
+        self.message = message
+        self.response_id = response_id
+        self.layout = layout
+        self.sent_at = time.perf_counter()
+        self.is_failed = False
+
+
+class PendingController:
+    """
+    Pending messages controller class.
+
+    Sent messages are displayed at once, the server echo is matched with the
+    oldest pending message of the same room, text and reply.
+    """
+
+    # Without echo after this delay, in milliseconds, the message is shown as failed
+    ACK_TIMEOUT = 10000
+    # Number of send-to-ack latencies kept for the stats
+    LATENCY_HISTORY = 100
+
+    def __init__(self, parent, ui) -> None:
+        self.parent = parent
+        self.ui = ui
+        self.pending: Dict[Tuple[str, str, Optional[int]], Deque[PendingMessage]] = {}
+        self.latencies: Deque[float] = deque(maxlen=self.LATENCY_HISTORY)
+
+    def send_message(
+        self, message: str, room_name: str, response_id: Optional[int] = None
+    ) -> None:
+        """
+        Display the message as pending and send it to the server
+
+        Args:
+            message (str): the message
+            room_name (str): the room or the user of the conversation
+            response_id (Optional[int], optional): replied message id.
+        """
+        username = self.ui.client.user_name
+        response_model = (
+            self.parent.history_window_controller.get_message(room_name, response_id)
+            if response_id
+            else None
+        )
+        layout = MessageLayout(
+            self.parent,
+            {"id": username, "message": message},
+            content=self.parent.avatar_loader_controller.get_avatar(username),
+            response_model=response_model,
+            is_pending=True,
+        )
+        self.ui.body_gui_dict[room_name].add_message(layout)
+        layout.is_displayed = True
+        QTimer.singleShot(0, self.parent.update_scroll_bar)
+
+        pending_message = PendingMessage(room_name, message, response_id, layout)
+        self.pending.setdefault((room_name, message, response_id), deque()).append(
+            pending_message
+        )
+        QTimer.singleShot(self.ACK_TIMEOUT, partial(self.on_timeout, pending_message))
+
+        try:
+            self.ui.client.send_data(
+                Commands.MESSAGE,
+                message,
+                receiver=room_name,
+                response_id=response_id,
+            )
+        except OSError as error:
+            logging.error(error)
+            self.remove(pending_message)
+            self.fail(pending_message)
+
+    def acknowledge(
+        self,
+        room_name: str,
+        message: str,
+        response_id: Optional[int],
+        message_id: int,
+    ) -> Optional[MessageLayout]:
+        """
+        Match the echo of the server with a pending message
+
+        Args:
+            room_name (str): the room or the user of the conversation
+            message (str): the message
+            response_id (Optional[int]): replied message id
+            message_id (int): id given by the server
+
+        Returns:
+            Optional[MessageLayout]: the displayed layout, None if not pending
+        """
+        queue = self.pending.get((room_name, message, response_id))
+        if not queue:
+            return None
+        pending_message = queue.popleft()
+        if not queue:
+            del self.pending[(room_name, message, response_id)]
+
+        latency = time.perf_counter() - pending_message.sent_at
+        self.latencies.append(latency)
+        logging.debug("Message %s acknowledged in %.0f ms", message_id, latency * 1000)
+
+        pending_message.layout.acknowledge(message_id)
+        return pending_message.layout
+
+    def on_timeout(self, pending_message: PendingMessage) -> None:
+        """
+        Show the message as failed if the server did not echo it
+
+        Args:
+            pending_message (PendingMessage): the message
+        """
+        queue = self.pending.get(
+            (
+                pending_message.room_name,
+                pending_message.message,
+                pending_message.response_id,
+            ),
+            (),
+        )
+        # A late echo is still matched
+        if pending_message in queue:
+            self.fail(pending_message)
+
+    def fail(self, pending_message: PendingMessage) -> None:
+        """
+        Show the message as failed
+
+        Args:
+            pending_message (PendingMessage): the message
+        """
+        pending_message.is_failed = True
+        logging.warning("Message not sent to %s", pending_message.room_name)
+        pending_message.layout.set_failed()
+
+    def remove(self, pending_message: PendingMessage) -> None:
+        """
+        Stop waiting for the echo of a message
+
+        Args:
+            pending_message (PendingMessage): the message
+        """
+        key = (
+            pending_message.room_name,
+            pending_message.message,
+            pending_message.response_id,
+        )
+        if pending_message in (queue := self.pending.get(key, ())):
+            queue.remove(pending_message)
+            if not queue:
+                del self.pending[key]
+
+    def get_latency_stats(self) -> Dict[str, float]:
+        """
+        Send-to-ack latency of the last messages, in milliseconds
+
+        Returns:
+            Dict[str, float]: count, mean, median and max
+        """
+        if not self.latencies:
+            return {"count": 0}
+        latencies = [latency * 1000 for latency in self.latencies]
+        return {
+            "count": len(latencies),
+            "mean": statistics.mean(latencies),
+            "median": statistics.median(latencies),
+            "max": max(latencies),
+        }
+
+    def clear(self) -> None:
+        """
+        Log the latencies of the session and forget the pending messages
+        """
+        logging.info("Send to ack latency: %s", self.get_latency_stats())
+        self.pending.clear()
+        self.latencies.clear()
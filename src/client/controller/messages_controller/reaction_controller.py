@@ -1,8 +1,14 @@
 """Reaction controller module."""
 
+import logging
+import time
+
+from PySide6.QtCore import QTimer
+
 from src.client.controller import global_variables
 from src.client.view.layout.message_layout import MessageLayout
 from src.tools.commands import Commands
+from src.tools.reaction_buffer import ReactionBuffer
 
 
 class ReactController:
@@ -10,11 +16,19 @@ class ReactController:
     Reaction controller class.
     """
 
+    # Window of a message before sending its reactions, in seconds
+    REACT_WINDOW = 0.4
+
     def __init__(self, parent, ui, messages_dict: dict) -> None:
         self.parent = parent
         self.ui = ui
         self.messages_dict = messages_dict
 
+        self.reaction_buffer = ReactionBuffer(self.REACT_WINDOW)
+        self.react_timer = QTimer()
+        self.react_timer.setSingleShot(True)
+        self.react_timer.timeout.connect(self.flush_reactions)
+
     def update_react_message_on_gui(self) -> None:
         """
         Callback to update gui with input messages
@@ -27,8 +41,10 @@ class ReactController:
             global_variables.comming_msg["reaction"],
         )
 
-        if global_variables.comming_msg["receiver"] == "home":
-            dict_name = "home"
+        if self.parent.room_controller.is_room(
+            global_variables.comming_msg["receiver"]
+        ):
+            dict_name = global_variables.comming_msg["receiver"]
         else:
             dict_name = (
                 global_variables.comming_msg["receiver"]
@@ -36,7 +52,9 @@ class ReactController:
                 else global_variables.comming_msg["id"]
             )
 
-        message: MessageLayout = self.messages_dict[dict_name][int(message_id)]
+        message: MessageLayout = self.parent.history_window_controller.get_message(
+            dict_name, int(message_id)
+        )
         message.update_react(int(nb_reaction))
 
         # Reset global variables
@@ -68,11 +86,12 @@ class ReactController:
         global_variables.comming_msg["message_id"] = message_id
         global_variables.comming_msg["reaction"] = nb_reaction
 
+        self.parent.api_controller.store_reaction(int(message_id), int(nb_reaction))
         self.parent.event_manager.event_react_message()
 
     def send_emot_react(self, cmd: Commands, message_id: int, react_nb: int) -> None:
         """
-        Send emot message to the server
+        Buffer the emot message, sent at the end of the window of the message
 
         Args:
             cmd (Commands): Commands.RM_REACT ou Commands.ADD_REACT
@@ -81,8 +100,36 @@ class ReactController:
         """
         receiver: str = self.ui.scroll_area.objectName()
 
-        self.ui.client.send_data(
-            cmd,
-            ";".join([str(message_id), str(react_nb)]),
-            receiver=receiver,
+        self.reaction_buffer.add(
+            message_id,
+            receiver,
+            cmd == Commands.ADD_REACT,
+            react_nb,
+            time.perf_counter(),
         )
+        if not self.react_timer.isActive():
+            self.react_timer.start(int(self.REACT_WINDOW * 1000))
+
+    def flush_reactions(self, force: bool = False) -> None:
+        """
+        Send the reactions of the messages whose window is over
+
+        Args:
+            force (bool, optional): send every buffered reaction. Defaults to False.
+        """
+        now = None if force else time.perf_counter()
+        for cmd, message_id, react_nb, receiver in self.reaction_buffer.pop_frames(now):
+            self.ui.client.send_data(
+                cmd,
+                ";".join([str(message_id), str(react_nb)]),
+                receiver=receiver,
+            )
+        logging.debug(
+            "Reaction frames sent: %s, saved: %s",
+            self.reaction_buffer.frames_sent,
+            self.reaction_buffer.frames_saved,
+        )
+
+        if (deadline := self.reaction_buffer.next_deadline()) is not None:
+            delay = max(deadline - time.perf_counter(), 0)
+            self.react_timer.start(int(delay * 1000) + 1)
@@ -0,0 +1,92 @@
+"""Module for read state controller"""
+
+from functools import partial
+from typing import List, Set
+
+from PySide6.QtCore import QTimer
+
+from src.tools.workers import run_in_background
+
+
+class ReadStateController:
+    """
+    Read state controller class.
+
+    Know which conversations have unread messages, the read receipts are
+    merged and sent in background, in one request, after a short delay.
+    """
+
+    # Delay before sending the read receipts, in milliseconds
+    FLUSH_DELAY = 1000
+
+    def __init__(self, parent, ui) -> None:
+        self.parent = parent
+        self.ui = ui
+        self.unread: Set[str] = set()
+        self.pending_receipts: Set[str] = set()
+        # Incremented at logout, the failures of the previous session are dropped
+        self.session = 0
+
+        self.flush_timer = QTimer()
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def set_unread(self, room_name: str) -> None:
+        """
+        The conversation has unread messages
+
+        Args:
+            room_name (str): the user of the conversation
+        """
+        self.unread.add(room_name)
+
+    def mark_as_read(self, room_name: str) -> None:
+        """
+        Mark the conversation as read, nothing is sent if already read
+
+        Args:
+            room_name (str): the user of the conversation
+        """
+        if room_name not in self.unread:
+            return
+        self.unread.discard(room_name)
+        self.pending_receipts.add(room_name)
+        self.flush_timer.start(self.FLUSH_DELAY)
+
+    def flush(self) -> None:
+        """
+        Send the pending read receipts in background
+        """
+        self.flush_timer.stop()
+        if not self.pending_receipts:
+            return
+        senders = sorted(self.pending_receipts)
+        self.pending_receipts.clear()
+        run_in_background(
+            self.parent.api_controller.send_read_receipts,
+            senders,
+            self.ui.client.user_name,
+            on_error=partial(self.on_receipts_failed, self.session, senders),
+        )
+
+    def on_receipts_failed(self, session: int, senders: List[str], _) -> None:
+        """
+        The conversations are still unread, the receipts are sent again when
+        they are read
+
+        Args:
+            session (int): session of the receipts
+            senders (List[str]): users of the conversations
+        """
+        # Sent at logout, the next session reads its own states
+        if session != self.session:
+            return
+        self.unread.update(senders)
+
+    def clear(self) -> None:
+        """
+        Send the pending read receipts and forget the read states
+        """
+        self.flush()
+        self.unread.clear()
+        self.session += 1
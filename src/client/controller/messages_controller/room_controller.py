@@ -0,0 +1,115 @@
+"""Module for room controller"""
+
+import logging
+from functools import partial
+from typing import List
+
+from src.tools.commands import Commands
+from src.tools.room_subscriptions import RoomSubscriptions
+from src.tools.workers import run_in_background
+
+
+class RoomController:
+    """
+    Room controller class.
+
+    The rooms of the server are listed, only the messages of the subscribed
+    rooms are pushed: the home room at login, the other rooms once opened,
+    until the user leaves them.
+    """
+
+    DEFAULT_ROOM = "home"
+
+    def __init__(self, parent, ui) -> None:
+        self.parent = parent
+        self.ui = ui
+        self.subscriptions = RoomSubscriptions((self.DEFAULT_ROOM,))
+
+    def is_room(self, name: str) -> bool:
+        """
+        Check if a conversation is a room
+
+        Args:
+            name (str): the room or the user of the conversation
+
+        Returns:
+            bool: True for a room, False for a direct message
+        """
+        return self.subscriptions.is_room(name)
+
+    def display_rooms(self, rooms: List[str]) -> None:
+        """
+        Bootstrap step: add the rooms of the server and subscribe to home
+
+        Args:
+            rooms (List[str]): the room names
+        """
+        self.subscriptions.set_rooms(rooms)
+        for room in rooms:
+            self.parent.add_room_button(room)
+        self.subscribe(self.DEFAULT_ROOM)
+
+    def subscribe(self, room: str) -> None:
+        """
+        Ask the server for the messages of a room
+
+        Args:
+            room (str): the room
+        """
+        if not self.subscriptions.subscribe(room):
+            return
+        self.ui.client.send_data(Commands.SUBSCRIBE, room, receiver=room)
+
+        # Left earlier in the session, fetch the messages missed in the meantime
+        messages_controller = self.parent.messages_controller
+        if room in messages_controller.history_requested:
+            api_controller = self.parent.api_controller
+            known_ids = set(self.parent.messages_dict.get(room, ()))
+            run_in_background(
+                lambda: api_controller.with_reply_targets(
+                    api_controller.sync_conversation(
+                        room,
+                        api_controller.get_last_message_id(),
+                        self.parent.connection_controller.NB_OF_MESSAGES,
+                    ),
+                    known_ids,
+                ),
+                on_result=partial(messages_controller.on_history_fetched, room),
+            )
+
+    def unsubscribe(self, room: str) -> None:
+        """
+        Stop the messages of a room, home is never left
+
+        Args:
+            room (str): the room
+        """
+        if room == self.DEFAULT_ROOM or not self.subscriptions.unsubscribe(room):
+            return
+        self.ui.client.send_data(Commands.UNSUBSCRIBE, room, receiver=room)
+        if self.ui.scroll_area is self.ui.body_gui_dict.get(room):
+            self.parent.update_gui_for_mp_layout(self.DEFAULT_ROOM)
+
+    def accepts(self, receiver: str, payload: str) -> bool:
+        """
+        Count a frame received from the server, called from the router thread
+
+        Args:
+            receiver (str): receiver of the frame, a room or a user
+            payload (str): payload of the frame
+
+        Returns:
+            bool: False if the frame is for an unsubscribed room, or may be
+            for a room before the rooms bootstrap step
+        """
+        # Header and end of line are not part of the payload
+        return self.subscriptions.accepts(
+            receiver, len(payload.encode("utf-8")) + 2, self.ui.client.user_name
+        )
+
+    def clear(self) -> None:
+        """
+        Log the traffic of the session and forget the subscriptions
+        """
+        logging.info("Room traffic: %s", self.subscriptions.get_stats())
+        self.subscriptions.clear()
@@ -15,12 +15,15 @@ class RouterController:
     def __init__(self, parent, ui):
         self.ui = ui
         self.parent = parent
+        # Servers sending the roster do not need WELCOME replies
+        self.has_presence_snapshot = False
 
     def callback_routing_messages_on_ui(self) -> None:
         """
         Read messages comming from server
         """
         waiting_time = 0.01
+        self.has_presence_snapshot = False
 
         while self.ui.client.is_connected:
             header, payload = self.ui.client.read_data()
@@ -46,12 +49,18 @@ class RouterController:
                 self.ui.left_nav_widget.info_label.setText(
                     f"Users online   |   {nb_of_users}"
                 )
+            elif header == Commands.PRESENCE_SNAPSHOT.value:
+                self.has_presence_snapshot = True
+                self.parent.avatar_controller.add_presence_snapshot(
+                    payload, global_variables.user_disconnect
+                )
             elif header == Commands.HELLO_WORLD.value:
                 self.parent.avatar_controller.add_sender_avatar(
                     payload, global_variables.user_disconnect
                 )
-                # Return welcome to hello world
-                self.ui.client.send_data(Commands.WELCOME, Commands.WELCOME.name)
+                # Older servers: return welcome to hello world, for the roster
+                if not self.has_presence_snapshot:
+                    self.ui.client.send_data(Commands.WELCOME, Commands.WELCOME.name)
             elif header == Commands.WELCOME.value:
                 self.parent.avatar_controller.add_sender_avatar(
                     payload, global_variables.user_disconnect
@@ -62,7 +71,11 @@ class RouterController:
                     global_variables.user_connected,
                     global_variables.user_disconnect,
                 )
+            elif header in [Commands.SUBSCRIBE.value, Commands.UNSUBSCRIBE.value]:
+                # Older servers forward the subscriptions of the other clients
+                return
             elif header in [Commands.ADD_REACT.value, Commands.RM_REACT.value]:
-                self.parent.react_controller.handle_reaction(payload)
-            else:
+                if self.parent.room_controller.accepts(payload.split(":")[1], payload):
+                    self.parent.react_controller.handle_reaction(payload)
+            elif self.parent.room_controller.accepts(payload.split(":")[2], payload):
                 self.parent.messages_controller.handle_message(payload)
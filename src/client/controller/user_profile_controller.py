@@ -1,16 +1,24 @@
 """Module for the user profile controller."""
 
-import datetime
+import logging
 
-import pytz
+import requests
 from PySide6.QtCore import QSize, Qt
 from PySide6.QtGui import QIcon
-from PySide6.QtWidgets import QHBoxLayout, QLabel, QPlainTextEdit, QVBoxLayout, QWidget
-from tzlocal import get_localzone
+from PySide6.QtWidgets import (
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QPlainTextEdit,
+    QVBoxLayout,
+    QWidget,
+)
 
 from src.client.view.custom_widget.custom_avatar_label import AvatarLabel, AvatarStatus
 from src.client.view.custom_widget.custom_button import CustomQPushButton
+from src.tools.timestamps import timestamps
 from src.tools.utils import GenericColor, Icon, icon_from_svg
+from src.tools.workers import run_in_background
 
 
 class UserProfileController:
@@ -26,15 +34,42 @@ class UserProfileController:
 
     def update_user_icon(self) -> None:
         """
-        Update user icon
+        Update user icon, the image is processed and uploaded in background
         """
+        picture_path, _ = QFileDialog.getOpenFileName(self.ui)
+        if not picture_path:
+            return
+
+        run_in_background(
+            self.ui.backend.send_user_icon,
+            self.ui.client.user_name,
+            picture_path,
+            on_result=self.on_user_icon_sent,
+        )
+
+    def on_user_icon_sent(self, is_sent: bool) -> None:
+        """
+        Callback to refresh the user icon once uploaded
+
+        Args:
+            is_sent (bool): True if the icon has been sent
+        """
+        if not is_sent:
+            return
+
         username = self.ui.client.user_name
-        if self.ui.backend.send_user_icon(username, None):
-            self.parent.avatar_controller.clear_avatar(
-                "user_inline", self.ui.left_nav_widget, f"{username}_layout"
-            )
+        self.parent.avatar_controller.clear_avatar(
+            "user_inline", self.ui.left_nav_widget, f"{username}_layout"
+        )
+        try:
             self.parent.api_controller.get_user_icon(update_personal_avatar=True)
-            self.user_profile_widget.hide()
+        except requests.exceptions.RequestException as error:
+            # The entry is displayed again with the previous avatar
+            logging.error(error)
+            self.parent.api_controller.update_user_connected(
+                username, self.ui.users_pict.get(username, "")
+            )
+        self.user_profile_widget.hide()
 
     # pylint: disable=too-many-locals
     # pylint: disable=too-many-statements
@@ -45,17 +80,17 @@ class UserProfileController:
         if self.user_profile_widget and self.user_profile_widget.isVisible():
             return
 
-        creation_date, description = self.parent.api_controller.get_user_creation_date(
-            self.ui.client.user_name
-        )
-        local_timezone = get_localzone()
-        dt_object = datetime.datetime.strptime(creation_date, "%Y-%m-%dT%H:%M:%S.%f%z")
-        local_dt_object = dt_object.replace(tzinfo=pytz.utc).astimezone(local_timezone)
-        date_time = local_dt_object.strftime("%d/%m/%Y at %H:%M:%S")
+        api_controller = self.parent.api_controller
+        try:
+            creation_date, description = api_controller.get_user_creation_date(
+                self.ui.client.user_name
+            )
+        except requests.exceptions.RequestException as error:
+            logging.error(error)
+            return
+        date_time = timestamps.format(creation_date)
         self.user_profile_widget = QWidget()
-        self.user_profile_widget.setStyleSheet(
-            f"border-radius: 8px; border: 1px solid; border-color: {self.parent.theme.nav_color};"
-        )
+        self.user_profile_widget.setObjectName("user_profile")
         height = 250
         self.user_profile_widget.move(
             self.ui.footer_widget.user_info_widget.x() + 15,
@@ -74,11 +109,7 @@ class UserProfileController:
             status=AvatarStatus.ACTIVATED,
         )
         user_name = QLabel(self.ui.client.user_name)
-        user_name.setStyleSheet(
-            f"font-weight: bold;\
-            border: 0px solid;\
-            color: {self.parent.theme.text_color};"
-        )
+        user_name.setObjectName("profile_name")
 
         user_info = QLabel(
             f"<strong>Creation date:</strong>\
@@ -88,28 +119,19 @@ class UserProfileController:
             <strong>Description:</strong>"
         )
         user_info.setWordWrap(True)
-        user_info.setStyleSheet(
-            f"border: 0px solid;\
-            color: {self.parent.theme.text_color};"
-        )
         user_info.setContentsMargins(5, 5, 5, 5)
 
         self.status_widget = QPlainTextEdit()
+        self.status_widget.setObjectName("user_description")
         self.status_widget.setContentsMargins(5, 5, 5, 5)
         self.status_widget.setPlaceholderText(
             description or "Write your description here 🌈"
         )
-        self.status_widget.setStyleSheet(
-            f"background-color: {self.parent.theme.inner_color};\
-            color: {self.parent.theme.text_color};"
-        )
         self.status_widget.setFixedHeight(60)
 
         user_action_widget = QWidget()
+        user_action_widget.setObjectName("profile_actions")
         user_action_widget.setFixedHeight(40)
-        user_action_widget.setStyleSheet(
-            f"border: 0px solid; background-color: {self.parent.theme.search_color};"
-        )
         user_action_layout = QHBoxLayout(user_action_widget)
         user_action_layout.setContentsMargins(0, 0, 0, 0)
 
@@ -170,7 +192,10 @@ class UserProfileController:
         """
         Update user description
         """
-        self.parent.api_controller.update_user_description(
-            self.ui.client.user_name, self.status_widget.toPlainText()
-        )
+        try:
+            self.parent.api_controller.update_user_description(
+                self.ui.client.user_name, self.status_widget.toPlainText()
+            )
+        except requests.exceptions.RequestException as error:
+            logging.error(error)
         self.user_profile_widget.hide()
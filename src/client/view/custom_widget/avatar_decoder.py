@@ -0,0 +1,70 @@
+"""Module for decoding the avatars outside of the GUI thread."""
+
+from typing import Iterable
+
+from PySide6.QtCore import QObject, QSize, QTimer, Signal, Slot
+
+from src.client.view.custom_widget.avatar_pixmap_cache import (
+    AvatarPixmapCache,
+    decode_avatar,
+)
+from src.tools.icon_cache import get_device_pixel_ratio
+
+
+class AvatarDecoder(QObject):
+    """
+    Avatar decoder class.
+
+    The pictures are decoded and scaled to every avatar size in the thread
+    fetching them, the GUI thread converts the images to pixmaps in slices
+    of a frame budget, between two paints.
+
+    Args:
+        QObject (QObject): the QObject class
+    """
+
+    decoded = Signal()
+
+    def __init__(
+        self, cache: AvatarPixmapCache, sizes: Iterable[int], frame_budget: float
+    ) -> None:
+        super().__init__()
+        self.cache = cache
+        self.sizes = tuple(QSize(size, size) for size in sizes)
+        self.frame_budget = frame_budget
+        # Read in the GUI thread, used by the decoding threads
+        self.dpr = get_device_pixel_ratio()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.convert)
+        self.decoded.connect(self.schedule)
+
+    def decode(self, content: bytes) -> None:
+        """
+        Decode a picture, from any thread
+
+        Args:
+            content (bytes): the picture
+        """
+        if not content:
+            return
+        self.cache.add_images(content, decode_avatar(content, self.sizes, self.dpr))
+        self.decoded.emit()
+
+    @Slot()
+    def schedule(self) -> None:
+        """
+        Convert the decoded images at the next iteration of the event loop
+        """
+        if not self.timer.isActive():
+            self.timer.start()
+
+    @Slot()
+    def convert(self) -> None:
+        """
+        Convert the decoded images for one frame, the rest at the next one
+        """
+        if self.cache.convert_images(self.frame_budget):
+            self.timer.start()
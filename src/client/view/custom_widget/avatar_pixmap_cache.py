@@ -0,0 +1,292 @@
+"""Module for the cache of the avatar pixmaps."""
+
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum, unique
+from typing import Dict, Hashable, Iterable, Optional, Tuple, Union
+
+from PySide6.QtCore import QPoint, QRectF, QSize, Qt
+from PySide6.QtGui import QBrush, QColor, QFont, QIcon, QImage, QPainter, QPen, QPixmap
+
+from src.tools.icon_cache import get_device_pixel_ratio
+
+ImageKey = Tuple[bytes, int, int]
+
+
+@unique
+class AvatarStatus(Enum):
+    """
+    Enumeration for avatar status
+
+    Args:
+        Enum (Enum): Enum class
+    """
+
+    DEACTIVATED = 0
+    ACTIVATED = 1
+    IDLE = 2
+    DM = 3
+
+
+def decode_avatar(
+    content: bytes, sizes: Iterable[QSize], dpr: float
+) -> Dict[Tuple[int, int], QImage]:
+    """
+    Decode a picture and scale it to each size, safe outside of the GUI thread
+
+    Args:
+        content (bytes): the picture
+        sizes (Iterable[QSize]): sizes of the avatar
+        dpr (float): device pixel ratio
+
+    Returns:
+        Dict[Tuple[int, int], QImage]: the scaled pictures by width and height
+    """
+    image = QImage.fromData(content)
+    images = {}
+    for size in sizes:
+        # Like QIcon, a picture is scaled down to fit but never scaled up
+        target = size * dpr
+        if image.width() > target.width() or image.height() > target.height():
+            scaled = image.scaled(target, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        else:
+            scaled = image.copy()
+        scaled.setDevicePixelRatio(dpr)
+        images[size.width(), size.height()] = scaled
+    return images
+
+
+# pylint: disable=too-many-instance-attributes
+class AvatarPixmapCache:
+    """
+    Shared cache of the avatars, decoded and scaled once for a size, with
+    the status badge composited once for a status and a background color.
+
+    The pictures can be decoded in advance by a thread pool, only the
+    conversion of the decoded images to pixmaps is left to the GUI thread.
+    """
+
+    STATUS_COLORS = {
+        AvatarStatus.ACTIVATED: QColor(74, 160, 50),
+        AvatarStatus.DEACTIVATED: QColor(154, 152, 147),
+        AvatarStatus.DM: QColor(255, 0, 0),
+    }
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.pixmaps: "OrderedDict[Tuple[Hashable, ...], QPixmap]" = OrderedDict()
+        self.decodes = 0
+        self.conversions = 0
+        self.hits = 0
+        self.misses = 0
+
+        # Images decoded by the thread pool, not converted yet
+        self.images: Dict[ImageKey, QImage] = {}
+        self.images_lock = threading.Lock()
+
+    # pylint: disable=too-many-arguments
+    def get(
+        self,
+        content: Union[str, bytes],
+        size: QSize,
+        status: Optional[AvatarStatus],
+        background_color: Optional[QColor] = None,
+        color: Optional[str] = None,
+    ) -> QPixmap:
+        """
+        Avatar with its status badge
+
+        Args:
+            content (Union[str, bytes]): the picture, or the path of an icon
+            size (QSize): size of the avatar
+            status (Optional[AvatarStatus]): the status, None or IDLE without badge
+            background_color (Optional[QColor], optional): color around the badge.
+            color (Optional[str], optional): tint of an icon.
+
+        Returns:
+            QPixmap: the avatar
+        """
+        if status == AvatarStatus.IDLE:
+            status = None
+        key = (
+            content,
+            size.width(),
+            size.height(),
+            status,
+            background_color.rgba() if status and background_color else None,
+            color,
+        )
+        if key in self.pixmaps:
+            self.pixmaps.move_to_end(key)
+            self.hits += 1
+            return self.pixmaps[key]
+
+        self.misses += 1
+        if status is None and color is None:
+            pixmap = self.decode(content, size)
+        else:
+            pixmap = QPixmap(self.get(content, size, None))
+            if color:
+                self.tint(pixmap, color)
+            if status:
+                self.draw_badge(pixmap, size, status, background_color)
+        self.pixmaps[key] = pixmap
+        if len(self.pixmaps) > self.max_entries:
+            self.pixmaps.popitem(last=False)
+        return pixmap
+
+    def decode(self, content: Union[str, bytes], size: QSize) -> QPixmap:
+        """
+        Decode and scale a picture
+
+        Args:
+            content (Union[str, bytes]): the picture, or the path of an icon
+            size (QSize): size of the avatar
+
+        Returns:
+            QPixmap: the picture
+        """
+        if isinstance(content, str):
+            self.decodes += 1
+            return QIcon(content).pixmap(size)
+
+        with self.images_lock:
+            image = self.images.pop((content, size.width(), size.height()), None)
+        if image is not None:
+            self.conversions += 1
+            return QPixmap.fromImage(image)
+
+        self.decodes += 1
+        images = decode_avatar(content, (size,), get_device_pixel_ratio())
+        return QPixmap.fromImage(images[size.width(), size.height()])
+
+    def add_images(self, content: bytes, images: Dict[Tuple[int, int], QImage]) -> None:
+        """
+        Store the images of a picture decoded in advance, from any thread
+
+        Args:
+            content (bytes): the picture
+            images (Dict[Tuple[int, int], QImage]): the scaled pictures by
+            width and height
+        """
+        with self.images_lock:
+            for (width, height), image in images.items():
+                self.images[content, width, height] = image
+
+    def convert_images(self, budget: float) -> bool:
+        """
+        Convert the decoded images to pixmaps, until the budget is spent
+
+        Args:
+            budget (float): time allowed, in seconds, one image is always converted
+
+        Returns:
+            bool: True if images are left
+        """
+        deadline = time.perf_counter() + budget
+        while True:
+            with self.images_lock:
+                if not self.images:
+                    return False
+                (content, width, height), image = self.images.popitem()
+
+            key = (content, width, height, None, None, None)
+            if key not in self.pixmaps:
+                self.conversions += 1
+                self.pixmaps[key] = QPixmap.fromImage(image)
+                # Not displayed yet, dropped before the displayed avatars
+                self.pixmaps.move_to_end(key, last=False)
+                if len(self.pixmaps) > self.max_entries:
+                    self.pixmaps.popitem(last=False)
+            if time.perf_counter() >= deadline:
+                with self.images_lock:
+                    return bool(self.images)
+
+    @staticmethod
+    def tint(pixmap: QPixmap, color: str) -> None:
+        """
+        Tint an icon
+
+        Args:
+            pixmap (QPixmap): the icon
+            color (str): the color
+        """
+        painter = QPainter(pixmap)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
+        painter.fillRect(pixmap.rect(), QColor(color))
+        painter.end()
+
+    def draw_badge(
+        self,
+        pixmap: QPixmap,
+        size: QSize,
+        status: AvatarStatus,
+        background_color: Optional[QColor],
+    ) -> None:
+        """
+        Draw the status badge in the corner of the avatar
+
+        Args:
+            pixmap (QPixmap): the avatar
+            size (QSize): size of the avatar, height then width
+            status (AvatarStatus): the status
+            background_color (Optional[QColor]): color around the badge
+        """
+        height, width = size.width(), size.height()
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform | QPainter.Antialiasing)
+        painter.setPen(QPen(Qt.NoPen))
+        circle_radius = 6 if height >= 30 else 3
+        circle_center = QPoint(width - 1.1 * circle_radius, height - circle_radius * 1)
+
+        # Outer circle
+        painter.setBrush(QBrush(background_color or QColor()))
+        painter.drawEllipse(circle_center, circle_radius, circle_radius)
+
+        # Inner circle
+        inner_radius = circle_radius / 1.5
+        painter.setBrush(QBrush(self.STATUS_COLORS[status]))
+        painter.drawEllipse(circle_center, inner_radius, inner_radius)
+
+        if status == AvatarStatus.DM:
+            # Draw "!" inside the circle
+            painter.setPen(QPen(Qt.black))
+            font = QFont()
+            font.setPointSize(8)
+            painter.setFont(font)
+            painter.drawText(
+                QRectF(
+                    circle_center.x() - inner_radius,
+                    circle_center.y() - inner_radius,
+                    2 * inner_radius,
+                    2 * inner_radius,
+                ),
+                Qt.AlignCenter,
+                "!",
+            )
+        painter.end()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Stats of the cache
+
+        Returns:
+            Dict[str, int]: lookups and pictures decoded
+        """
+        return {
+            "entries": len(self.pixmaps),
+            "hits": self.hits,
+            "misses": self.misses,
+            "decodes": self.decodes,
+            "conversions": self.conversions,
+            "pending": len(self.images),
+        }
+
+    def clear(self) -> None:
+        """
+        Drop the pixmaps, at logout
+        """
+        self.pixmaps.clear()
+        with self.images_lock:
+            self.images.clear()
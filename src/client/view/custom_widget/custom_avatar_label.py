@@ -1,37 +1,30 @@
 """AvatarQLabel module."""
 
 # pylint: disable=duplicate-code
-from enum import Enum, unique
-from typing import Optional
+from typing import Callable, Optional
 
-from PySide6.QtCore import QPoint, QRectF, QSize, Qt
-from PySide6.QtGui import QBrush, QColor, QFont, QIcon, QPainter, QPen, QPixmap
-from PySide6.QtWidgets import QGraphicsDropShadowEffect, QGraphicsOpacityEffect, QLabel
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtGui import QColor, QPainter
+from PySide6.QtWidgets import QGraphicsDropShadowEffect, QLabel, QWidget
 
-from src.tools.utils import Themes
+from src.client.view.custom_widget.avatar_pixmap_cache import (
+    AvatarPixmapCache,
+    AvatarStatus,
+)
+from src.tools.constant import AVATAR_CACHE_SIZE
+from src.tools.utils import theme
 
-theme = Themes()
-
-
-@unique
-class AvatarStatus(Enum):
-    """
-    Enumeration for avatar status
-
-    Args:
-        Enum (Enum): Enum class
-    """
-
-    DEACTIVATED = 0
-    ACTIVATED = 1
-    IDLE = 2
-    DM = 3
+avatar_pixmap_cache = AvatarPixmapCache(AVATAR_CACHE_SIZE)
 
 
+# pylint: disable=too-many-instance-attributes
 class AvatarLabel(QLabel):
     """
     Avatar label class.
 
+    The hover variant of the avatar is chosen when the label is painted, the
+    pixmaps of both variants come from the avatar cache.
+
     Args:
         QLabel (QLabel): QLabel class
     """
@@ -53,8 +46,15 @@ class AvatarLabel(QLabel):
         self.width_ = width
         self.content = content
         self.status = None
+        self.background_color = background_color
+        # Called once, when the label is painted for the first time
+        self.on_visible: Optional[Callable[[], None]] = None
+        self.opacity = 1.0
+        # Variant painted while the hover target is under the mouse
+        self.hover_target: Optional[QWidget] = None
+        self.hover_background_color: Optional[QColor] = None
+        self.hover_opacity = 1.0
         self.update_picture(status, background_color)
-        self.setStyleSheet("border: none")
 
     def update_picture(
         self,
@@ -73,21 +73,94 @@ class AvatarLabel(QLabel):
         """
         # Update Avatar status
         self.status = status
+        self.background_color = background_color
 
         if content:
             self.content = content
 
         if isinstance(self.content, str):
-            p = QIcon(self.content).pixmap(QSize(self.height_, self.width_))
-            if self.color:
-                painter = QPainter(p)
-                painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
-                painter.fillRect(p.rect(), QColor(self.color))
-                painter.end()
-            self.setPixmap(p)
+            self.setPixmap(
+                avatar_pixmap_cache.get(
+                    self.content,
+                    QSize(self.height_, self.width_),
+                    None,
+                    color=self.color,
+                )
+            )
         else:
             self.update_icon_status(status, background_color)
 
+    def set_content(self, content: bytes) -> None:
+        """
+        Update the picture of the avatar, with the same status
+
+        Args:
+            content (bytes): content picture in bytes
+        """
+        self.update_picture(self.status, self.background_color, content)
+
+    # pylint: disable=invalid-name
+    # pylint: disable=not-callable
+    def paintEvent(self, event) -> None:
+        """
+        Paint the label, only called for the visible labels
+
+        Args:
+            event (QPaintEvent): the paint event
+        """
+        if self.on_visible is not None:
+            on_visible, self.on_visible = self.on_visible, None
+            on_visible()
+
+        hovered = self.hover_target is not None and self.hover_target.underMouse()
+        opacity = self.hover_opacity if hovered else self.opacity
+        # The pictures are badged, the icons are not
+        swap = (
+            hovered
+            and self.hover_background_color is not None
+            and not isinstance(self.content, str)
+        )
+        if opacity == 1.0 and not swap:
+            super().paintEvent(event)
+            return
+
+        if swap:
+            pixmap = avatar_pixmap_cache.get(
+                self.content,
+                QSize(self.height_, self.width_),
+                self.status,
+                self.hover_background_color,
+            )
+        else:
+            pixmap = self.pixmap()
+        painter = QPainter(self)
+        painter.setOpacity(opacity)
+        self.style().drawItemPixmap(
+            painter, self.contentsRect(), self.alignment(), pixmap
+        )
+        painter.end()
+
+    def set_hover(
+        self,
+        target: QWidget,
+        background_color: Optional[QColor] = None,
+        opacity: float = 1.0,
+    ) -> None:
+        # pylint: disable=line-too-long
+        """
+        Paint a variant of the avatar while the target is under the mouse, Qt
+        repaints the target when the mouse enters or leaves it
+
+        Args:
+            target (QWidget): the label or the entry containing it
+            background_color (Optional[QColor], optional): color around the badge. Defaults to None, unchanged.
+            opacity (float, optional): opacity of the avatar. Defaults to 1.0.
+        """
+        self.hover_target = target
+        self.hover_background_color = background_color
+        self.hover_opacity = opacity
+        target.setAttribute(Qt.WidgetAttribute.WA_Hover)
+
     def update_icon_status(
         self, status: AvatarStatus, background_color: QColor
     ) -> None:
@@ -100,34 +173,17 @@ class AvatarLabel(QLabel):
         """
         # Update Avatar status
         self.status = status
+        self.setPixmap(
+            avatar_pixmap_cache.get(
+                self.content, QSize(self.height_, self.width_), status, background_color
+            )
+        )
 
-        icon_pixmap = self.__init_pixmap()
-        if status == AvatarStatus.IDLE:
-            self.setPixmap(icon_pixmap)
-            return
-
-        painter = self.__create_painter(icon_pixmap)
-        if status == AvatarStatus.ACTIVATED:
-            brush_color = self._update_circle_color(74, 160, 50)
-        elif status == AvatarStatus.DEACTIVATED:
-            brush_color = self._update_circle_color(154, 152, 147)
-        elif status == AvatarStatus.DM:
-            brush_color = self._update_circle_color(255, 0, 0)
-        self.__create_ellipse(painter, background_color, brush_color, icon_pixmap)
-
-    def _update_circle_color(self, r: int, g: int, b: int) -> QColor:
+    def refresh(self) -> None:
         """
-        Update the circle color
-
-        Args:
-            r (int): red value
-            g (int): green value
-            b (int): blue value
-
-        Returns:
-            QColor: the color
+        Render the avatar again, after a switch of theme
         """
-        return QColor(r, g, b)
+        self.update_picture(self.status, self.background_color)
 
     def widget_shadow(self) -> None:
         """
@@ -139,16 +195,15 @@ class AvatarLabel(QLabel):
         shadow.setBlurRadius(1)
         return shadow
 
-    def set_opacity(self, opacity: int) -> None:
+    def set_opacity(self, opacity: float) -> None:
         """
-        Update opacity
+        Update opacity, applied when the pixmap is painted
 
         Args:
-            opacity (int): opacity value
+            opacity (float): opacity value
         """
-        opacity_effect = QGraphicsOpacityEffect(self)
-        opacity_effect.setOpacity(opacity)
-        self.setGraphicsEffect(opacity_effect)
+        self.opacity = opacity
+        self.update()
 
     def update_pixmap(
         self, status: AvatarStatus, background_color=theme.rgb_background_color_actif
@@ -160,126 +215,5 @@ class AvatarLabel(QLabel):
             status (AvatarStatus): avatar status
         """
         # Update Avatar status
-        self.status = status
-
-        icon_pixmap = self.__init_pixmap()
-        painter = self.__create_painter(icon_pixmap)
-
-        if status == AvatarStatus.ACTIVATED:
-            brush_color = self._update_circle_color(74, 160, 50)
-        elif status == AvatarStatus.DM:
-            brush_color = self._update_circle_color(255, 0, 0)
-        elif status == AvatarStatus.DEACTIVATED:
-            brush_color = self._update_circle_color(154, 152, 147)
-        elif status == AvatarStatus.IDLE:
-            painter.end()
-            self.setPixmap(icon_pixmap)
-            return
-
-        self.__create_ellipse(painter, background_color, brush_color, icon_pixmap)
-
-    def __create_painter(self, icon_pixmap: QPixmap) -> QPainter:
-        """
-        Create a painter
-
-        Args:
-            icon_pixmap (QPixmap): the icon pixmap
-
-        Returns:
-            QPainter: the painter
-        """
-        result = QPainter(icon_pixmap)
-        result.setRenderHint(QPainter.SmoothPixmapTransform | QPainter.Antialiasing)
-        result.drawPixmap(0, 0, icon_pixmap)
-        return result
-
-    def __init_pixmap(self) -> QPixmap:
-        """
-        Init the pixmap
-
-        Returns:
-            QPixmap: the pixmap
-        """
-        pm = QPixmap()
-        if not isinstance(self.content, str):
-            pm.loadFromData(self.content)
-        else:
-            pm = self.content
-        return QIcon(pm).pixmap(QSize(self.height_, self.width_))
-
-    def __create_ellipse(
-        self,
-        painter: QPainter,
-        outer_brush_color: QColor,
-        inner_brush_color: QColor,
-        icon_pixmap: QPixmap,
-    ) -> None:
-        """
-        Create an ellipse
-
-        Args:
-            painter (QPainter): the painter
-            outer_brush_color (QColor): outer brush color
-            inner_brush_color (QColor): inner brush color
-            icon_pixmap (QPixmap): the icon pixmap
-        """
-        painter.setPen(QPen(Qt.NoPen))
-        circle_radius = 6 if self.height_ >= 30 else 3
-        circle_center = QPoint(
-            self.width_ - 1.1 * circle_radius, self.height_ - circle_radius * 1
-        )
-
-        # Outer circle
-        self.__draw_ellipse(outer_brush_color, painter, circle_center, circle_radius)
-
-        inner_radius = circle_radius / 1.5
-        inner_center = circle_center
-
-        # Inner circle
-        self.__draw_ellipse(inner_brush_color, painter, inner_center, inner_radius)
-
-        if inner_brush_color == QColor(255, 0, 0):
-            self.__create_symbole(painter, inner_center, inner_radius)
-        painter.end()
-        self.setPixmap(icon_pixmap)
-
-    def __create_symbole(
-        self, painter: QPainter, inner_center: QPoint, inner_radius: int
-    ) -> None:
-        """
-        Create a symbole
-
-        Args:
-            painter (QPainter): the painter
-            inner_center (QPoint): the inner center
-            inner_radius (int): the inner radius
-        """
-        # Draw "!" inside the circle
-        painter.setPen(QPen(Qt.black))  # Set text color
-        font = QFont()
-        font.setPointSize(8)  # Adjust the font size as needed
-        painter.setFont(font)
-        text = "!"
-        text_rect = QRectF(
-            inner_center.x() - inner_radius,
-            inner_center.y() - inner_radius,
-            2 * inner_radius,
-            2 * inner_radius,
-        )
-        painter.drawText(text_rect, Qt.AlignCenter, text)
-
-    def __draw_ellipse(
-        self, color: QColor, painter: QPainter, center: QPoint, radius: int
-    ) -> None:
-        """
-        Draw an ellipse
-
-        Args:
-            arg0 (QColor): the color
-            painter (QPainter): the painter
-            center (QPoint): the center
-            radius (int): the radius
-        """
-        outer_brush = QBrush(color)
-        painter.setBrush(outer_brush)
-        painter.drawEllipse(center, radius, radius)
+        self.background_color = background_color
+        self.update_icon_status(status, background_color)
@@ -0,0 +1,883 @@
+"""Module for the virtualized message list."""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QEvent,
+    QModelIndex,
+    QPersistentModelIndex,
+    QPoint,
+    QRect,
+    QSize,
+    Qt,
+    Signal,
+)
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen, QPixmap
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QListView,
+    QMenu,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
+    QToolTip,
+)
+
+from src.client.view.custom_widget.custom_avatar_label import avatar_pixmap_cache
+from src.client.view.layout.message_layout import MessageLayout, MessageRecord
+from src.tools.utils import GenericColor, Icon, icon_from_svg, theme
+
+MESSAGE_ROLE = Qt.ItemDataRole.UserRole
+# Width and height of the row, known without rebuilding a record
+SIZE_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+class MessageListModel(QAbstractListModel):
+    """
+    Messages of a conversation, oldest first.
+
+    Each row is numbered with a key, its position once the key of the first
+    row is subtracted: a row is found without scanning the list, and the
+    older messages are added at the top without numbering the rows again.
+
+    Args:
+        QAbstractListModel (QAbstractListModel): QAbstractListModel class
+    """
+
+    # The height of a row changed, its delegate has to lay it out again
+    row_resized = Signal(QModelIndex)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.rows: List[Union[MessageLayout, MessageRecord]] = []
+        # Key of each row by id of the message or record
+        self.keys: Dict[int, int] = {}
+        self.first_key = 0
+        self.nb_of_materialized = 0
+        # Rebuild the message of a record scrolled back into view
+        self.materializer: Optional[Callable[[MessageRecord], MessageLayout]] = None
+
+    # pylint: disable=invalid-name
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Number of messages
+
+        Args:
+            parent (QModelIndex, optional): the parent, invalid for a list.
+
+        Returns:
+            int: the number of messages
+        """
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        """
+        Data of a message
+
+        Args:
+            index (QModelIndex): index of the message
+            role (int, optional): the role. Defaults to Qt.ItemDataRole.DisplayRole.
+
+        Returns:
+            Any: the message for MESSAGE_ROLE, rebuilt if it is a record, the
+            size of the row for SIZE_ROLE, its text for DisplayRole
+        """
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        if role == MESSAGE_ROLE:
+            return self.materialize(index.row())
+        if role == SIZE_ROLE:
+            return self.rows[index.row()].size_cache
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.rows[index.row()].str_message
+        return None
+
+    # pylint: disable=not-callable
+    def materialize(self, row: int) -> MessageLayout:
+        """
+        Message of a row, rebuilt in place if it is a record
+
+        Args:
+            row (int): the row
+
+        Returns:
+            MessageLayout: the message
+        """
+        message = self.rows[row]
+        if isinstance(message, MessageRecord):
+            record, message = message, self.materializer(message)
+            message.list_model = self
+            self.rows[row] = message
+            self.keys[id(message)] = self.keys.pop(id(record))
+            self.nb_of_materialized += 1
+        return message
+
+    def dematerialize(self, row: int) -> Optional[MessageRecord]:
+        """
+        Swap the message of a row for its record, the height of the row is kept
+
+        Args:
+            row (int): the row
+
+        Returns:
+            Optional[MessageRecord]: the record, None if the row is already a
+            record or if the message is not acknowledged by the server
+        """
+        message = self.rows[row]
+        if isinstance(message, MessageRecord) or not message.message_id:
+            return None
+        if message.is_pending:
+            return None
+        record = message.to_record()
+        message.list_model = None
+        self.rows[row] = record
+        self.keys[id(record)] = self.keys.pop(id(message))
+        self.nb_of_materialized -= 1
+        return record
+
+    def insert_message(self, row: int, message: MessageLayout) -> None:
+        """
+        Insert a message, moved if already in the list
+
+        Args:
+            row (int): position of the message
+            message (MessageLayout): the message
+        """
+        if message.list_model is not None:
+            message.list_model.remove_message(message)
+        row = min(row, len(self.rows))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.rows.insert(row, message)
+        if row == 0 and len(self.rows) > 1:
+            self.first_key -= 1
+            self.keys[id(message)] = self.first_key
+        else:
+            self.number_rows(row)
+        message.list_model = self
+        self.nb_of_materialized += 1
+        self.endInsertRows()
+
+    def append_message(self, message: MessageLayout) -> None:
+        """
+        Add a message at the bottom
+
+        Args:
+            message (MessageLayout): the message
+        """
+        self.insert_message(len(self.rows), message)
+
+    def remove_message(self, message: MessageLayout) -> None:
+        """
+        Remove a message from the list
+
+        Args:
+            message (MessageLayout): the message
+        """
+        row = self.row_of(message)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.rows[row]
+        del self.keys[id(message)]
+        if row == 0:
+            self.first_key += 1
+        else:
+            self.number_rows(row)
+        message.list_model = None
+        self.nb_of_materialized -= 1
+        self.endRemoveRows()
+
+    def number_rows(self, start: int) -> None:
+        """
+        Number the rows from a position to the bottom
+
+        Args:
+            start (int): the first row numbered
+        """
+        for row in range(start, len(self.rows)):
+            self.keys[id(self.rows[row])] = self.first_key + row
+
+    def row_of(self, message: Union[MessageLayout, MessageRecord]) -> int:
+        """
+        Position of a message or a record
+
+        Args:
+            message (Union[MessageLayout, MessageRecord]): the message
+
+        Returns:
+            int: the row, -1 if not in the list
+        """
+        key = self.keys.get(id(message))
+        if key is None:
+            return -1
+        row = key - self.first_key
+        return row if self.rows[row] is message else -1
+
+    def index_of(self, message: MessageLayout) -> QModelIndex:
+        """
+        Index of a message
+
+        Args:
+            message (MessageLayout): the message
+
+        Returns:
+            QModelIndex: the index, invalid if not in the list
+        """
+        if message.list_model is not self:
+            return QModelIndex()
+        return self.index(self.row_of(message))
+
+    def refresh(self, message: MessageLayout, resize: bool) -> None:
+        """
+        Repaint the row of a message
+
+        Args:
+            message (MessageLayout): the message
+            resize (bool): the height of the row changed
+        """
+        index = self.index_of(message)
+        if not index.isValid():
+            return
+        self.dataChanged.emit(index, index)
+        if resize:
+            self.row_resized.emit(index)
+
+    def clear(self) -> None:
+        """
+        Remove every message
+        """
+        self.beginResetModel()
+        for message in self.rows:
+            if isinstance(message, MessageLayout):
+                message.list_model = None
+        self.rows.clear()
+        self.keys.clear()
+        self.first_key = 0
+        self.nb_of_materialized = 0
+        self.endResetModel()
+
+
+# pylint: disable=too-few-public-methods
+# pylint: disable=too-many-instance-attributes
+class MessageGeometry:
+    """
+    Position of the parts of a message in its row.
+    """
+
+    def __init__(self) -> None:
+        self.avatar = QRect()
+        self.sender = QRect()
+        self.crown = QRect()
+        self.date_left = 0
+        self.text = QRect()
+        self.react_button = QRect()
+        self.reply_button = QRect()
+        self.toolbar = QRect()
+        self.badge = QRect()
+        self.reply_preview = QRect()
+        self.reply_avatar = QRect()
+        self.reply_username = QRect()
+        self.reply_message = QRect()
+
+
+class MessageDelegate(QStyledItemDelegate):
+    """
+    Paint the messages and handle the clicks on their parts, only the
+    visible rows are painted.
+
+    Args:
+        QStyledItemDelegate (QStyledItemDelegate): QStyledItemDelegate class
+    """
+
+    AVATAR_COLUMN = 80
+    AVATAR_SIZE = 38
+    ROW_SPACING = 15
+    LINE_HEIGHT = 20
+    LINE_SPACING = 5
+    ICON_SIZE = 15
+    BUTTON_SIZE = 20
+    BADGE_HEIGHT = 21
+    RIGHT_MARGIN = 8
+    PREVIEW_LENGTH = 60
+
+    def __init__(self, controller, parent: QListView) -> None:
+        super().__init__(parent)
+        self.controller = controller
+
+        self.font = QFont(parent.font())
+        self.bold_font = QFont(self.font)
+        self.bold_font.setBold(True)
+        self.underlined_font = QFont(self.bold_font)
+        self.underlined_font.setUnderline(True)
+        self.date_font = QFont(self.font)
+        self.date_font.setPixelSize(8)
+        self.metrics = QFontMetrics(self.font)
+        self.bold_metrics = QFontMetrics(self.bold_font)
+
+        self.update_icons()
+
+    def update_icons(self) -> None:
+        """
+        Tint the icons in the colors of the theme
+        """
+        self.react_icon = icon_from_svg(Icon.SMILEY.value, color=theme.emoji_color)
+        self.reply_icon = icon_from_svg(Icon.REPLY.value, color=theme.emoji_color)
+        self.link_icon = icon_from_svg(Icon.LINK.value, color=theme.text_color)
+        self.crown_icon = icon_from_svg(Icon.CROWN.value, color=theme.emoji_color)
+
+    def get_avatar(self, content: Union[str, bytes], size: int) -> QPixmap:
+        """
+        Scaled picture of an avatar, decoded once
+
+        Args:
+            content (Union[str, bytes]): the picture, or the path of an icon
+            size (int): width and height
+
+        Returns:
+            QPixmap: the picture
+        """
+        return avatar_pixmap_cache.get(content, QSize(size, size), None)
+
+    def get_geometry(self, message: MessageLayout, rect: QRect) -> MessageGeometry:
+        """
+        Lay out the parts of a message in its row
+
+        Args:
+            message (MessageLayout): the message
+            rect (QRect): the row
+
+        Returns:
+            MessageGeometry: the position of the parts
+        """
+        geometry = MessageGeometry()
+        left = rect.left() + self.AVATAR_COLUMN
+        width = max(rect.width() - self.AVATAR_COLUMN - self.RIGHT_MARGIN, 1)
+        top = rect.top()
+
+        if message.response_model:
+            geometry.reply_preview = QRect(left, top, width, self.LINE_HEIGHT)
+            x = left + self.ICON_SIZE + 2
+            geometry.reply_avatar = QRect(x, top + 2, self.ICON_SIZE, self.ICON_SIZE)
+            x += self.ICON_SIZE + 4
+            username = f"@{message.response_model.username_label}:"
+            username_width = self.bold_metrics.horizontalAdvance(username)
+            geometry.reply_username = QRect(x, top, username_width, self.LINE_HEIGHT)
+            x += username_width + 6
+            geometry.reply_message = QRect(
+                x,
+                top,
+                self.metrics.horizontalAdvance(
+                    self.get_reply_preview(message.response_model)
+                ),
+                self.LINE_HEIGHT,
+            )
+            top += self.LINE_HEIGHT + self.LINE_SPACING
+            avatar_top = rect.top() + 2 * self.LINE_SPACING + self.LINE_HEIGHT // 2
+        else:
+            avatar_top = rect.top() + 2 * self.LINE_SPACING
+
+        geometry.avatar = QRect(
+            rect.left() + (self.AVATAR_COLUMN - self.AVATAR_SIZE) // 2,
+            avatar_top,
+            self.AVATAR_SIZE,
+            self.AVATAR_SIZE,
+        )
+
+        # Sender, crown and date
+        sender_width = self.bold_metrics.horizontalAdvance(message.username_label) + 8
+        geometry.sender = QRect(left, top, sender_width, self.LINE_HEIGHT)
+        x = left + sender_width
+        if message.is_admin:
+            geometry.crown = QRect(x, top + 1, self.ICON_SIZE, self.ICON_SIZE)
+            x += self.ICON_SIZE + 4
+        # The date is not measured, it does not change the height of the row
+        geometry.date_left = x
+
+        # Toolbar, on the right of the sender
+        right = left + width
+        geometry.toolbar = QRect(
+            right - 2 * self.BUTTON_SIZE - 4,
+            top - 1,
+            2 * self.BUTTON_SIZE + 4,
+            self.BUTTON_SIZE + 2,
+        )
+        geometry.react_button = QRect(
+            geometry.toolbar.left() + 2, top, self.BUTTON_SIZE, self.BUTTON_SIZE
+        )
+        geometry.reply_button = QRect(
+            geometry.react_button.right() + 1, top, self.BUTTON_SIZE, self.BUTTON_SIZE
+        )
+        top += self.LINE_HEIGHT + self.LINE_SPACING
+
+        # Text
+        text_height = self.get_text_height(message, width)
+        geometry.text = QRect(left, top, width, text_height)
+        top += text_height
+
+        # Reaction badge
+        if message.nb_react:
+            top += self.LINE_SPACING
+            geometry.badge = QRect(
+                left,
+                top,
+                self.ICON_SIZE
+                + self.bold_metrics.horizontalAdvance(str(message.nb_react))
+                + 14,
+                self.BADGE_HEIGHT,
+            )
+        return geometry
+
+    def get_text_height(self, message: MessageLayout, width: int) -> int:
+        """
+        Height of the wrapped text of a message
+
+        Args:
+            message (MessageLayout): the message
+            width (int): width of the text
+
+        Returns:
+            int: the height
+        """
+        return self.metrics.boundingRect(
+            QRect(0, 0, width, 1 << 20),
+            Qt.TextFlag.TextWordWrap,
+            message.str_message,
+        ).height()
+
+    def get_height(self, message: MessageLayout, width: int) -> int:
+        """
+        Height of a row, without laying out its parts
+
+        Args:
+            message (MessageLayout): the message
+            width (int): width of the row
+
+        Returns:
+            int: the height
+        """
+        avatar_bottom = 2 * self.LINE_SPACING + self.AVATAR_SIZE
+        top = self.LINE_HEIGHT + self.LINE_SPACING
+        if message.response_model:
+            avatar_bottom += self.LINE_HEIGHT // 2
+            top += self.LINE_HEIGHT + self.LINE_SPACING
+        top += self.get_text_height(
+            message, max(width - self.AVATAR_COLUMN - self.RIGHT_MARGIN, 1)
+        )
+        if message.nb_react:
+            top += self.LINE_SPACING + self.BADGE_HEIGHT
+        return max(top, avatar_bottom) + self.ROW_SPACING
+
+    def get_reply_preview(self, response_model: MessageLayout) -> str:
+        """
+        Beginning of the replied message
+
+        Args:
+            response_model (MessageLayout): the replied message
+
+        Returns:
+            str: the preview
+        """
+        if len(response_model.str_message) > self.PREVIEW_LENGTH:
+            return f"{response_model.str_message[:50]}..."
+        return response_model.str_message
+
+    # pylint: disable=invalid-name
+    # pylint: disable=unused-argument
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        """
+        Size of a row, computed once for a width
+
+        Args:
+            option (QStyleOptionViewItem): style of the row
+            index (QModelIndex): index of the message
+
+        Returns:
+            QSize: the size
+        """
+        width = self.parent().viewport().width()
+        size_cache = index.data(SIZE_ROLE)
+        if size_cache is None or size_cache[0] != width:
+            message: MessageLayout = index.data(MESSAGE_ROLE)
+            size_cache = message.size_cache = (width, self.get_height(message, width))
+        return QSize(width, size_cache[1])
+
+    def paint(
+        self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex
+    ) -> None:
+        """
+        Paint a visible row
+
+        Args:
+            painter (QPainter): the painter
+            option (QStyleOptionViewItem): style of the row
+            index (QModelIndex): index of the message
+        """
+        message: MessageLayout = index.data(MESSAGE_ROLE)
+        # Fetch the avatar of the sender once displayed
+        if message.on_visible is not None:
+            on_visible, message.on_visible = message.on_visible, None
+            on_visible()
+
+        geometry = self.get_geometry(message, option.rect)
+        view: MessageListView = self.parent()
+        is_hovered = view.hovered_index == index
+        mouse = view.mouse_position if is_hovered else QPoint(-1, -1)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+
+        # Highlight
+        row = option.rect.adjusted(0, 0, 0, -self.ROW_SPACING)
+        if message.background_color:
+            painter.fillRect(row, QColor(message.background_color))
+        if message.border_color:
+            painter.fillRect(
+                QRect(row.left(), row.top(), 2, row.height()),
+                QColor(message.border_color),
+            )
+
+        # Avatar
+        if message.can_open_dm and geometry.avatar.contains(mouse):
+            painter.setOpacity(0.8)
+        painter.drawPixmap(
+            geometry.avatar, self.get_avatar(message.content, self.AVATAR_SIZE)
+        )
+        painter.setOpacity(1)
+
+        if message.response_model:
+            self.paint_reply_preview(painter, message.response_model, geometry, mouse)
+
+        # Sender, crown and date
+        painter.setPen(QColor(theme.title_color))
+        is_link = (
+            message.message_id
+            and message.can_open_dm
+            and geometry.sender.contains(mouse)
+        )
+        painter.setFont(self.underlined_font if is_link else self.bold_font)
+        painter.drawText(
+            geometry.sender,
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            message.username_label,
+        )
+        if message.is_admin:
+            self.crown_icon.paint(painter, geometry.crown)
+        painter.setFont(self.date_font)
+        painter.setPen(
+            QColor(GenericColor.RED.value if message.is_failed else theme.rooms_color)
+        )
+        painter.drawText(
+            QRect(
+                geometry.date_left,
+                geometry.sender.top(),
+                geometry.toolbar.left() - geometry.date_left,
+                self.LINE_HEIGHT,
+            ),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            message.date_label,
+        )
+
+        # Text
+        painter.setFont(self.font)
+        painter.setPen(QColor(theme.text_color))
+        painter.drawText(
+            geometry.text,
+            Qt.TextFlag.TextWordWrap | Qt.AlignmentFlag.AlignLeft,
+            message.str_message,
+        )
+
+        if message.nb_react:
+            self.paint_badge(painter, message, geometry)
+        if is_hovered and message.message_id:
+            self.paint_toolbar(painter, geometry, mouse)
+        painter.restore()
+
+    def paint_reply_preview(
+        self,
+        painter: QPainter,
+        response_model: MessageLayout,
+        geometry: MessageGeometry,
+        mouse: QPoint,
+    ) -> None:
+        """
+        Paint the replied message, above the sender
+
+        Args:
+            painter (QPainter): the painter
+            response_model (MessageLayout): the replied message
+            geometry (MessageGeometry): position of the parts
+            mouse (QPoint): position of the mouse in the row
+        """
+        preview = geometry.reply_preview
+        self.link_icon.paint(
+            painter,
+            QRect(preview.left(), preview.top() + 2, self.ICON_SIZE, self.ICON_SIZE),
+        )
+        painter.drawPixmap(
+            geometry.reply_avatar,
+            self.get_avatar(response_model.content, self.ICON_SIZE),
+        )
+        painter.setPen(QColor(theme.title_color))
+        painter.setFont(self.bold_font)
+        painter.drawText(
+            geometry.reply_username,
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            f"@{response_model.username_label}:",
+        )
+        painter.setFont(self.font)
+        if geometry.reply_message.contains(mouse):
+            painter.setPen(QColor(theme.rooms_color))
+        painter.drawText(
+            geometry.reply_message,
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            self.get_reply_preview(response_model),
+        )
+
+    def paint_badge(
+        self, painter: QPainter, message: MessageLayout, geometry: MessageGeometry
+    ) -> None:
+        """
+        Paint the number of reactions
+
+        Args:
+            painter (QPainter): the painter
+            message (MessageLayout): the message
+            geometry (MessageGeometry): position of the parts
+        """
+        badge = geometry.badge
+        painter.setPen(QPen(QColor(theme.nav_color), 1))
+        painter.setBrush(QColor(theme.inner_color))
+        painter.drawRoundedRect(badge, 6, 6)
+        self.react_icon.paint(
+            painter,
+            QRect(
+                badge.left() + 4,
+                badge.top() + (badge.height() - self.ICON_SIZE) // 2,
+                self.ICON_SIZE,
+                self.ICON_SIZE,
+            ),
+        )
+        painter.setPen(QColor(theme.title_color))
+        painter.setFont(self.bold_font)
+        painter.drawText(
+            badge.adjusted(self.ICON_SIZE + 6, 0, 0, 0),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            str(message.nb_react),
+        )
+
+    def paint_toolbar(
+        self, painter: QPainter, geometry: MessageGeometry, mouse: QPoint
+    ) -> None:
+        """
+        Paint the react and reply buttons of the hovered message
+
+        Args:
+            painter (QPainter): the painter
+            geometry (MessageGeometry): position of the parts
+            mouse (QPoint): position of the mouse in the row
+        """
+        painter.setPen(QPen(QColor(theme.nav_color), 1))
+        painter.setBrush(QColor(theme.inner_color))
+        painter.drawRoundedRect(geometry.toolbar, 6, 6)
+        for button, icon in (
+            (geometry.react_button, self.react_icon),
+            (geometry.reply_button, self.reply_icon),
+        ):
+            if button.contains(mouse):
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(QColor(theme.nav_color))
+                painter.drawRoundedRect(button, 4, 4)
+            icon.paint(painter, button.adjusted(3, 3, -3, -3))
+
+    def get_action(
+        self, message: MessageLayout, rect: QRect, position: QPoint
+    ) -> Optional[Tuple[Callable[[], None], str]]:
+        """
+        Action of the part of a message under a position
+
+        Args:
+            message (MessageLayout): the message
+            rect (QRect): the row
+            position (QPoint): the position
+
+        Returns:
+            Optional[Tuple[Callable[[], None], str]]: the action and its tooltip,
+            None if the part is not clickable
+        """
+        geometry = self.get_geometry(message, rect)
+        if message.message_id and geometry.react_button.contains(position):
+            return message.add_react, "React to this message"
+        if message.message_id and geometry.reply_button.contains(position):
+            return message.add_reply, "Reply to this message"
+        if message.can_open_dm and (
+            geometry.avatar.contains(position)
+            or geometry.sender.contains(position)
+            and message.message_id
+        ):
+            return message.add_dm_layout, f"Open direct message with {message.sender_}"
+        if message.response_model and geometry.reply_message.contains(position):
+            return (
+                lambda: self.controller.focus_in_message(message.response_model),
+                "Display the replied message",
+            )
+        return None
+
+    # pylint: disable=invalid-name
+    def editorEvent(
+        self,
+        event: QEvent,
+        model: MessageListModel,
+        option: QStyleOptionViewItem,
+        index: QModelIndex,
+    ) -> bool:
+        """
+        Run the action of the clicked part of a message
+
+        Args:
+            event (QEvent): the event
+            model (MessageListModel): the model
+            option (QStyleOptionViewItem): style of the row
+            index (QModelIndex): index of the message
+
+        Returns:
+            bool: True if the click is handled
+        """
+        if (
+            event.type() == QEvent.Type.MouseButtonRelease
+            and event.button() == Qt.MouseButton.LeftButton
+        ):
+            action = self.get_action(
+                index.data(MESSAGE_ROLE), option.rect, event.position().toPoint()
+            )
+            if action:
+                action[0]()
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    # pylint: disable=invalid-name
+    def helpEvent(
+        self,
+        event: QEvent,
+        view: QAbstractItemView,
+        option: QStyleOptionViewItem,
+        index: QModelIndex,
+    ) -> bool:
+        """
+        Show the tooltip of the hovered part of a message
+
+        Args:
+            event (QEvent): the help event
+            view (QAbstractItemView): the view
+            option (QStyleOptionViewItem): style of the row
+            index (QModelIndex): index of the message
+
+        Returns:
+            bool: True if a tooltip is shown
+        """
+        if event.type() == QEvent.Type.ToolTip and index.isValid():
+            action = self.get_action(index.data(MESSAGE_ROLE), option.rect, event.pos())
+            if action:
+                QToolTip.showText(event.globalPos(), action[1], view)
+                return True
+            QToolTip.hideText()
+            return True
+        return super().helpEvent(event, view, option, index)
+
+
+class MessageListView(QListView):
+    """
+    List of the messages of a conversation, the rows are painted by the
+    delegate: memory and layout cost scale with the screen, not the history.
+
+    Args:
+        QListView (QListView): QListView class
+    """
+
+    BATCH_SIZE = 50
+
+    def __init__(self, controller) -> None:
+        super().__init__()
+        self.hovered_index = QPersistentModelIndex()
+        self.mouse_position = QPoint(-1, -1)
+
+        self.setModel(MessageListModel())
+        self.setItemDelegate(MessageDelegate(controller, self))
+        self.model().row_resized.connect(self.itemDelegate().sizeHintChanged)
+
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(self.BATCH_SIZE)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setMouseTracking(True)
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.DefaultContextMenu)
+
+    def set_hovered(self, index: QModelIndex, position: QPoint) -> None:
+        """
+        Repaint the rows entered and left by the mouse
+
+        Args:
+            index (QModelIndex): the hovered row, invalid if none
+            position (QPoint): position of the mouse
+        """
+        self.mouse_position = position
+        if self.hovered_index != index and self.hovered_index.isValid():
+            self.viewport().update(self.visualRect(QModelIndex(self.hovered_index)))
+        self.hovered_index = QPersistentModelIndex(index)
+        if index.isValid():
+            self.viewport().update(self.visualRect(index))
+
+    # pylint: disable=invalid-name
+    def mouseMoveEvent(self, event) -> None:
+        """
+        Track the hovered message and show the clickable parts
+
+        Args:
+            event (QMouseEvent): the event
+        """
+        position = event.position().toPoint()
+        index = self.indexAt(position)
+        self.set_hovered(index, position)
+
+        action = (
+            self.itemDelegate().get_action(
+                index.data(MESSAGE_ROLE), self.visualRect(index), position
+            )
+            if index.isValid()
+            else None
+        )
+        if action:
+            self.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
+        else:
+            self.viewport().unsetCursor()
+        super().mouseMoveEvent(event)
+
+    # pylint: disable=invalid-name
+    def leaveEvent(self, event) -> None:
+        """
+        Hide the toolbar of the hovered message
+
+        Args:
+            event (QEvent): the event
+        """
+        self.set_hovered(QModelIndex(), QPoint(-1, -1))
+        super().leaveEvent(event)
+
+    # pylint: disable=invalid-name
+    def contextMenuEvent(self, event) -> None:
+        """
+        Copy the text of a message
+
+        Args:
+            event (QContextMenuEvent): the event
+        """
+        index = self.indexAt(event.pos())
+        if not index.isValid():
+            return
+        menu = QMenu(self)
+        copy_action = menu.addAction("Copy message")
+        if menu.exec(event.globalPos()) == copy_action:
+            QApplication.clipboard().setText(index.data(MESSAGE_ROLE).str_message)
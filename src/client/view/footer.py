@@ -11,7 +11,6 @@ from src.tools.utils import GenericColor, Icon, ImageAvatar, Themes, icon_from_s
 
 
 # pylint: disable=too-many-instance-attributes
-# pylint: disable=too-few-public-methods
 class FooterView:
     """
     Footer widget class.
@@ -22,6 +21,7 @@ class FooterView:
         self.version_widget_width = version_widget_width
         self.theme = theme
         self.set_footer_gui()
+        self.update_icons()
 
     # pylint: disable=too-many-locals
     # pylint: disable=too-many-statements
@@ -34,23 +34,15 @@ class FooterView:
         self.logout_button.setFixedHeight(30)
         self.logout_button.setFixedWidth(30)
         self.logout_button.clicked.connect(self.controller.logout)
-        self.logout_icon = QIcon(
-            icon_from_svg(Icon.LOGOUT.value, color=self.theme.text_color)
-        )
-        self.logout_button.setIcon(self.logout_icon)
         self.logout_button.setDisabled(True)
 
-        settings_btn = CustomQPushButton()
-        settings_btn.setToolTip("Settings")
-        settings_btn.setFixedHeight(30)
-        settings_btn.setFixedWidth(30)
-        settings_btn.clicked.connect(
+        self.settings_button = CustomQPushButton()
+        self.settings_button.setToolTip("Settings")
+        self.settings_button.setFixedHeight(30)
+        self.settings_button.setFixedWidth(30)
+        self.settings_button.clicked.connect(
             self.controller.gui_controller.user_profile_controller.show_user_profile
         )
-        settings_icon = QIcon(
-            icon_from_svg(Icon.CONFIG.value, color=self.theme.text_color)
-        )
-        settings_btn.setIcon(settings_icon)
 
         self.send_widget = QWidget()
         self.send_layout = QHBoxLayout(self.send_widget)
@@ -60,35 +52,18 @@ class FooterView:
 
         # --- Client information
         self.user_info_widget = QWidget()
+        self.user_info_widget.setObjectName("user_info_widget")
         self.user_info_widget.setFixedWidth(310)
         self.client_information_dashboard_layout = QHBoxLayout(self.user_info_widget)
         self.client_information_dashboard_layout.setContentsMargins(0, 0, 0, 0)
-        self.user_info_widget.setStyleSheet(
-            f"background-color: {self.theme.search_color};\
-            color: {self.theme.title_color};\
-            border-radius: 0px;\
-            border: 0px;"
-        )
-        self.user_icon = QIcon(
-            icon_from_svg(Icon.AVATAR.value, color=self.theme.text_color)
-        )
-
         self.user_widget = QWidget()
 
         self.user_picture = AvatarLabel(content="")
         self.user_picture.setToolTip("Update your avatar")
-        self.user_picture.enterEvent = (
-            lambda event: self.user_picture.graphicsEffect().setEnabled(True)
-        )
-        self.user_picture.leaveEvent = (
-            lambda event: self.user_picture.graphicsEffect().setEnabled(False)
-        )
         self.user_picture.mousePressEvent = (
             lambda e: self.controller.show_user_profile()
         )
-        self.user_picture.set_opacity(0.8)
-        self.user_picture.graphicsEffect().setEnabled(False)
-        self.user_picture.setStyleSheet("border: 0px")
+        self.user_picture.set_hover(self.user_picture, opacity=0.8)
 
         user_widget_status = QWidget()
         user_widget_status.setContentsMargins(0, 0, 0, 0)
@@ -97,15 +72,9 @@ class FooterView:
         user_widget_status_layout.setContentsMargins(10, 0, 0, 0)
 
         self.user_name = QLabel("User disconnected")
-        self.user_name.setStyleSheet(
-            "font-weight: bold;\
-            border: none;"
-        )
+        self.user_name.setObjectName("footer_user_name")
         user_status = QLabel("Connected")
-        user_status.setStyleSheet(
-            "font-size: 10px;\
-            border: none;"
-        )
+        user_status.setObjectName("footer_user_status")
         user_widget_status_layout.addWidget(self.user_name)
         user_widget_status_layout.addWidget(user_status)
 
@@ -117,13 +86,14 @@ class FooterView:
             user_widget_status, stretch=1, alignment=Qt.AlignmentFlag.AlignLeft
         )
         avatar_layout.addWidget(
-            settings_btn, stretch=2, alignment=Qt.AlignmentFlag.AlignLeft
+            self.settings_button, stretch=2, alignment=Qt.AlignmentFlag.AlignLeft
         )
         avatar_layout.addWidget(self.logout_button)
 
         self.client_information_dashboard_layout.addWidget(self.user_widget)
 
-        self.entry = CustomQLineEdit(place_holder_text="Please login", radius=4)
+        self.entry = CustomQLineEdit(place_holder_text="Please login")
+        self.entry.setObjectName("message_entry")
         self.entry.setAlignment(Qt.AlignmentFlag.AlignLeft)
         self.entry.setTextMargins(0, 0, 0, 0)
         self.entry.returnPressed.connect(self.controller.send_message_to_server)
@@ -131,18 +101,15 @@ class FooterView:
         self.send_layout.addWidget(self.user_info_widget)
         self.send_layout.addWidget(self.entry, alignment=Qt.AlignmentFlag.AlignTop)
 
-        pipe_icon = QIcon(icon_from_svg(Icon.SEPARATOR.value, self.theme.title_color))
-        send_icon = QIcon(icon_from_svg(Icon.SEND.value, self.theme.title_color))
         reply_icon = QIcon(icon_from_svg(Icon.CLOSE.value, GenericColor.RED.value))
-        file_icon = QIcon(icon_from_svg(Icon.FILE.value, self.theme.title_color))
 
-        entry_action = self.entry.addAction(send_icon, QLineEdit.TrailingPosition)
-        entry_action.setToolTip("Send message")
-        self.entry.addAction(pipe_icon, QLineEdit.TrailingPosition)
-        entry_action.triggered.connect(self.controller.send_message_to_server)
+        self.send_action = self.entry.addAction(QIcon(), QLineEdit.TrailingPosition)
+        self.send_action.setToolTip("Send message")
+        self.pipe_action = self.entry.addAction(QIcon(), QLineEdit.TrailingPosition)
+        self.send_action.triggered.connect(self.controller.send_message_to_server)
 
         self.file_action = self.entry.addAction(
-            file_icon, QLineEdit.ActionPosition.LeadingPosition
+            QIcon(), QLineEdit.ActionPosition.LeadingPosition
         )
         self.file_action.setToolTip("Send file")
 
@@ -152,12 +119,9 @@ class FooterView:
         self.reply_entry_action.setVisible(False)
 
         self.bottom_right_widget = QWidget()
+        self.bottom_right_widget.setObjectName("bottom_right_widget")
         self.bottom_right_widget.setContentsMargins(0, 5, 0, 5)
         self.bottom_right_widget.setMinimumWidth(self.version_widget_width)
-        self.bottom_right_widget.setStyleSheet(
-            f"background-color: {self.theme.search_color};\
-            color: {self.theme.title_color};"
-        )
         self.bottom_right_layout = QVBoxLayout(self.bottom_right_widget)
         self.bottom_right_layout.setContentsMargins(0, 0, 0, 0)
         self.bottom_right_layout.setSpacing(5)
@@ -176,32 +140,49 @@ class FooterView:
         theme_layout.setSpacing(10)
 
         icon_soft = AvatarLabel(content=ImageAvatar.SERVER.value, height=20, width=20)
-        theme_label = QLabel()
-        theme_color = QIcon(icon_from_svg(Icon.STATUS.value, color=self.theme.color))
-        theme_label.setPixmap(theme_color.pixmap(20, 20))
+        self.theme_label = QLabel()
         self.switch_theme_button = CustomQPushButton("")
         self.switch_theme_button.setToolTip("Switch theme")
         self.switch_theme_button.setFixedSize(20, 20)
-        self.switch_theme_button.setIcon(
-            QIcon(icon_from_svg(Icon.SWITCH_COLOR.value, color=self.theme.text_color))
-        )
         self.switch_theme_button.clicked.connect(
             self.controller.gui_controller.display_theme_board
         )
 
         value = QLabel(f"Alpha <strong>{SOFT_VERSION}</strong>")
-        theme_name = QLabel(f"<strong>{self.theme.theme_name}</strong")
-
-        theme_name.setContentsMargins(0, 0, 0, 0)
+        self.theme_name_label = QLabel()
+        self.theme_name_label.setContentsMargins(0, 0, 0, 0)
 
         version_layout.addWidget(icon_soft)
         version_layout.addWidget(value)
 
-        theme_layout.addWidget(theme_label)
-        theme_layout.addWidget(theme_name)
+        theme_layout.addWidget(self.theme_label)
+        theme_layout.addWidget(self.theme_name_label)
         theme_layout.addWidget(self.switch_theme_button)
 
         self.bottom_right_layout.addWidget(version_widget)
         self.bottom_right_layout.addWidget(lang_widget)
 
         self.send_layout.addWidget(self.bottom_right_widget)
+
+    def update_icons(self) -> None:
+        """
+        Tint the icons in the colors of the theme
+        """
+        self.logout_icon = icon_from_svg(Icon.LOGOUT.value, color=self.theme.text_color)
+        self.logout_button.setIcon(self.logout_icon)
+        self.settings_button.setIcon(
+            icon_from_svg(Icon.CONFIG.value, color=self.theme.text_color)
+        )
+        self.user_icon = icon_from_svg(Icon.AVATAR.value, color=self.theme.text_color)
+        self.send_action.setIcon(icon_from_svg(Icon.SEND.value, self.theme.title_color))
+        self.pipe_action.setIcon(
+            icon_from_svg(Icon.SEPARATOR.value, self.theme.title_color)
+        )
+        self.file_action.setIcon(icon_from_svg(Icon.FILE.value, self.theme.title_color))
+        self.theme_label.setPixmap(
+            icon_from_svg(Icon.STATUS.value, color=self.theme.color).pixmap(20, 20)
+        )
+        self.theme_name_label.setText(f"<strong>{self.theme.theme_name}</strong>")
+        self.switch_theme_button.setIcon(
+            icon_from_svg(Icon.SWITCH_COLOR.value, color=self.theme.text_color)
+        )
@@ -28,6 +28,7 @@ class HeaderView:
         self.close_left_nav_button = None
         self.close_right_nav_button = None
         self.set_header_gui()
+        self.update_icons()
 
     # pylint: disable=too-many-statements
     def set_header_gui(self) -> None:
@@ -36,15 +37,7 @@ class HeaderView:
         """
         # Header widget
         self.main_widget = QWidget()
-
-        self.main_widget.setStyleSheet(
-            f"background-color: {self.theme.background_color};\
-            color: {self.theme.title_color};\
-            border-radius: 0px;\
-            border: 0px solid;\
-            margin-bottom: 0px;\
-            border-color: {self.theme.nav_color};"
-        )
+        self.main_widget.setObjectName("header")
 
         # Header layout
         self.header_layout = QHBoxLayout(self.main_widget)
@@ -52,45 +45,26 @@ class HeaderView:
 
         # Logo widget
         logo_widget = QWidget()
-        logo_widget.setStyleSheet("border-bottom: 1px solid")
 
         # Logo layout
         logo_layout = QHBoxLayout(logo_widget)
         logo_layout.setSpacing(10)
-        logo_widget.setStyleSheet("border: 0px solid")
         logo_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
         icon_soft = AvatarLabel(content=ImageAvatar.SERVER.value, height=20, width=20)
-        icon_soft.setStyleSheet(
-            "font-weight: bold;\
-            border: none"
-        )
 
         # Server Name
         status_server_label = QLabel(DEFAULT_CLIENT_NAME.upper())
-        status_server_label.setStyleSheet(
-            f"font-weight: bold;\
-            border: 0px solid;\
-            font-style: italic;\
-            border-color: {self.theme.nav_color};"
-        )
-        separator_icon = QIcon(
-            icon_from_svg(Icon.SEPARATOR.value, color=self.theme.title_color)
-        )
+        status_server_label.setObjectName("status_server_label")
         self.separator = QLabel()
         self.separator.hide()
-        self.separator.setPixmap(separator_icon.pixmap(20, 20))
-        self.separator.setStyleSheet("border: 0px solid")
 
         self.welcome_label = QLabel("")
-        self.welcome_label.setStyleSheet("font-weight: bold")
+        self.welcome_label.setObjectName("welcome_label")
         self.welcome_label.hide()
 
         # Frame research
-        self.frame_research = CustomQLineEdit(
-            place_holder_text="Search users",
-            bg_color=self.theme.search_color,
-            bg_color_active=self.theme.search_color,
-        )
+        self.frame_research = CustomQLineEdit(place_holder_text="Search users")
+        self.frame_research.setObjectName("user_search")
         self.frame_research.setFixedHeight(30)
         self.frame_research.setFixedWidth(200)
         self.frame_research.setTextMargins(0, 0, 0, 0)
@@ -105,11 +79,8 @@ class HeaderView:
         self.frame_research_list.setSpacing(10)
         self.frame_research_list.setFixedWidth(200)
 
-        search_icon = QIcon(
-            icon_from_svg(Icon.SEARCH.value, color=self.theme.title_color)
-        )
         self.search_action = self.frame_research.addAction(
-            search_icon, QLineEdit.ActionPosition.TrailingPosition
+            QIcon(), QLineEdit.ActionPosition.TrailingPosition
         )
 
         logo_layout.addWidget(icon_soft, alignment=Qt.AlignmentFlag.AlignLeft)
@@ -117,7 +88,6 @@ class HeaderView:
 
         lang_layout = AvatarLabel(content=ImageAvatar.EN.value, height=20, width=20)
         lang_label = QLabel("<strong>EN</strong>")
-        lang_label.setStyleSheet("border: 0px solid")
 
         # Adding widgets to the main layout
         self.header_layout.addWidget(logo_widget)
@@ -144,13 +114,6 @@ class HeaderView:
         Args:
             header_layout (QLayout): Layout to display the buttons
         """
-        self.close_users = QIcon(
-            icon_from_svg(Icon.CLOSE_USERS.value, color=self.theme.text_color)
-        )
-        self.close_dm = QIcon(
-            icon_from_svg(Icon.CLOSE_DM.value, color=self.theme.text_color)
-        )
-
         # --- Button horizontal layout
         self.button_layout = QHBoxLayout()
         self.button_layout.setContentsMargins(0, 0, 0, 0)
@@ -159,18 +122,18 @@ class HeaderView:
         self.button_layout.setSpacing(5)
 
         # --- Close left nav button
-        self.close_left_nav_button = CustomQPushButton("", radius=8)
+        self.close_left_nav_button = CustomQPushButton("")
+        self.close_left_nav_button.setObjectName("close_left_nav_button")
         self.close_left_nav_button.setToolTip("Close users panel")
         self.close_left_nav_button.clicked.connect(self.controller.hide_left_layout)
-        self.close_left_nav_button.setIcon(self.close_users)
         self.close_left_nav_button.setFixedWidth(30)
         self.close_left_nav_button.setFixedHeight(30)
 
         # --- Close right nav button
-        self.close_right_nav_button = CustomQPushButton("", radius=8)
+        self.close_right_nav_button = CustomQPushButton("")
+        self.close_right_nav_button.setObjectName("close_right_nav_button")
         self.close_right_nav_button.setToolTip("Close messages panel")
         self.close_right_nav_button.clicked.connect(self.controller.hide_right_layout)
-        self.close_right_nav_button.setIcon(self.close_dm)
         self.close_right_nav_button.setFixedWidth(30)
         self.close_right_nav_button.setFixedHeight(30)
 
@@ -178,9 +141,25 @@ class HeaderView:
         header_layout.addWidget(self.close_right_nav_button)
 
         info_widget = QWidget()
-        info_widget.setStyleSheet(
-            f"background-color: {self.theme.background_color};\
-            border-radius: 12px"
-        )
+        info_widget.setObjectName("header_info")
 
         self.button_layout.addWidget(info_widget)
+
+    def update_icons(self) -> None:
+        """
+        Tint the icons in the colors of the theme
+        """
+        self.separator.setPixmap(
+            icon_from_svg(Icon.SEPARATOR.value, color=self.theme.title_color).pixmap(
+                20, 20
+            )
+        )
+        self.search_action.setIcon(
+            icon_from_svg(Icon.SEARCH.value, color=self.theme.title_color)
+        )
+        self.close_users = icon_from_svg(
+            Icon.CLOSE_USERS.value, color=self.theme.text_color
+        )
+        self.close_dm = icon_from_svg(Icon.CLOSE_DM.value, color=self.theme.text_color)
+        self.close_left_nav_button.setIcon(self.close_users)
+        self.close_right_nav_button.setIcon(self.close_dm)
@@ -1,30 +1,38 @@
 """BodyScrollArea Layout Module."""
 
+from typing import Optional
+
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtWidgets import (
+    QAbstractItemView,
     QHBoxLayout,
     QLabel,
-    QScrollArea,
+    QScrollBar,
     QSizePolicy,
     QVBoxLayout,
     QWidget,
 )
 
-from src.client.view.stylesheets.stylesheets import scroll_bar_vertical_stylesheet
-from src.tools.utils import Themes, check_str_len
-
-theme = Themes()
+from src.client.view.custom_widget.custom_message_list import MessageListView
+from src.client.view.layout.message_layout import MessageLayout, MessageRecord
+from src.tools.utils import check_str_len
 
 
 # pylint: disable=too-many-instance-attributes
-class BodyScrollArea(QScrollArea):
+class BodyScrollArea(QWidget):
     """
     BodyScrollArea widget class.
 
+    The messages of a conversation are rows of a message list, the login
+    form is displayed above it.
+
     Args:
-        QScrollArea (QScrollArea): the scroll area widget
+        QWidget (QWidget): the body widget
     """
 
+    # Delay before the messages far out of view are unloaded, in milliseconds
+    TRIM_DELAY = 300
+
     def __init__(self, name: str, gui_controller):
         """
         Update the core GUI
@@ -36,65 +44,133 @@ class BodyScrollArea(QScrollArea):
         self.nb_message_displayed = 0
         self.upper_widget = None
         self.is_adding_older_messages = False
-        self.scrolling_timer = QTimer()
-        self.scrolling_timer.setSingleShot(True)
+        # Distance to the bottom kept while older messages are inserted
+        self.anchor: Optional[int] = None
 
         # ----------------- Main Layout ----------------- #
-        self.main_layout = QVBoxLayout()
-        self.main_layout.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self.main_layout = QVBoxLayout(self)
         self.main_layout.setContentsMargins(0, 0, 0, 0)
         self.main_layout.setSpacing(15)
         self.main_layout.setObjectName(f"{name}_layout")
 
         self.partial_name = check_str_len(name)
 
-        # ----------------- Scroll Area ----------------- #
+        # ----------------- Message List ----------------- #
         self.setMinimumWidth(600)
         self.setContentsMargins(0, 0, 0, 0)
         self.setMinimumHeight(380)
 
-        self.scroll_widget = QWidget()
-        self.scroll_widget.setContentsMargins(0, 10, 0, 10)
-        self.verticalScrollBar().setStyleSheet(
-            scroll_bar_vertical_stylesheet.format(_background_color=theme.search_color)
-        )
-        self.setStyleSheet(
-            "background-color: transparent;\
-            color: white;\
-            border: 0px"
-        )
+        self.message_list = MessageListView(gui_controller)
+        self.message_list.setContentsMargins(0, 10, 0, 10)
+        self.model = self.message_list.model()
+        self.model.materializer = self.materialize
+        self.trim_timer = QTimer(self)
+        self.trim_timer.setSingleShot(True)
+        self.trim_timer.setInterval(self.TRIM_DELAY)
+        self.trim_timer.timeout.connect(self.trim_history)
         self.setObjectName(name)
-        self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.is_auto_scroll_ = True
         self.verticalScrollBar().actionTriggered.connect(self.is_auto_scroll)
         self.verticalScrollBar().actionTriggered.connect(
             self.add_older_messages_on_scroll
         )
         self.verticalScrollBar().rangeChanged.connect(self.update_scrollbar)
-        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.setWidgetResizable(True)
 
-        self.scroll_widget.setLayout(self.main_layout)
-        self.setWidget(self.scroll_widget)
+        self.main_layout.addWidget(self.message_list, stretch=1)
+
+    # pylint: disable=invalid-name
+    def verticalScrollBar(self) -> QScrollBar:
+        """
+        Scrollbar of the message list
+
+        Returns:
+            QScrollBar: the vertical scrollbar
+        """
+        return self.message_list.verticalScrollBar()
+
+    def add_message(self, message: MessageLayout, at_top: bool = False) -> None:
+        """
+        Display a message
+
+        Args:
+            message (MessageLayout): the message
+            at_top (bool, optional): older message, above the others.
+        """
+        if at_top:
+            self.model.insert_message(0, message)
+        else:
+            self.model.append_message(message)
+        self.trim_timer.start()
+
+    def materialize(self, record: MessageRecord) -> MessageLayout:
+        """
+        Rebuild a message scrolled back into view
+
+        Args:
+            record (MessageRecord): the compact message
+
+        Returns:
+            MessageLayout: the message
+        """
+        self.trim_timer.start()
+        return self.gui_controller.history_window_controller.materialize(
+            self.name, record
+        )
+
+    def trim_history(self) -> None:
+        """
+        Unload the messages far out of view
+        """
+        self.gui_controller.history_window_controller.trim(self)
+
+    def scroll_to_message(self, message: MessageLayout) -> None:
+        """
+        Scroll until a message is visible
+
+        Args:
+            message (MessageLayout): the message
+        """
+        index = self.model.index_of(message)
+        if index.isValid():
+            self.is_auto_scroll_ = False
+            self.anchor = None
+            self.message_list.scrollTo(
+                index, QAbstractItemView.ScrollHint.PositionAtCenter
+            )
+
+    def content_height(self) -> int:
+        """
+        Height of the laid out messages
+
+        Returns:
+            int: the height in pixels
+        """
+        scroll_bar = self.verticalScrollBar()
+        return scroll_bar.maximum() + scroll_bar.pageStep()
 
     def is_auto_scroll(self) -> None:
         """
         Check if the scrollbar is at the bottom
         """
+        # The action is not applied to the value yet
         self.is_auto_scroll_ = (
-            self.verticalScrollBar().value() == self.verticalScrollBar().maximum()
+            self.verticalScrollBar().sliderPosition()
+            == self.verticalScrollBar().maximum()
         )
+        self.anchor = None
 
     def add_older_messages_on_scroll(self) -> None:
         """
-        Add older messages when the scrollbar is at the top
+        Add older messages before the scrollbar reaches the top
         """
-        if (
-            not self.scrolling_timer.isActive()
-            and self.verticalScrollBar().value() == self.verticalScrollBar().minimum()
-        ):
-            self.gui_controller.messages_controller.add_older_messages_on_scroll()
-            self.scrolling_timer.start(100)
+        self.gui_controller.messages_controller.add_older_messages_on_scroll()
+
+    def keep_position(self) -> None:
+        """
+        Keep the displayed messages in place while messages are inserted above
+        """
+        scroll_bar = self.verticalScrollBar()
+        self.anchor = scroll_bar.maximum() - scroll_bar.value()
 
     def update_scrollbar(self) -> None:
         """
@@ -102,6 +178,9 @@ class BodyScrollArea(QScrollArea):
         """
         if self.is_auto_scroll_:
             self.scrollToBottom()
+        elif self.anchor is not None:
+            scroll_bar = self.verticalScrollBar()
+            scroll_bar.setValue(scroll_bar.maximum() - self.anchor)
 
     # pylint: disable=invalid-name
     def scrollToBottom(self) -> None:
@@ -117,22 +196,14 @@ class BodyScrollArea(QScrollArea):
         Define the upper widget
         """
         self.upper_widget = QWidget()
+        self.upper_widget.setObjectName("conversation_header")
         self.upper_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
-        self.upper_widget.setStyleSheet(
-            f"background-color: {self.theme.background_color};\
-            border-radius: 0px;\
-            border: 0px solid {self.theme.nav_color}; "
-        )
         upper_layout = QHBoxLayout()
         self.upper_widget.setLayout(upper_layout)
 
         frame_name = QLabel(f"#{self.name.capitalize()}")
+        frame_name.setObjectName("conversation_name")
         frame_name.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        frame_name.setStyleSheet(
-            f"color: {self.theme.title_color};\
-            font-weight: bold;\
-            border: 0px solid;"
-        )
         upper_layout.addWidget(frame_name)
         self.main_layout.addWidget(self.upper_widget)
         if self.name == "home":
@@ -44,6 +44,7 @@ class LoginLayout(QHBoxLayout):
         self.create_password_widgets()
         self.create_error_widgets()
         self.create_button_widgets()
+        self.update_icons()
 
         self.main_layout.addLayout(self.title_layout)
         self.main_layout.addLayout(self.error_layout)
@@ -55,13 +56,8 @@ class LoginLayout(QHBoxLayout):
         Create the main widget.
         """
         self.main_widget = QWidget()
+        self.main_widget.setObjectName("login_widget")
         self.main_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.main_widget.setStyleSheet(
-            f"background-color: {self.theme.background_color};\
-            color: {self.theme.title_color};\
-            border-radius: 0px;\
-            border: 0px solid {self.theme.nav_color};"
-        )
         self.addWidget(self.main_widget)
 
     def create_main_layouts(self) -> None:
@@ -104,19 +100,10 @@ class LoginLayout(QHBoxLayout):
         Create the title widgets.
         """
         self.icon_soft = AvatarLabel(content=ImageAvatar.SERVER.value)
-        self.icon_soft.setStyleSheet(
-            "font-weight: bold;\
-            border: none"
-        )
         self.icon_soft.setAlignment(Qt.AlignCenter | Qt.AlignCenter)
 
         self.title_label = QLabel("Hello")
-        self.title_label.setStyleSheet(
-            f"color: {self.theme.title_color};\
-            border: none; font-size: 36px;\
-            font-weight: bold;\
-            font-style: italic"
-        )
+        self.title_label.setObjectName("login_title")
         self.title_layout.addWidget(self.icon_soft)
         self.title_layout.addWidget(self.title_label)
 
@@ -125,10 +112,6 @@ class LoginLayout(QHBoxLayout):
         Create the error widgets.
         """
         self.error_label = QLabel("Please login or register if you havn't account yet")
-        self.error_label.setStyleSheet(
-            f"color: {self.theme.title_color};\
-            border: none;"
-        )
         self.error_layout.addWidget(self.error_label)
 
     def create_username_widgets(self) -> None:
@@ -136,11 +119,8 @@ class LoginLayout(QHBoxLayout):
         Create the username widgets.
         """
         self.username_label = QLabel("Username: ")
+        self.username_label.setObjectName("login_label")
         self.username_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.username_label.setStyleSheet(
-            "font-weight: bold;\
-            border: none;"
-        )
         self.username_entry = CustomQLineEdit(
             place_holder_text="Enter your username",
             text=os.environ["USERNAME"],
@@ -159,11 +139,8 @@ class LoginLayout(QHBoxLayout):
         Create the password widgets.
         """
         self.password_label = QLabel("Password: ")
+        self.password_label.setObjectName("login_label")
         self.password_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.password_label.setStyleSheet(
-            "font-weight: bold;\
-            border: none"
-        )
         self.password_entry = CustomQLineEdit(
             place_holder_text="Enter your password",
             text=os.environ["PASSWORD"],
@@ -184,17 +161,22 @@ class LoginLayout(QHBoxLayout):
         """
         Create the button widgets.
         """
-        self.send_icon = QIcon(
-            icon_from_svg(Icon.SEND.value, color=self.theme.text_color)
-        )
-        self.register_icon = QIcon(
-            icon_from_svg(Icon.LOGIN.value, color=self.theme.text_color)
-        )
         self.entry_action = self.password_entry.addAction(
-            self.register_icon, QLineEdit.TrailingPosition
+            QIcon(), QLineEdit.TrailingPosition
         )
         self.entry_action.setToolTip("Register")
         self.send_action = self.password_entry.addAction(
-            self.send_icon, QLineEdit.TrailingPosition
+            QIcon(), QLineEdit.TrailingPosition
         )
         self.send_action.setToolTip("Login")
+
+    def update_icons(self) -> None:
+        """
+        Tint the icons in the colors of the theme
+        """
+        self.send_icon = icon_from_svg(Icon.SEND.value, color=self.theme.text_color)
+        self.register_icon = icon_from_svg(
+            Icon.LOGIN.value, color=self.theme.text_color
+        )
+        self.entry_action.setIcon(self.register_icon)
+        self.send_action.setIcon(self.send_icon)
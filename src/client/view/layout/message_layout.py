@@ -1,30 +1,13 @@
 """Module for message layout."""
 
 import datetime
-import functools
 from enum import Enum, unique
-from typing import Optional
-
-import pytz
-from PySide6.QtCore import QEvent, QSize, Qt, QTimer
-from PySide6.QtGui import QColor, QEnterEvent, QIcon
-from PySide6.QtWidgets import (
-    QFrame,
-    QGraphicsDropShadowEffect,
-    QHBoxLayout,
-    QLabel,
-    QSizePolicy,
-    QVBoxLayout,
-    QWidget,
-)
-from tzlocal import get_localzone
-
-from src.client.view.custom_widget.custom_avatar_label import AvatarLabel, AvatarStatus
-from src.client.view.custom_widget.custom_button import CustomQPushButton
-from src.tools.commands import Commands
-from src.tools.utils import Icon, Themes, check_str_len, icon_from_svg
+from typing import Callable, Optional, Tuple
 
-theme = Themes()
+from src.client.view.custom_widget.custom_avatar_label import AvatarStatus
+from src.tools.commands import Commands
+from src.tools.timestamps import timestamps
+from src.tools.utils import check_str_len
 
 
 @unique
@@ -40,53 +23,62 @@ class EnumReact(Enum):
     ADD = 1
 
 
-class Contener(QFrame):
+# pylint: disable=too-few-public-methods
+# pylint: disable=too-many-instance-attributes
+class MessageRecord:
     """
-    Contener class.
-
-    Args:
-        QFrame (QFrame): QFrame class.
+    Compact form of a message scrolled far out of view, rebuilt into a
+    message layout once scrolled back.
     """
 
-    def __init__(self):
-        super().__init__()
-        self.event_button = QWidget()
-
-    # pylint: disable=invalid-name
-    # pylint: disable=unused-argument
-    def enterEvent(self, event) -> None:
-        """
-        Enter event.
-
-        Args:
-            event (QEvent): Event.
-        """
-        self.event_button.show()
-
-    # pylint: disable=invalid-name
-    # pylint: disable=unused-argument
-    def leaveEvent(self, event) -> None:
-        """
-        Leave event.
+    __slots__ = (
+        "message_id",
+        "sender_",
+        "str_message",
+        "date_time",
+        "nb_react",
+        "is_reacted",
+        "response_id",
+        "size_cache",
+        "background_color",
+        "border_color",
+    )
 
-        Args:
-            event (QEvent): Event.
-        """
-        self.event_button.hide()
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        message_id: int,
+        sender: str,
+        message: str,
+        date_time: str,
+        nb_react: int,
+        is_reacted: bool,
+        response_id: Optional[int],
+        size_cache: Optional[Tuple[int, int]],
+        highlight: Tuple[Optional[str], Optional[str]],
+    ) -> None:
+        self.message_id = message_id
+        self.sender_ = sender
+        self.str_message = message
+        self.date_time = date_time
+        self.nb_react = nb_react
+        self.is_reacted = is_reacted
+        self.response_id = response_id
+        # Kept so that the row keeps its height, the scroll does not move
+        self.size_cache = size_cache
+        self.background_color, self.border_color = highlight
 
 
 # pylint: disable=too-many-instance-attributes
-class MessageLayout(QHBoxLayout):
+class MessageLayout:
     """
     Message layout for each message.
 
-    Args:
-        QHBoxLayout (QHBoxLayout): QHBoxLayout class.
+    A row of the message list: the message and its display state, painted by
+    the message delegate. No widget is created per message.
     """
 
     # pylint: disable=too-many-arguments
-    # pylint: disable=too-many-locals
-    # pylint: disable=too-many-statements
     def __init__(
         self,
         controller,
@@ -96,322 +88,184 @@ class MessageLayout(QHBoxLayout):
         message_id: Optional[None] = None,
         date: Optional[str] = "",
         response_model=False,
+        is_pending: Optional[bool] = False,
     ):
-        super().__init__()
-        self.setContentsMargins(0, 0, 0, 0)
-        self.setAlignment(Qt.AlignLeft | Qt.AlignCenter)
-
         # Attributes
         self.controller = controller
         self.message_id = message_id
         self.is_reacted = False
         self.nb_react = nb_react
-        self.content = content
+        # Placeholder until the avatar of the sender is fetched
+        avatar_loader = controller.avatar_loader_controller
+        self.content = content or avatar_loader.placeholder
         self.is_displayed = False
-        self.timer = QTimer()
-        self.timer.setSingleShot(True)
-
-        # --- Main widget
-        self.main_widget = QWidget()
-
-        self.addWidget(self.main_widget)
-        self.main_widget.setStyleSheet(
-            f"color: {theme.title_color};\
-            margin-bottom: 1px;\
-            margin-right: 2px;"
-        )
-        main_layout = QHBoxLayout(self.main_widget)
-        main_layout.setContentsMargins(0, 0, 0, 0)
-
-        # --- Left widget
-        self.left_layout = QVBoxLayout()
-        self.left_layout.setContentsMargins(0, 0, 0, 0)
-        self.left_layout.setSpacing(0)
-        self.left_widget = QWidget()
-        self.left_widget.setStyleSheet("padding: 0px; border: 0px;")
-        self.left_widget.setMaximumWidth(80)
-        self.left_widget.setMinimumWidth(80)
-
-        self.left_layout.setAlignment(Qt.AlignTop | Qt.AlignCenter)
-        self.left_widget.setLayout(self.left_layout)
-        main_layout.addWidget(self.left_widget)
-
-        # --- Right widget
-        right_widget = Contener()
-        right_widget.setContentsMargins(0, 0, 0, 0)
-        right_widget.setStyleSheet(
-            "background-color: transparent;\
-            border-radius: 0px;"
-        )
-        right_layout = QVBoxLayout()
-        right_layout.setContentsMargins(0, 0, 0, 0)
-        right_layout.setSpacing(5)
-        right_widget.setLayout(right_layout)
-
-        main_layout.addWidget(right_widget)
-        right_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-
-        icon_label, copy_icon = AvatarLabel(
-            content=self.content,
-            height=38,
-            width=38,
-        ), AvatarLabel(content=self.content, status=AvatarStatus.DM)
-        icon_label.set_opacity(0.8)
-        icon_label.graphicsEffect().setEnabled(False)
-        icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.is_pending = is_pending
+        self.is_failed = False
+        self.response_model = response_model or None
+
+        # Row of the message list displaying the message
+        self.list_model = None
+        # Width and height of the row, computed by the delegate
+        self.size_cache: Optional[Tuple[int, int]] = None
+        # Highlight of the row: background and left border colors
+        self.background_color: Optional[str] = None
+        self.border_color: Optional[str] = None
 
         self.str_message = coming_msg["message"]
         self.sender_ = coming_msg["id"]
-
         self.username_label = check_str_len(self.sender_)
+        # Called once, when the row is painted for the first time
+        self.on_visible: Optional[Callable[[], None]] = None
+        avatar_loader.watch(self.sender_, self, self.update_avatar)
+
+        # Parsed and formatted once the row is painted
+        self.date = date
+        self.sent_at = None if date else datetime.datetime.now()
+        self._date_time: Optional[str] = None
+
+    @classmethod
+    def from_record(
+        cls, controller, record: MessageRecord, response_model=None
+    ) -> "MessageLayout":
+        """
+        Rebuild a message scrolled back into view
 
-        self.left_layout.addWidget(icon_label)
-
-        self.sender_btn = CustomQPushButton(self.username_label)
-        self.sender_btn.setFixedHeight(20)
+        Args:
+            controller (GuiController): the gui controller
+            record (MessageRecord): the compact message
+            response_model (MessageLayout, optional): the replied message.
 
-        def hover(event: QEvent, user_widget):
-            style_ = """
-            font-weight: bold;
-            background-color: transparent;
-            border-radius: 4px;
-            border: 0px solid transparent;
-            text-align: center;
-            """
-            if isinstance(event, QEnterEvent):
-                style_ += "text-decoration: underline;"
+        Returns:
+            MessageLayout: the message
+        """
+        message = cls(
+            controller,
+            {"id": record.sender_, "message": record.str_message},
+            nb_react=record.nb_react,
+            content=controller.api_controller.get_avatar(record.sender_),
+            message_id=record.message_id,
+            response_model=response_model,
+        )
+        message._date_time = record.date_time
+        message.is_reacted = record.is_reacted
+        message.size_cache = record.size_cache
+        message.background_color = record.background_color
+        message.border_color = record.border_color
+        return message
+
+    def to_record(self) -> MessageRecord:
+        """
+        Compact form of the message, once scrolled far out of view
 
-            user_widget.setStyleSheet(style_)
+        Returns:
+            MessageRecord: the record
+        """
+        return MessageRecord(
+            self.message_id,
+            self.sender_,
+            self.str_message,
+            self.date_time,
+            self.nb_react,
+            self.is_reacted,
+            self.response_model.message_id if self.response_model else None,
+            self.size_cache,
+            (self.background_color, self.border_color),
+        )
 
-        if self.sender_ != self.controller.ui.client.user_name:
-            self.sender_btn.clicked.connect(
-                functools.partial(self.add_dm_layout, copy_icon)
-            )
-            icon_label.mousePressEvent = lambda e: functools.partial(
-                self.add_dm_layout, copy_icon
-            )()
-            icon_label.leaveEvent = lambda e: functools.partial(
-                icon_label.graphicsEffect().setEnabled, False
-            )()
-            icon_label.enterEvent = lambda e: functools.partial(
-                icon_label.graphicsEffect().setEnabled, True
-            )()
-
-        if message_id and self.sender_ != self.controller.ui.client.user_name:
-            self.sender_btn.enterEvent = functools.partial(
-                hover, user_widget=self.sender_btn
-            )
-            self.sender_btn.leaveEvent = functools.partial(
-                hover, user_widget=self.sender_btn
-            )
-            style_ = """
-            QPushButton {{
-            font-weight: bold;
-            }} 
-            """
-        else:
-            style_ = """
-            QPushButton {{
-            font-weight: bold;
-            border: 0px;
-            }}
-            """
-        self.sender_btn.setStyleSheet(style_.format())
-
-        if message_id:
-            # ------------------------------- React Button ------------------------------- #
-            right_widget.event_button = QWidget()
-            right_widget.event_button.setStyleSheet(
-                f"background-color: {theme.inner_color};\
-                border: 1px solid {theme.nav_color};\
-                border-radius: 6px;"
-            )
-            right_widget.event_button.setContentsMargins(0, 0, 0, 0)
-            self.event_layout = QHBoxLayout(right_widget.event_button)
-            self.event_layout.setSpacing(0)
-            self.event_layout.setContentsMargins(1, 1, 1, 1)
-            self.react_buttton = CustomQPushButton(
-                "",
-                bg_color=theme.inner_color,
-                bg_color_active=theme.nav_color,
-                radius=4,
-            )
-            self.react_buttton.setToolTip("React to this message")
-            retain = self.react_buttton.sizePolicy()
-            retain.setRetainSizeWhenHidden(True)
-            self.react_buttton.setSizePolicy(retain)
+    @property
+    def date_time(self) -> str:
+        """
+        Date of the message in the local timezone, formatted on first use
 
-            self.react_buttton.clicked.connect(self.add_react)
-            self.react_buttton.setFixedHeight(20)
-            self.react_buttton.setFixedWidth(20)
+        Returns:
+            str: the date
+        """
+        if self._date_time is None:
+            if self.sent_at is not None:
+                self._date_time = self.sent_at.strftime("%d/%m/%Y à %H:%M:%S")
+            else:
+                self._date_time = timestamps.format(self.date)
+        return self._date_time
 
-            react_icon = QIcon(
-                icon_from_svg(Icon.SMILEY.value, color=theme.emoji_color)
-            )
+    @property
+    def date_label(self) -> str:
+        """
+        Date displayed next to the sender
 
-            self.react_buttton.setIcon(react_icon)
-            self.event_layout.addWidget(self.react_buttton)
+        Returns:
+            str: the date, or the sending state of a pending message
+        """
+        if self.is_failed:
+            return "Not sent"
+        if self.is_pending:
+            return "Sending..."
+        return self.date_time
+
+    @property
+    def is_admin(self) -> bool:
+        """
+        The sender is an administrator, a crown is displayed
 
-            self.reply_button = CustomQPushButton(
-                "",
-                bg_color=theme.inner_color,
-                bg_color_active=theme.nav_color,
-                radius=4,
-            )
-            self.reply_button.setToolTip("Reply to this message")
+        Returns:
+            bool: True for an administrator
+        """
+        return "admin" in self.username_label
 
-            self.reply_button.clicked.connect(self.add_reply)
-            self.reply_button.setFixedSize(20, 20)
-            response_icon = QIcon(
-                icon_from_svg(Icon.REPLY.value, color=theme.emoji_color)
-            )
-            self.reply_button.setIcon(response_icon)
-            self.event_layout.addWidget(self.reply_button)
-
-            retain = right_widget.event_button.sizePolicy()
-            retain.setRetainSizeWhenHidden(True)
-            right_widget.event_button.setSizePolicy(retain)
-            right_widget.event_button.hide()
-            # ---------------------------------------------------------------------------- #
-
-        # -------------------------------- React widget ------------------------------- #
-        react_layout = QHBoxLayout()
-        react_layout.setSpacing(0)
-        react_layout.setContentsMargins(3, 2, 3, 2)
-        self.react_widget = QWidget()
-        self.react_widget.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-
-        self.react_widget.setStyleSheet(
-            f"color: {theme.title_color};\
-            background-color: {theme.inner_color};\
-            border-radius: 6px;\
-            font-weight: bold;\
-            border: 1px solid {theme.nav_color};"
-        )
-        self.react_widget.setLayout(react_layout)
-        self.react_emot = AvatarLabel(
-            content=Icon.SMILEY.value,
-            height=15,
-            width=15,
-            color=theme.emoji_color,
-        )
-        self.react_emot.setContentsMargins(0, 0, 0, 0)
-        self.react_emot.setStyleSheet("border: 0px;")
-        self.react_nb = QLabel("1")
-
-        self.react_emot.setAlignment(Qt.AlignLeft)
-        self.react_nb.setAlignment(Qt.AlignLeft)
-        self.react_nb.setStyleSheet("border: 0px")
-        react_layout.addWidget(self.react_emot)
-        react_layout.addWidget(self.react_nb)
-        # ---------------------------------------------------------------------------- #
-        top_layout = QHBoxLayout()
-        top_layout.setContentsMargins(0, 0, 0, 0)
-        top_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
-
-        top_layout.addWidget(self.sender_btn)
-
-        if "admin" in self.username_label:
-            crown_icon = QIcon(
-                icon_from_svg(Icon.CROWN.value, color=theme.emoji_color)
-            ).pixmap(QSize(15, 15))
-            sender_icon = QLabel()
-            sender_icon.setContentsMargins(0, 0, 0, 3)
-            sender_icon.setPixmap(crown_icon)
-            top_layout.addWidget(sender_icon)
-
-        if not date:
-            date_time = datetime.datetime.now().strftime("%d/%m/%Y à %H:%M:%S")
-        else:
-            dt_object = datetime.datetime.strptime(date, "%Y-%m-%dT%H:%M:%S.%f%z")
-            local_timezone = get_localzone()
-            local_dt_object = dt_object.replace(tzinfo=pytz.utc).astimezone(
-                local_timezone
-            )
-            date_time = local_dt_object.strftime("%d/%m/%Y at %H:%M:%S")
-
-        date_label = QLabel(date_time)
-        date_label.setContentsMargins(0, 0, 0, 0)
-        date_label.setStyleSheet(
-            f"border: 0px;\
-            font-size: 8px;\
-            color: {theme.rooms_color}"
-        )
-        top_layout.addWidget(date_label)
-
-        message_label = QLabel(self.str_message)
-        message_label.setStyleSheet(f"border: 0px; color: {theme.text_color};")
-        message_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Maximum)
-        message_label.setWordWrap(True)
-        message_label.setAlignment(Qt.AlignmentFlag.AlignJustify)
-        message_label.setTextInteractionFlags(
-            Qt.TextInteractionFlag.TextSelectableByMouse
-        )
+    @property
+    def can_open_dm(self) -> bool:
+        """
+        The sender and the avatar open a direct message with the sender
 
-        top_layout.addWidget(
-            right_widget.event_button, stretch=1, alignment=Qt.AlignmentFlag.AlignRight
-        )
+        Returns:
+            bool: True if the sender is not the user
+        """
+        return self.sender_ != self.controller.ui.client.user_name
 
-        # Add response model
-        if response_model:
-            icon_label.setStyleSheet("padding-top: 20px;")
-            response_layout = QHBoxLayout()
-            response_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
-            response_layout.setSpacing(0)
-
-            model_icon = AvatarLabel(
-                content=response_model.content,
-                height=15,
-                width=15,
-            )
-            icon_reply_label = QLabel()
-            icon_reply = QIcon(
-                icon_from_svg(Icon.LINK.value, color=theme.text_color)
-            ).pixmap(QSize(15, 15))
-            icon_reply_label.setPixmap(icon_reply)
+    def refresh(self, resize: Optional[bool] = False) -> None:
+        """
+        Repaint the row of the message
 
-            username_response = f"@{response_model.username_label}:"
+        Args:
+            resize (Optional[bool], optional): the height of the row changed.
+        """
+        if resize:
+            self.size_cache = None
+        if self.list_model is not None:
+            self.list_model.refresh(self, resize)
+
+    def set_highlight(
+        self, background_color: Optional[str], border_color: Optional[str] = None
+    ) -> None:
+        """
+        Highlight the row, None to remove
 
-            if len(response_model.str_message) > 60:
-                model_message = f"{response_model.str_message[:50]}..."
-            else:
-                model_message = response_model.str_message
-
-            model_username = QLabel(username_response)
-            model_username.setContentsMargins(0, 0, 0, 0)
-            model_username.setStyleSheet("font-weight: bold;")
-            model_message = CustomQPushButton(
-                model_message,
-                color=theme.title_color,
-            )
-            model_message.setContentsMargins(0, 0, 0, 0)
+        Args:
+            background_color (Optional[str]): background color
+            border_color (Optional[str], optional): color of the left border.
+        """
+        self.background_color = background_color
+        self.border_color = border_color
+        self.refresh()
 
-            model_message.clicked.connect(
-                functools.partial(self.controller.focus_in_message, response_model)
-            )
-            model_message.setFixedHeight(20)
-            model_message.enterEvent = lambda e: model_message.setStyleSheet(
-                f"color : {theme.rooms_color};"
-            )
-            model_message.leaveEvent = lambda e: model_message.setStyleSheet(
-                f"color : {theme.title_color};"
-            )
-            response_layout.addWidget(
-                icon_reply_label, alignment=Qt.AlignmentFlag.AlignHCenter
-            )
-            response_layout.addWidget(model_icon)
-            response_layout.addWidget(model_username)
-            response_layout.addWidget(model_message)
-            right_layout.addLayout(response_layout)
-        else:
-            icon_label.setStyleSheet("padding-top: 10px;")
+    def acknowledge(self, message_id: int) -> None:
+        """
+        The server received the pending message
 
-        right_layout.addLayout(top_layout)
-        right_layout.addWidget(message_label)
-        right_layout.addWidget(self.react_widget)
+        Args:
+            message_id (int): id of the message
+        """
+        self.message_id = message_id
+        self.is_pending = False
+        # Received late, after the timeout
+        self.is_failed = False
+        self.refresh()
 
-        if message_id:
-            self.update_react(self.nb_react)
+    def set_failed(self) -> None:
+        """
+        The pending message was not received by the server
+        """
+        self.is_failed = True
+        self.refresh()
 
     def add_react(self) -> None:
         """
@@ -429,13 +283,7 @@ class MessageLayout(QHBoxLayout):
             self.controller.react_controller.send_emot_react(
                 Commands.ADD_REACT, self.message_id, self.nb_react
             )
-
-        self.react_nb.setText(f"{self.nb_react}")
-
-        if self.nb_react == 0:
-            self.react_widget.hide()
-        else:
-            self.react_widget.show()
+        self.refresh(resize=True)
 
     def add_reply(self) -> None:
         """
@@ -451,33 +299,26 @@ class MessageLayout(QHBoxLayout):
             react_nb (int): Number of react.
         """
         self.nb_react = react_nb
-        if self.nb_react == 0:
-            self.react_widget.hide()
-        else:
-            self.react_widget.show()
-        self.react_widget.update()
-        self.react_nb.setText(f"{self.nb_react}")
+        self.refresh(resize=True)
 
-    def add_dm_layout(self, icon_label: QLabel) -> None:
+    def update_avatar(self, content: bytes) -> None:
         """
-        Add dm layout.
+        Swap the placeholder with the avatar of the sender
 
         Args:
-            icon_label (QLabel): Icon label.
+            content (bytes): the avatar
         """
-        self.controller.add_gui_for_mp_layout(
-            self.username_label, icon_label, switch_frame=True
-        )
+        self.content = content
+        self.refresh()
 
-    def widget_shadow(self, widget: QWidget) -> None:
+    def add_dm_layout(self) -> None:
         """
-        Add shadow to widget.
-
-        Args:
-            widget (QWidget): Widget.
+        Add dm layout.
         """
-        result = QGraphicsDropShadowEffect()
-        result.setColor(QColor(0, 0, 0, 150))
-        result.setOffset(0, 1)
-        result.setBlurRadius(1)
-        widget.setGraphicsEffect(result)
+        self.controller.add_gui_for_mp_layout(
+            self.username_label,
+            self.controller.avatar_loader_controller.create_avatar_label(
+                self.sender_, status=AvatarStatus.DM
+            ),
+            switch_frame=True,
+        )
@@ -11,7 +11,6 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from src.client.view.stylesheets.stylesheets import scroll_bar_vertical_stylesheet
 from src.tools.utils import Icon, Themes, icon_from_svg
 
 
@@ -41,6 +40,7 @@ class LeftNavView:
         self.user_offline.setSpacing(0)
 
         self.scroll_area_avatar = QScrollArea()
+        self.scroll_area_avatar.setObjectName("scroll_area_avatar")
         self.scroll_area_avatar.setFixedWidth(self.width)
 
         self.max_width_geometry = self.scroll_area_avatar.geometry()
@@ -52,35 +52,18 @@ class LeftNavView:
         )  # Easing curve for smooth animation
 
         self.scroll_widget_avatar = QWidget()
+        self.scroll_widget_avatar.setObjectName("scroll_widget_avatar")
 
         self.left_nav_layout.update()
         self.scroll_widget_avatar.setSizePolicy(
             QSizePolicy.Expanding, QSizePolicy.Expanding
         )
         self.scroll_widget_avatar.setFixedWidth(self.width)
-        self.scroll_widget_avatar.setStyleSheet(
-            f"font-weight: bold;\
-            color: {self.theme.title_color};\
-            background-color: {self.theme.inner_color};\
-            border-radius: 0px;\
-            border: 0px solid;\
-            border-color: {self.theme.nav_color};\
-            margin-bottom: 0px;\
-            margin-left: 0px"
-        )
 
         self.user_inline_layout = QVBoxLayout(self.scroll_widget_avatar)
         self.user_inline_layout.setSpacing(0)
         self.user_inline_layout.setAlignment(Qt.AlignTop | Qt.AlignCenter)
 
-        self.scroll_area_avatar.verticalScrollBar().setStyleSheet(
-            scroll_bar_vertical_stylesheet.format(
-                _background_color=self.theme.inner_color
-            )
-        )
-        self.scroll_area_avatar.setStyleSheet(
-            "background-color: transparent; border: 0px"
-        )
         self.scroll_area_avatar.enterEvent = (
             lambda e: self.scroll_area_avatar.setVerticalScrollBarPolicy(
                 Qt.ScrollBarAsNeeded
@@ -98,23 +81,17 @@ class LeftNavView:
         self.scroll_area_avatar.setWidget(self.scroll_widget_avatar)
 
         self.info_label = QLabel("")
+        self.info_label.setObjectName("info_label")
         self.info_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
 
         self.info_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
         self.info_label.setContentsMargins(5, 5, 5, 5)
-        self.info_label.setStyleSheet(
-            f"font-weight: bold; color: {self.theme.title_color};\
-            background-color: transparent;\
-            border-radius: 0px;\
-            margin-bottom: 0px;\
-            margin-left: 0px;\
-            border: 0px solid;"
-        )
 
         self.user_inline.addWidget(self.info_label)
         self.user_inline_layout.addLayout(self.user_inline)
 
         self.info_disconnected_label = QLabel("")
+        self.info_disconnected_label.setObjectName("info_disconnected_label")
         self.info_disconnected_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
         self.info_disconnected_label.setContentsMargins(5, 5, 5, 5)
         disconnected_label = QLabel()
@@ -124,16 +101,6 @@ class LeftNavView:
         disconnected_label.setPixmap(disconnected_icon)
 
         self.info_disconnected_label.hide()
-        self.info_disconnected_label.setStyleSheet(
-            f"font-weight: bold;\
-            color: {self.theme.title_color};\
-            background-color: transparent;\
-            border-radius: 0px;\
-            margin-bottom: 0px;\
-            margin-top: 0px;\
-            margin-left: 0px;\
-            border: 0px solid"
-        )
 
         self.user_offline.addWidget(self.info_disconnected_label)
         self.user_inline_layout.addLayout(self.user_offline)
@@ -5,7 +5,6 @@ from typing import Dict
 from PySide6.QtCore import QEasingCurve, QPropertyAnimation, Qt
 from PySide6.QtWidgets import QLabel, QScrollArea, QVBoxLayout, QWidget
 
-from src.client.view.stylesheets.stylesheets import scroll_bar_vertical_stylesheet
 from src.tools.utils import Icon, Themes, icon_from_svg
 
 
@@ -29,6 +28,7 @@ class RightNavView:
         """
         # Scroll area
         self.scroll_area_dm = QScrollArea()
+        self.scroll_area_dm.setObjectName("scroll_area_dm")
         self.scroll_area_dm.setFixedWidth(self.width)
 
         self.max_width_geometry = self.scroll_area_dm.geometry()
@@ -39,13 +39,6 @@ class RightNavView:
             QEasingCurve.OutCubic
         )  # Easing curve for smooth animation
 
-        self.scroll_area_dm.verticalScrollBar().setStyleSheet(
-            scroll_bar_vertical_stylesheet.format(
-                _background_color=self.theme.inner_color
-            )
-        )
-
-        self.scroll_area_dm.setStyleSheet("background-color: transparent; border: 0px")
         self.scroll_area_dm.enterEvent = (
             lambda e: self.scroll_area_dm.setVerticalScrollBarPolicy(
                 Qt.ScrollBarAsNeeded
@@ -62,25 +55,17 @@ class RightNavView:
 
         # Background
         self.right_nav_widget = QWidget()
+        self.right_nav_widget.setObjectName("right_nav_widget")
         self.right_nav_widget.setFixedWidth(self.width)
-        self.right_nav_widget.setStyleSheet(
-            f"background-color: {self.theme.inner_color};\
-            color: {self.theme.title_color};\
-            border-radius: 0px;\
-            border: 0px solid;\
-            border-color: {self.theme.nav_color};\
-            margin-bottom: 0px;"
-        )
         self.direct_message_layout = QVBoxLayout(self.right_nav_widget)
         self.direct_message_layout.setSpacing(0)
         self.direct_message_layout.setAlignment(Qt.AlignLeft | Qt.AlignTop)
 
         dm_label = QLabel("Messages")
+        dm_label.setObjectName("dm_label")
         dm_label.setContentsMargins(5, 5, 5, 5)
-        self._update_label_style(dm_label)
         dm_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
         dm_icon = QLabel()
-        dm_icon.setStyleSheet("border: 0px")
         dm_icon.setAlignment(Qt.AlignLeft | Qt.AlignCenter)
 
         dm_q_icon = icon_from_svg(
@@ -95,23 +80,6 @@ class RightNavView:
 
         self.scroll_area_dm.setWidget(self.right_nav_widget)
 
-    def _update_label_style(self, widget: QWidget) -> None:
-        """
-        Update the label style.
-
-        Args:
-            widget (QWidget): the widget to update
-        """
-        style_ = f"font-weight: bold;\
-        color: {self.theme.title_color};\
-        background-color: transparent;\
-        border: 0px solid;\
-        border-radius: 0px;\
-        padding-left: 0px;\
-        padding-right: 0px;"
-
-        widget.setStyleSheet(style_)
-
     def slide_out(self) -> None:
         """
         Slide out the right navigation widget
@@ -1,161 +1,417 @@
 """Module for storing stylesheets."""
 
+from typing import Any
+
+from PySide6.QtWidgets import QWidget
+
+from src.tools.utils import GenericColor, Themes
+
 scroll_bar_vertical_stylesheet = """
-QScrollArea {{
+{_scope} QScrollBar:vertical {{
     background: transparent;
-    border: none;
-}}
-QScrollBar:vertical {{
-    background: transparent;
-    width: 6px;
+    width: {_width}px;
     margin-left: 0px;
 }}
-QScrollBar::handle:vertical {{
+{_scope} QScrollBar::handle:vertical {{
     background: #171717;
     min-height: 25px;
-    border-radius: 3px;
+    border-radius: {_handle_radius}px;
 }}
-QScrollBar::add-line:vertical {{
+{_scope} QScrollBar::add-line:vertical {{
     border: none;
     background: transparent;
     height: 12px;
-    border-bottom-left-radius: 3px;
-    border-bottom-right-radius: 3px;
+    border-bottom-left-radius: {_line_radius}px;
+    border-bottom-right-radius: {_line_radius}px;
     subcontrol-position: bottom;
     subcontrol-origin: margin;
     margin-left: 0px;
 }}
-QScrollBar::sub-line:vertical {{
+{_scope} QScrollBar::sub-line:vertical {{
     border: none;
     background: transparent;
     height: 12px;
-    border-top-left-radius: 3px;
-    border-top-right-radius: 3px;
+    border-top-left-radius: {_line_radius}px;
+    border-top-right-radius: {_line_radius}px;
     subcontrol-position: top;
     subcontrol-origin: margin;
     margin-left: 0px;
-    border-radius: 3px;
 }}
-QScrollBar::up-arrow:vertical, QScrollBar::down-arrow:vertical {{
+{_scope} QScrollBar::up-arrow:vertical, {_scope} QScrollBar::down-arrow:vertical {{
     background: {_background_color};
 }}
-QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {{
+{_scope} QScrollBar::add-page:vertical, {_scope} QScrollBar::sub-page:vertical {{
     background: {_background_color};
 }}
 """
 
-custom_line_edit_style = """
-QLineEdit {{
-	background-color: {_bg_color};
-	border-radius: {_radius}px;
-	border: {_border_size}px solid {_context_color};
-	padding-left: 5px;
+# Custom widgets, the variants are selected by object name or dynamic property
+custom_widgets_stylesheet = """
+CustomQPushButton {{
+    background-color: transparent;
+    border-radius: 6px;
+    border: 0px solid {_inner_color};
+    selection-color: #000;
+    selection-background-color: {_background_color};
+    color: {_title_color};
+}}
+CustomQPushButton:hover {{
+    border: 0px solid {_title_color};
+    background-color: {_inner_color};
+}}
+CustomQPushButton:disabled {{
+    border: 0px solid {_rooms_color};
+    background-color: #313338;
+}}
+#close_left_nav_button, #close_right_nav_button {{
+    border-radius: 8px;
+}}
+#frame_icon_button:hover {{
+    background-color: {_background_color};
+}}
+
+CustomQLineEdit {{
+    background-color: {_inner_color};
+    border-radius: 12px;
+    border: 0px solid {_nav_color};
+    padding-left: 5px;
     padding-right: 5px;
-	selection-background-color: {_context_color};
-    color: {_color};
+    selection-background-color: {_nav_color};
+    color: {_title_color};
     margin-left: 0px;
     margin-right: 0px;
 }}
-QLineEdit:focus {{
-	border: {_border_size}px solid {_context_color};
-    background-color: {_bg_color_active};
+CustomQLineEdit:focus {{
+    border: 0px solid {_nav_color};
+    background-color: {_inner_color};
 }}
-"""
-
-custom_line_edit_style_rounded = """
-QLineEdit {{
-	background-color: {_bg_color};
-	border-radius: {_radius}px;
+#user_search, #user_search:focus, #conversation_search, #conversation_search:focus {{
+    background-color: {_search_color};
+}}
+#user_search[expanded="true"], #user_search[expanded="true"]:focus {{
     border-bottom-left-radius: 0px;
     border-bottom-right-radius: 0px;
-	border: {_border_size}px solid {_context_color};
+    border: 1px solid {_nav_color};
     border-bottom: 0px solid;
-	padding-left: 5px;
-    padding-right: 5px;
-	selection-background-color: {_context_color};
-    color: {_color};
 }}
-QLineEdit:focus {{
-	border: {_border_size}px solid {_context_color};
-    border-bottom: 0px solid;
-    background-color: {_bg_color_active};
+#message_entry, #theme_color_entry {{
+    border-radius: 4px;
 }}
-"""
 
-
-custom_liste_style = """
-QListWidget {{
-	background-color: {_bg_color};
+CustomQListWidget {{
+    background-color: {_search_color};
     border-top-left-radius: 0px;
     border-top-right-radius: 0px;
-    border-bottom-left-radius: {_radius}px;
-    border-bottom-right-radius: {_radius}px;
-	border: {_border_size}px solid {_context_color};
+    border-bottom-left-radius: 12px;
+    border-bottom-right-radius: 12px;
+    border: 1px solid {_nav_color};
     border-top: 0px solid;
-	padding-left: 0px;
+    padding-left: 0px;
     padding-right: 0px;
-	selection-color: {_selection_color};
-	selection-background-color: {_context_color};
-    color: {_color};
+    selection-color: #FFF;
+    selection-background-color: {_nav_color};
+    color: {_title_color};
 }}
-QListWidget:focus {{
-	border: {_border_size}px solid {_context_color};
+CustomQListWidget:focus {{
+    border: 1px solid {_nav_color};
     border-top: 0px solid;
-    background-color: {_bg_color_active};
+    background-color: {_inner_color};
 }}
-QScrollBar:vertical {{
-    background: transparent;
-    width: 4px;
-    margin-left: 0px;
+
+AvatarLabel {{
+    border: none;
 }}
-QScrollBar::handle:vertical {{
-    background: #171717;
-    min-height: 25px;
-    border-radius: 1.5px;
+
+MessageListView {{
+    background-color: transparent;
+    color: white;
+    border: 0px;
 }}
-QScrollBar::add-line:vertical {{
-    border: none;
-    background: transparent;
-    height: 12px;
-    border-bottom-left-radius: 7px;
-    border-bottom-right-radius: 7px;
-    subcontrol-position: bottom;
-    subcontrol-origin: margin;
-    margin-left: 0px;
+"""
+
+# Main window: header, navigation bars, conversations and footer
+layout_stylesheet = """
+#main_widget {{
+    background-color: {_background_color};
 }}
-QScrollBar::sub-line:vertical {{
-    border: none;
-    background: transparent;
-    height: 12px;
-    border-top-left-radius: 7px;
-    border-top-right-radius: 7px;
-    subcontrol-position: top;
-    subcontrol-origin: margin;
+
+#header {{
+    background-color: {_background_color};
+    border-radius: 0px;
+    border: 0px solid {_nav_color};
+    margin-bottom: 0px;
+}}
+#header, #header QLabel {{
+    color: {_title_color};
+}}
+#status_server_label {{
+    font-weight: bold;
+    font-style: italic;
+    border: 0px solid {_nav_color};
+}}
+#welcome_label {{
+    font-weight: bold;
+}}
+#header_info {{
+    background-color: {_background_color};
+    border-radius: 12px;
+}}
+
+#upper_widget {{
+    background-color: {_inner_color};
+    border-radius: 4px;
+    border: 0px solid {_nav_color};
+    margin-left: 5px;
+    margin-right: 5px;
+}}
+#frame_title {{
+    color: {_title_color};
+    background-color: transparent;
+    border: 0px solid;
+}}
+#frame_name {{
+    color: {_title_color};
+    font-weight: bold;
+    border: 0px solid;
+    margin: 0px;
+}}
+#api_state_label {{
+    font-weight: bold;
+    color: {_error_color};
+    border: 0px solid;
+}}
+
+#rooms_bar {{
+    background-color: {_rooms_color};
+    border: 0px solid;
+    margin-top: 0px;
+    padding: 0px;
+}}
+
+#scroll_area_avatar, #scroll_area_dm {{
+    background-color: transparent;
+    border: 0px;
+}}
+#scroll_widget_avatar, #right_nav_widget {{
+    color: {_title_color};
+    background-color: {_inner_color};
+    border-radius: 0px;
+    border: 0px solid {_nav_color};
+    margin-bottom: 0px;
     margin-left: 0px;
 }}
-QScrollBar::up-arrow:vertical, QScrollBar::down-arrow:vertical {{
-    background: transparent;
+#scroll_widget_avatar QLabel, #right_nav_widget QLabel {{
+    color: {_title_color};
 }}
-QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {{
-    background: transparent;
+#scroll_widget_avatar QLabel {{
+    font-weight: bold;
+}}
+#info_label, #info_disconnected_label, #dm_label {{
+    font-weight: bold;
+    color: {_title_color};
+    background-color: transparent;
+    border-radius: 0px;
+    border: 0px solid;
+    margin: 0px;
+    padding: 0px;
+}}
+
+#conversation_header {{
+    background-color: {_background_color};
+    border-radius: 0px;
+    border: 0px solid {_nav_color};
+}}
+#conversation_name {{
+    color: {_title_color};
+    font-weight: bold;
+    border: 0px solid;
+}}
+
+#user_info_widget, #bottom_right_widget {{
+    background-color: {_search_color};
+    color: {_title_color};
+}}
+#user_info_widget {{
+    border-radius: 0px;
+    border: 0px;
+}}
+#user_info_widget QLabel, #bottom_right_widget QLabel {{
+    color: {_title_color};
+}}
+#footer_user_name {{
+    font-weight: bold;
+}}
+#footer_user_status {{
+    font-size: 10px;
+}}
+
+#login_widget {{
+    background-color: {_background_color};
+    border-radius: 0px;
+    border: 0px solid {_nav_color};
+}}
+#login_widget QLabel {{
+    color: {_title_color};
+}}
+#login_title {{
+    font-size: 36px;
+    font-weight: bold;
+    font-style: italic;
+}}
+#login_label {{
+    font-weight: bold;
 }}
 """
 
-custom_button_style = """
-QPushButton {{
-	background-color: {_bg_color};
-	border-radius: {_radius}px;
-	border: {_border_size}px solid {_bg_color_active};
-	selection-color: {_selection_color};
-	selection-background-color: {_context_color};
-    color: {_color};
-}}
-QPushButton:hover {{
-	border: {_border_size}px solid {_color};
-    background-color: {_bg_color_active};
-}}
-QPushButton:disabled {{
-	border: {_border_size}px solid {_disabled_color};
-    background-color: #313338;
+# Entries of the lists: users, rooms, direct messages and search results
+entries_stylesheet = """
+CustomQPushButton[entry="self"], CustomQPushButton[entry="self"]:hover,
+CustomQPushButton[entry="online"],
+CustomQPushButton[entry="offline"],
+CustomQPushButton[entry="search"] {{
+    background-color: transparent;
+    border-radius: 8px;
+    border: 0px solid transparent;
+}}
+CustomQPushButton[entry="dm"] {{
+    background-color: transparent;
+    border-radius: 8px;
+    border: 1px solid transparent;
+}}
+CustomQPushButton[entry="room"] {{
+    font-weight: bold;
+    text-align: center;
+    background-color: transparent;
+    border-radius: 8px;
+    border: 1px solid transparent;
+    padding: 0px;
+}}
+CustomQPushButton[entry="online"]:hover,
+CustomQPushButton[entry="offline"]:hover,
+CustomQPushButton[entry="dm"]:hover,
+CustomQPushButton[entry="search"]:hover,
+CustomQPushButton[entry="room"]:hover {{
+    background-color: {_background_color};
+}}
+#entry_name {{
+    text-align: left;
+    font-weight: bold;
+    background-color: transparent;
+    border-radius: 8px;
+    border: 1px solid transparent;
+}}
+CustomQPushButton[entry="dm"] #entry_name {{
+    border: 0px solid transparent;
+}}
+#search_entry_name {{
+    font-weight: bold;
+    background-color: transparent;
+    color: {_title_color};
+}}
+"""
+
+# Popups: user profile and theme board
+popups_stylesheet = """
+#user_profile {{
+    background-color: {_background_color};
+    border-radius: 8px;
+    border: 1px solid {_nav_color};
+}}
+#user_profile QLabel {{
+    border: 0px solid;
+    color: {_text_color};
+}}
+#profile_name {{
+    font-weight: bold;
+}}
+#user_description {{
+    background-color: {_inner_color};
+    color: {_text_color};
+    border-radius: 8px;
+    border: 1px solid {_nav_color};
+}}
+#profile_actions {{
+    border: 0px solid;
+    border-radius: 8px;
+    background-color: {_search_color};
+}}
+
+#theme_board {{
+    background-color: {_background_color};
+    border-radius: 8px;
+    border: 1px solid {_nav_color};
+}}
+#theme_color_label {{
+    color: {_title_color};
+    font-weight: bold;
+    border: 0px solid;
+}}
+#theme_actions {{
+    border: 0px solid;
+    border-radius: 8px;
+    background-color: {_search_color};
 }}
 """
+
+
+def build_stylesheet(theme: Themes) -> str:
+    """
+    Stylesheet of the application for a theme, parsed once by Qt
+
+    Args:
+        theme (Themes): the theme
+
+    Returns:
+        str: the stylesheet
+    """
+    colors = {
+        f"_{color_name}": getattr(theme, color_name) for color_name in theme.list_colors
+    }
+    colors["_error_color"] = GenericColor.RED.value
+    scroll_bars = (
+        scroll_bar_vertical_stylesheet.format(
+            _scope=scope,
+            _width=6,
+            _handle_radius=3,
+            _line_radius=3,
+            _background_color=background_color,
+        )
+        for scope, background_color in (
+            ("#scroll_area_avatar", theme.inner_color),
+            ("#scroll_area_dm", theme.inner_color),
+            ("MessageListView", theme.search_color),
+        )
+    )
+    return "".join(
+        (
+            custom_widgets_stylesheet.format(**colors),
+            *scroll_bars,
+            scroll_bar_vertical_stylesheet.format(
+                _scope="CustomQListWidget",
+                _width=4,
+                _handle_radius=1.5,
+                _line_radius=7,
+                _background_color="transparent",
+            ),
+            layout_stylesheet.format(**colors),
+            entries_stylesheet.format(**colors),
+            popups_stylesheet.format(**colors),
+        )
+    )
+
+
+def set_style_property(widget: QWidget, name: str, value: Any) -> None:
+    """
+    Update a dynamic property selected by the stylesheet, the rules of the
+    widget are matched again without parsing the stylesheet
+
+    Args:
+        widget (QWidget): the widget
+        name (str): name of the property
+        value (Any): value of the property
+    """
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
@@ -3,6 +3,7 @@
 import logging
 import sys
 
+import requests
 from PySide6.QtCore import QSize, Qt
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (
@@ -18,6 +19,7 @@ from PySide6.QtWidgets import (
 
 from src.client.client import Client
 from src.client.controller.main_controller import MainController
+from src.client.view.custom_widget.custom_avatar_label import avatar_pixmap_cache
 from src.client.view.custom_widget.custom_button import CustomQPushButton
 from src.client.view.custom_widget.custom_line_edit import CustomQLineEdit
 from src.client.view.footer import FooterView
@@ -26,9 +28,18 @@ from src.client.view.layout.body_scroll_area import BodyScrollArea
 from src.client.view.left_nav import LeftNavView
 from src.client.view.right_nav import RightNavView
 from src.client.view.rooms_bar import RoomsBarWidget
+from src.client.view.stylesheets.stylesheets import build_stylesheet
 from src.tools.backend import Backend
-from src.tools.constant import IP_API, IP_SERVER, PORT_API, PORT_SERVER
-from src.tools.utils import Icon, ImageAvatar, Themes, icon_from_svg
+from src.tools.constant import IP_API, IP_SERVER, PORT_API, PORT_SERVER, PREWARM_ICONS
+from src.tools.utils import (
+    Icon,
+    ImageAvatar,
+    Themes,
+    icon_cache,
+    icon_from_svg,
+    prewarm_icons,
+    theme,
+)
 
 
 class QtGui:
@@ -51,13 +62,23 @@ class QtGui:
         Quit the GUI
         """
         if self.main_window.controller.api_controller.is_connected:
-            self.main_window.controller.api_controller.send_login_status(
-                username=self.main_window.client.user_name, status=False
-            )
+            # A session ends with the socket, as in the logout
+            if not self.main_window.client.session_token:
+                try:
+                    self.main_window.controller.api_controller.send_login_status(
+                        username=self.main_window.client.user_name, status=False
+                    )
+                except requests.exceptions.RequestException as error:
+                    logging.error(error)
 
             if self.main_window.client.is_connected:
                 self.main_window.client.close_connection()
 
+        logging.info("Icon cache: %s", icon_cache.get_stats())
+        logging.info("Avatar cache: %s", avatar_pixmap_cache.get_stats())
+        logging.info(
+            "API circuit: %s", self.main_window.backend.circuit_breaker.get_stats()
+        )
         logging.info("GUI killed successfully")
         sys.exit()
 
@@ -79,7 +100,12 @@ class MainWindow(QMainWindow):
 
     def __init__(self, title):
         super().__init__()
-        self.theme = Themes()
+        self.theme = theme
+        if PREWARM_ICONS:
+            prewarm_icons(self.theme)
+        # Parsed once, the widgets are styled by object name and property
+        QApplication.instance().setStyleSheet(build_stylesheet(self.theme))
+        self.theme.add_listener(self.update_theme)
         self.showMaximized()
         self.setWindowTitle(title)
 
@@ -96,8 +122,10 @@ class MainWindow(QMainWindow):
         self.frame_name = None
         self.frame_research = None
         self.search_action = None
+        self.api_state_label = None
         self.body_gui_dict = None
         self.scroll_area = None
+        self.login_form = None
 
         # Init controller
         self.controller = MainController(self, self.theme)
@@ -107,6 +135,9 @@ class MainWindow(QMainWindow):
 
         # Init connection to the API
         self.backend = Backend(IP_API, PORT_API, self)
+        self.backend.circuit_breaker.add_listener(
+            self.controller.event_manager.event_api_state
+        )
 
         # GUI settings
         self.setup_gui()
@@ -120,10 +151,8 @@ class MainWindow(QMainWindow):
         """
         # Main widget
         self.main_widget = QWidget()
+        self.main_widget.setObjectName("main_widget")
         self.main_widget.setContentsMargins(0, 0, 0, 0)
-        self.main_widget.setStyleSheet(
-            f"background-color: {self.theme.background_color}"
-        )
         self.setCentralWidget(self.main_widget)
 
         # Main layout
@@ -182,68 +211,49 @@ class MainWindow(QMainWindow):
         self.body_layout.setSpacing(5)
 
         self.upper_widget = QWidget()
+        self.upper_widget.setObjectName("upper_widget")
         self.upper_widget.setContentsMargins(0, 0, 0, 0)
         self.upper_widget.hide()
 
-        self.upper_widget.setStyleSheet(
-            f"background-color: {self.theme.inner_color};\
-            border-radius: 4px;\
-            border: 0px solid {self.theme.nav_color};\
-            margin-left: 5px;\
-            margin-right: 5px;"
-        )
         upper_layout = QHBoxLayout(self.upper_widget)
         upper_layout.setAlignment(Qt.AlignLeft | Qt.AlignTop)
         upper_layout.setContentsMargins(10, 5, 15, 5)
 
         self.frame_title = QWidget()
-        self.frame_title.setStyleSheet(
-            f"color: {self.theme.title_color};\
-            background-color: transparent;\
-            border: 0px solid"
-        )
+        self.frame_title.setObjectName("frame_title")
         self.frame_layout = QHBoxLayout(self.frame_title)
         self.frame_layout.setContentsMargins(0, 0, 0, 0)
         self.frame_layout.setSpacing(5)
 
-        self.frame_icon = QIcon(
-            icon_from_svg(Icon.DOWN_ARROW.value, color=self.theme.title_color)
-        )
-        self.frame_icon_button = CustomQPushButton(
-            "",
-            bg_color_active=self.theme.background_color,
-        )
+        self.frame_icon_button = CustomQPushButton("")
+        self.frame_icon_button.setObjectName("frame_icon_button")
         self.frame_icon_button.setFixedSize(QSize(40, 40))
-        self.frame_icon_button.setIcon(self.frame_icon)
 
         self.frame_name = QLabel("Rooms \n| home")
-        self.frame_name.setStyleSheet(
-            "font-weight: bold;\
-            border: 0px solid;\
-            margin: 0px;"
-        )
+        self.frame_name.setObjectName("frame_name")
         self.frame_research = CustomQLineEdit(
-            place_holder_text="Search in Rooms | home",
-            bg_color=self.theme.search_color,
-            bg_color_active=self.theme.search_color,
-            color=self.theme.title_color,
+            place_holder_text="Search in Rooms | home"
         )
+        self.frame_research.setObjectName("conversation_search")
         self.frame_research.setFixedHeight(30)
         self.frame_research.setFixedWidth(200)
         self.frame_research.setTextMargins(0, 0, 0, 0)
         self.frame_research.setAlignment(Qt.AlignmentFlag.AlignLeft)
-        search_icon = QIcon(
-            icon_from_svg(Icon.SEARCH.value, color=self.theme.title_color)
-        )
-
         self.search_action = self.frame_research.addAction(
-            search_icon, QLineEdit.ActionPosition.TrailingPosition
+            QIcon(), QLineEdit.ActionPosition.TrailingPosition
         )
+        self.update_icons()
 
         self.frame_layout.addWidget(self.frame_icon_button)
         self.frame_layout.addWidget(
             self.frame_name, alignment=Qt.AlignmentFlag.AlignLeft
         )
+
+        # Shown while the API is unavailable
+        self.api_state_label = QLabel("")
+        self.api_state_label.setObjectName("api_state_label")
+        self.api_state_label.hide()
+        self.frame_layout.addWidget(self.api_state_label)
         self.frame_layout.addWidget(
             self.frame_research, stretch=1, alignment=Qt.AlignmentFlag.AlignRight
         )
@@ -263,6 +273,36 @@ class MainWindow(QMainWindow):
 
         self.core_layout.addWidget(self.body_widget)
 
+    def update_icons(self) -> None:
+        """
+        Tint the icons in the colors of the theme
+        """
+        self.frame_icon = icon_from_svg(
+            Icon.DOWN_ARROW.value, color=self.theme.title_color
+        )
+        self.frame_icon_button.setIcon(self.frame_icon)
+        self.search_action.setIcon(
+            icon_from_svg(Icon.SEARCH.value, color=self.theme.title_color)
+        )
+
+    def update_theme(self, new_theme: Themes) -> None:
+        """
+        Restyle the live widgets after a switch of theme, the session is kept
+
+        Args:
+            new_theme (Themes): the theme, with its new colors
+        """
+        # The icons are rasterized in the new colors when set, those of the
+        # previous theme stay cached within the budget for a switch back
+        QApplication.instance().setStyleSheet(build_stylesheet(new_theme))
+
+        self.update_icons()
+        self.header.update_icons()
+        self.footer_widget.update_icons()
+        if self.login_form:
+            self.login_form.update_icons()
+        self.controller.gui_controller.update_theme()
+
     # pylint: disable=unused-argument
     def resize_event(self, event) -> None:
         """
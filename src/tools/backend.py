@@ -1,26 +1,89 @@
 """Module for the backend controller."""
 
 import logging
-import os
-from typing import Optional, Union
+import time
+from typing import Dict, List, Optional, Tuple, Union
 
 import requests
-from PySide6.QtWidgets import QFileDialog, QMainWindow
+from PySide6.QtWidgets import QMainWindow
 
-from src.tools.utils import round_image
+from src.tools.circuit_breaker import CircuitBreaker
+from src.tools.constant import AVATAR_UPLOAD_SIZE
+from src.tools.utils import prepare_avatar
 
 
+# pylint: disable=too-many-public-methods
 class Backend:
     """
     Backend class.
+
+    Every request has the connect and read timeouts of its endpoint, and
+    fails at once while the circuit breaker is open.
     """
 
+    # (connect, read) timeouts by endpoint, in seconds
+    TIMEOUTS: Dict[str, Tuple[float, float]] = {
+        "login": (2.0, 5.0),
+        "upload": (2.0, 10.0),
+        "picture": (1.0, 3.0),
+        "directory": (2.0, 10.0),
+        "dm": (1.0, 3.0),
+        "last_id": (1.0, 2.0),
+        "messages": (1.0, 5.0),
+        "update": (1.0, 3.0),
+        "profile": (1.0, 3.0),
+    }
+
     def __init__(self, ip: str, port: str, parent: Union[QMainWindow, None] = None):
         self.parent = parent
         self.ip = ip
         self.port = port
+        self.circuit_breaker = CircuitBreaker()
+
+    def request(
+        self, method: str, endpoint: str, url: str, **kwargs
+    ) -> requests.Response:
+        """
+        Send a request with the timeouts of its endpoint, through the circuit breaker
 
-    def send_login_form(self, username: str, password: str) -> bool:
+        Args:
+            method (str): HTTP method
+            endpoint (str): key of the timeouts
+            url (str): the url
+
+        Raises:
+            CircuitOpenError: the API is unavailable, nothing is sent
+            requests.exceptions.RequestException: the request failed
+
+        Returns:
+            requests.Response: the response
+        """
+        self.circuit_breaker.before_request()
+        started_at = time.perf_counter()
+        try:
+            response = requests.request(
+                method, url=url, timeout=self.TIMEOUTS[endpoint], **kwargs
+            )
+        except requests.exceptions.RequestException as error:
+            logging.error(
+                "%s %s failed after %.0f ms: %s",
+                method,
+                endpoint,
+                (time.perf_counter() - started_at) * 1000,
+                error,
+            )
+            self.circuit_breaker.record_failure()
+            raise
+
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+        return response
+
+    def send_login_form(
+        self, username: str, password: str
+    ) -> Tuple[int, bool, Optional[str]]:
         """
         Send the login form to the server
 
@@ -29,17 +92,21 @@ class Backend:
             password (str): password
 
         Returns:
-            bool: True if the form has been sent
+            Tuple[int, bool, Optional[str]]: status code, True if the user is
+            already connected, and the session token, None for older APIs
         """
         endpoint = f"http://{self.ip}:{self.port}/user/"
-        response = requests.get(
-            url=f"{endpoint}{username}?password={password}", timeout=5
+        response = self.request(
+            "GET", "login", url=f"{endpoint}{username}?password={password}"
         )
         is_connected: bool = False
+        session_token: Optional[str] = None
         if response.status_code == 200 and response.content:
-            is_connected: bool = response.json()["is_connected"]
+            content = response.json()
+            is_connected: bool = content["is_connected"]
+            session_token = content.get("session_token")
 
-        return response.status_code, is_connected
+        return response.status_code, is_connected, session_token
 
     def send_login_status(self, username: str, status: bool) -> bool:
         """
@@ -55,11 +122,13 @@ class Backend:
         endpoint = (
             f"http://{self.ip}:{self.port}/user/{username}/?is_connected={status}"
         )
-        response = requests.patch(url=endpoint, timeout=5)
+        response = self.request("PATCH", "login", url=endpoint)
 
         return response.status_code == 200
 
-    def send_register_form(self, username: str, password: str) -> bool:
+    def send_register_form(
+        self, username: str, password: str
+    ) -> Tuple[int, bool, Optional[str]]:
         """
         Send the register form to the server
 
@@ -68,7 +137,7 @@ class Backend:
             password (str): password
 
         Returns:
-            bool: True if the form has been sent
+            Tuple[int, bool, Optional[str]]: status code, False and no session token
         """
         endpoint = f"http://{self.ip}:{self.port}/register"
         data = {
@@ -76,40 +145,28 @@ class Backend:
             "password": password,
         }
         header = {"Accept": "application/json"}
-        response = requests.post(url=endpoint, headers=header, json=data, timeout=5)
+        response = self.request(
+            "POST", "login", url=endpoint, headers=header, json=data
+        )
 
-        return response.status_code, False
+        return response.status_code, False, None
 
-    def send_user_icon(self, username: str, picture_path: str = None) -> bool:
+    def send_user_icon(self, username: str, picture_path: str) -> bool:
         """
-        Send the user icon to the server
+        Send the user icon to the server, the image is processed in memory
 
         Args:
             username (str): username
-            picture_path (str, optional): the picture path. Defaults to None.
+            picture_path (str): the picture path
 
         Returns:
             bool: True if the icon has been sent
         """
-        path = picture_path or QFileDialog.getOpenFileName(
-            self.parent,
-        )
-        if not path[0]:
-            return None
-        rounded_image = round_image(path[0])
-        temp_image_path = "./resources/images/temp_rounded_image.png"
-        rounded_image.save(temp_image_path, "PNG")
+        avatar = prepare_avatar(picture_path, AVATAR_UPLOAD_SIZE)
 
         endpoint = f"http://{self.ip}:{self.port}/user/{username}"
-
-        with open(temp_image_path, "rb") as file:
-            files = {"file": file}
-            response = requests.put(url=endpoint, files=files, timeout=5)
-
-        try:
-            os.remove(temp_image_path)
-        except OSError:
-            logging.error("Error while deleting file temp_rounded_image.png")
+        files = {"file": (f"{username}.png", avatar, "image/png")}
+        response = self.request("PUT", "upload", url=endpoint, files=files)
 
         return response.status_code == 200
 
@@ -124,7 +181,7 @@ class Backend:
             Union[bool, bytes]: the icon
         """
         endpoint = f"http://{self.ip}:{self.port}/user/"
-        response = requests.get(url=f"{endpoint}{username}/picture", timeout=5)
+        response = self.request("GET", "picture", url=f"{endpoint}{username}/picture")
         if response.status_code == 200 and response.content:
             return response.content
         return False
@@ -137,11 +194,42 @@ class Backend:
             Union[bool, bytes]: the users
         """
         endpoint = f"http://{self.ip}:{self.port}/users"
-        response = requests.get(url=f"{endpoint}/username", timeout=5)
+        response = self.request("GET", "directory", url=f"{endpoint}/username")
+        if response.status_code == 200 and response.content:
+            return response.json()
+        return False
+
+    def get_users_delta(self, version: Optional[int]) -> Union[bool, dict]:
+        """
+        Get the changes of the user directory since a version
+
+        Args:
+            version (Optional[int]): version of the local directory, None if empty
+
+        Returns:
+            Union[bool, dict]: version, added and removed usernames, is_full
+            when the whole directory is sent
+        """
+        endpoint = f"http://{self.ip}:{self.port}/users/delta"
+        params = {} if version is None else {"since": version}
+        response = self.request("GET", "directory", url=endpoint, params=params)
         if response.status_code == 200 and response.content:
             return response.json()
         return False
 
+    def get_rooms(self) -> Union[bool, List[str]]:
+        """
+        Get the rooms of the server
+
+        Returns:
+            Union[bool, List[str]]: the room names
+        """
+        endpoint = f"http://{self.ip}:{self.port}/rooms"
+        response = self.request("GET", "directory", url=endpoint)
+        if response.status_code == 200 and response.content:
+            return response.json()["rooms"]
+        return False
+
     def get_all_dm_users_username(self, username: str) -> Union[bool, bytes]:
         """
         Get all the users that have a dm with the user
@@ -153,7 +241,23 @@ class Backend:
             Union[bool, bytes]: the users
         """
         endpoint = f"http://{self.ip}:{self.port}/dm"
-        response = requests.get(url=f"{endpoint}?username={username}", timeout=5)
+        response = self.request("GET", "dm", url=f"{endpoint}?username={username}")
+        if response.status_code == 200 and response.content:
+            return response.json()
+        return False
+
+    def get_dm_metadata(self, username: str) -> Union[bool, dict]:
+        """
+        Get the unread count and the last activity of every dm of the user
+
+        Args:
+            username (str): username
+
+        Returns:
+            Union[bool, dict]: the metadata by conversation
+        """
+        endpoint = f"http://{self.ip}:{self.port}/dm/metadata"
+        response = self.request("GET", "dm", url=f"{endpoint}?username={username}")
         if response.status_code == 200 and response.content:
             return response.json()
         return False
@@ -166,7 +270,7 @@ class Backend:
             int: the last message id
         """
         endpoint = f"http://{self.ip}:{self.port}/last_id"
-        response = requests.get(url=endpoint, timeout=5)
+        response = self.request("GET", "last_id", url=endpoint)
         if response.status_code == 200 and response.content:
             return response.json()["last_id"]
         return False
@@ -185,7 +289,7 @@ class Backend:
         endpoint = (
             f"http://{self.ip}:{self.port}/first_id" + f"?user1={user1}&user2={user2}"
         )
-        response = requests.get(url=endpoint, timeout=5)
+        response = self.request("GET", "messages", url=endpoint)
         if response.status_code == 200 and response.content:
             return response.json()["first_id"]
         return False
@@ -209,7 +313,7 @@ class Backend:
             f"http://{self.ip}:{self.port}/messages/"
             + f"?message_id={start}&number={number}&user1={user1}&user2={user2}"
         )
-        response = requests.get(url=endpoint, timeout=5)
+        response = self.request("GET", "messages", url=endpoint)
         if response.status_code == 200 and response.content:
             return response.json()
         return False
@@ -225,7 +329,28 @@ class Backend:
             Union[bool, dict]: the message
         """
         endpoint = f"http://{self.ip}:{self.port}/messages/{message_id}"
-        response = requests.get(url=endpoint, timeout=5)
+        response = self.request("GET", "messages", url=endpoint)
+        if response.status_code == 200 and response.content:
+            return response.json()
+        return False
+
+    def get_messages_by_ids(self, message_ids: List[int]) -> Union[bool, dict]:
+        """
+        Get several messages in one request
+
+        Args:
+            message_ids (List[int]): ids of the messages
+
+        Returns:
+            Union[bool, dict]: the messages
+        """
+        endpoint = f"http://{self.ip}:{self.port}/messages/ids"
+        response = self.request(
+            "GET",
+            "messages",
+            url=endpoint,
+            params={"message_ids": ",".join(map(str, message_ids))},
+        )
         if response.status_code == 200 and response.content:
             return response.json()
         return False
@@ -257,7 +382,9 @@ class Backend:
             "response_id": response_id,
         }
         header = {"Accept": "application/json"}
-        response = requests.post(url=endpoint, headers=header, json=data, timeout=5)
+        response = self.request(
+            "POST", "messages", url=endpoint, headers=header, json=data
+        )
 
         return response.json() if response.status_code == 200 else None
 
@@ -274,7 +401,7 @@ class Backend:
         """
         # pylint: disable=line-too-long
         endpoint = f"http://{self.ip}:{self.port}/messages/{message_id}/reaction/?new_reaction_nb={reaction_nb}"
-        response = requests.patch(url=endpoint, timeout=5)
+        response = self.request("PATCH", "update", url=endpoint)
         return response.status_code
 
     def update_is_readed_status(
@@ -293,7 +420,23 @@ class Backend:
         """
         # pylint: disable=line-too-long
         endpoint = f"http://{self.ip}:{self.port}/messages/readed/?sender={sender}&receiver={receiver}&is_readed={is_readed}"
-        response = requests.patch(url=endpoint, timeout=5)
+        response = self.request("PATCH", "update", url=endpoint)
+        return response.status_code
+
+    def update_is_readed_status_batch(self, conversations: List[dict]) -> int:
+        """
+        Update the is_readed status of the messages of several conversations
+
+        Args:
+            conversations (List[dict]): sender and receiver of each conversation
+
+        Returns:
+            int: status code
+        """
+        endpoint = f"http://{self.ip}:{self.port}/messages/readed/batch"
+        response = self.request(
+            "PATCH", "update", url=endpoint, json={"conversations": conversations}
+        )
         return response.status_code
 
     def get_user_creation_date(self, username: str) -> Union[bool, str]:
@@ -307,7 +450,7 @@ class Backend:
             Union[bool, str]: creation date
         """
         endpoint = f"http://{self.ip}:{self.port}/user/{username}/creation-date"
-        response = requests.get(url=endpoint, timeout=5)
+        response = self.request("GET", "profile", url=endpoint)
         if response.status_code == 200 and response.content:
             response = response.json()
             return response["register_date"], response["description"]
@@ -326,5 +469,5 @@ class Backend:
         """
         endpoint = f"http://{self.ip}:{self.port}/user/{username}/description"
         endpoint += f"?description={description}"
-        response = requests.patch(url=endpoint, timeout=5)
+        response = self.request("PATCH", "profile", url=endpoint)
         return response.status_code == 200
@@ -0,0 +1,151 @@
+"""Module for failing fast while the API is unavailable."""
+
+import logging
+import threading
+import time
+from enum import Enum, unique
+from typing import Callable, Dict, List, Union
+
+import requests
+
+
+@unique
+class CircuitState(Enum):
+    """
+    Enumeration for circuit states
+
+    Args:
+        Enum (Enum): Enum class
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """
+    Raised instead of sending a request while the circuit is open.
+    """
+
+
+# pylint: disable=too-many-instance-attributes
+class CircuitBreaker:
+    """
+    Circuit breaker class.
+
+    After failure_threshold consecutive failures, the circuit opens and the
+    requests fail at once. After reset_timeout, a single request is let
+    through as a probe: the circuit closes if it succeeds, and opens again
+    otherwise.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+
+        self.lock = threading.Lock()
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.is_probing = False
+        self.listeners: List[Callable[[CircuitState], None]] = []
+
+        self.nb_of_requests = 0
+        self.nb_of_failures = 0
+        self.nb_of_rejections = 0
+        self.nb_of_openings = 0
+
+    def add_listener(self, listener: Callable[[CircuitState], None]) -> None:
+        """
+        Call a function at each change of state, from the requesting thread
+
+        Args:
+            listener (Callable[[CircuitState], None]): the function
+        """
+        self.listeners.append(listener)
+
+    def before_request(self) -> None:
+        """
+        Check that a request can be sent
+
+        Raises:
+            CircuitOpenError: the circuit is open, or half-open with a probe
+            already sent
+        """
+        with self.lock:
+            if (
+                self.state == CircuitState.OPEN
+                and self.clock() - self.opened_at >= self.reset_timeout
+            ):
+                self._set_state(CircuitState.HALF_OPEN)
+
+            if self.state == CircuitState.OPEN or (
+                self.state == CircuitState.HALF_OPEN and self.is_probing
+            ):
+                self.nb_of_rejections += 1
+                raise CircuitOpenError("The API is unavailable")
+
+            if self.state == CircuitState.HALF_OPEN:
+                self.is_probing = True
+            self.nb_of_requests += 1
+
+    def record_success(self) -> None:
+        """
+        The request got a response, the API is available
+        """
+        with self.lock:
+            self.consecutive_failures = 0
+            self.is_probing = False
+            if self.state != CircuitState.CLOSED:
+                self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        """
+        The request failed, the circuit opens after too many failures
+        """
+        with self.lock:
+            self.nb_of_failures += 1
+            self.consecutive_failures += 1
+            self.is_probing = False
+            if self.state == CircuitState.HALF_OPEN or (
+                self.state == CircuitState.CLOSED
+                and self.consecutive_failures >= self.failure_threshold
+            ):
+                self.opened_at = self.clock()
+                self.nb_of_openings += 1
+                self._set_state(CircuitState.OPEN)
+
+    def get_stats(self) -> Dict[str, Union[str, int]]:
+        """
+        State and counters of the circuit
+
+        Returns:
+            Dict[str, Union[str, int]]: the stats
+        """
+        with self.lock:
+            return {
+                "state": self.state.value,
+                "requests": self.nb_of_requests,
+                "failures": self.nb_of_failures,
+                "rejections": self.nb_of_rejections,
+                "openings": self.nb_of_openings,
+            }
+
+    def _set_state(self, state: CircuitState) -> None:
+        """
+        Change the state and notify the listeners, called with the lock held
+
+        Args:
+            state (CircuitState): the new state
+        """
+        logging.warning("API circuit %s -> %s", self.state.value, state.value)
+        self.state = state
+        for listener in self.listeners:
+            listener(state)
@@ -19,3 +19,11 @@ class Commands(Enum):
     CONN_NB = 0x0004
     ADD_REACT = 0x0005
     RM_REACT = 0x0006
+    # First frame of an authenticated session, the payload is the session token
+    SESSION = 0x0007
+    # Sent by the server to a new client, the online users separated by ";"
+    PRESENCE_SNAPSHOT = 0x0008
+    # Only the messages of the subscribed rooms are pushed, the payload is the room
+    SUBSCRIBE = 0x0009
+    # 0x000A is the end of frame
+    UNSUBSCRIBE = 0x000B
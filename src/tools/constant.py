@@ -1,5 +1,7 @@
 """Module for storing constants."""
 
+import os.path
+from pathlib import Path
 
 PORT_SERVER = 9999
 PORT_API = 8000
@@ -10,3 +12,33 @@ IP_API = "localhost"
 DEFAULT_CLIENT_NAME = "Messenger"
 SOFT_VERSION = "0.0.1"
 LANGUAGE = "EN"
+
+# Largest avatar rendered by the GUI (38px) at a device pixel ratio of 2
+AVATAR_UPLOAD_SIZE = 76
+
+# Icons are rasterized once at this size, they are displayed at 15 to 50px
+ICON_SIZE = 64
+# Memory used by the rasterized icons, in bytes
+ICON_CACHE_BUDGET = 8 * 1024 * 1024
+# Rasterize the icons of the active theme at startup
+PREWARM_ICONS = True
+# Number of avatar pixmaps kept, for each size, status and background
+AVATAR_CACHE_SIZE = 1024
+# Sizes of the avatars decoded in advance: messages, labels, direct messages, replies
+AVATAR_DECODE_SIZES = (38, 30, 20, 15)
+# Time spent converting the decoded avatars in a frame, in seconds
+AVATAR_FRAME_BUDGET = 0.004
+
+# Number of minutes whose formatted date is kept
+TIMESTAMP_CACHE_SIZE = 4096
+
+# Local message store, one database per user, at the root of the package
+MESSAGE_STORE_DIR = os.path.join(Path(__file__).resolve().parents[2], ".messages")
+MAX_STORED_MESSAGES = 10000
+# Above this number of missed messages, the store is rebuilt instead of synced
+MAX_SYNC_GAP = 500
+# Local copy of the user directory, in MESSAGE_STORE_DIR
+USER_DIRECTORY_FILE = "users.json"
+
+# Theme of the application and the colors of the custom theme
+THEME_CONFIG_FILE = "./config.ini"
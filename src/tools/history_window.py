@@ -0,0 +1,77 @@
+"""Module for the window of materialized messages of a conversation."""
+
+from typing import Dict, Tuple
+
+
+class HistoryWindow:
+    """
+    Rows of a conversation kept materialized around the visible rows, the
+    other rows are kept as compact records and rebuilt once scrolled back.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.dematerialized = 0
+        self.rematerialized = 0
+        self.peak_materialized = 0
+
+    def get_window(
+        self, nb_of_rows: int, first_visible: int, last_visible: int
+    ) -> Tuple[int, int]:
+        """
+        Rows kept materialized, centered on the visible rows
+
+        Args:
+            nb_of_rows (int): number of rows of the conversation
+            first_visible (int): first visible row
+            last_visible (int): last visible row
+
+        Returns:
+            Tuple[int, int]: the first row and the row after the last one,
+            the visible rows are always kept
+        """
+        if nb_of_rows <= self.size:
+            return 0, nb_of_rows
+        first_visible = min(max(first_visible, 0), nb_of_rows - 1)
+        last_visible = min(max(last_visible, first_visible), nb_of_rows - 1)
+        if last_visible - first_visible + 1 >= self.size:
+            return first_visible, last_visible + 1
+
+        center = (first_visible + last_visible + 1) // 2
+        start = max(center - self.size // 2, 0)
+        end = min(start + self.size, nb_of_rows)
+        return max(end - self.size, 0), end
+
+    def record_trim(self, nb_of_dematerialized: int, nb_of_materialized: int) -> None:
+        """
+        Count the rows swapped for records by a trim
+
+        Args:
+            nb_of_dematerialized (int): rows swapped for records
+            nb_of_materialized (int): rows materialized before the trim
+        """
+        self.dematerialized += nb_of_dematerialized
+        self.peak_materialized = max(self.peak_materialized, nb_of_materialized)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Stats of the session
+
+        Returns:
+            Dict[str, int]: rows dematerialized and rematerialized, and the peak
+            of materialized rows in a conversation
+        """
+        return {
+            "size": self.size,
+            "dematerialized": self.dematerialized,
+            "rematerialized": self.rematerialized,
+            "peak_materialized": self.peak_materialized,
+        }
+
+    def clear(self) -> None:
+        """
+        Reset the stats
+        """
+        self.dematerialized = 0
+        self.rematerialized = 0
+        self.peak_materialized = 0
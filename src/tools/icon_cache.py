@@ -0,0 +1,160 @@
+"""Module for the cache of the tinted icons."""
+
+import os
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QColor, QGuiApplication, QImageReader, QPainter, QPixmap
+
+from resources.icon.icon_path import ICON_PATH
+
+IconKey = Tuple[str, Optional[str], int, float]
+
+
+def get_device_pixel_ratio() -> float:
+    """
+    Device pixel ratio of the application
+
+    Returns:
+        float: the ratio, 1 without application
+    """
+    app = QGuiApplication.instance()
+    return app.devicePixelRatio() if app else 1.0
+
+
+class IconCache:
+    """
+    Process-wide cache of the svg icons, rasterized and tinted once for a
+    color, a size and a device pixel ratio. The least recently used icons
+    are dropped above the memory budget.
+    """
+
+    def __init__(self, budget: int) -> None:
+        self.budget = budget
+        self.pixmaps: "OrderedDict[IconKey, QPixmap]" = OrderedDict()
+        self.nb_of_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def render(svg_name: str, color: Optional[str], size: int, dpr: float) -> QPixmap:
+        """
+        Rasterize and tint an svg icon
+
+        Args:
+            svg_name (str): the name of the svg
+            color (Optional[str]): the color, None to keep the svg colors
+            size (int): width and height, in logical pixels
+            dpr (float): device pixel ratio
+
+        Returns:
+            QPixmap: the icon
+        """
+        reader = QImageReader(os.path.join(ICON_PATH, svg_name))
+        reader.setScaledSize(QSize(round(size * dpr), round(size * dpr)))
+        pixmap = QPixmap.fromImage(reader.read())
+        painter = QPainter(pixmap)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
+        if color:
+            painter.fillRect(pixmap.rect(), QColor(color))
+        painter.end()
+        pixmap.setDevicePixelRatio(dpr)
+        return pixmap
+
+    def get(
+        self,
+        svg_name: str,
+        color: Optional[str],
+        size: int,
+        dpr: Optional[float] = None,
+    ) -> QPixmap:
+        """
+        Tinted icon, rasterized on the first request
+
+        Args:
+            svg_name (str): the name of the svg
+            color (Optional[str]): the color, None to keep the svg colors
+            size (int): width and height, in logical pixels
+            dpr (Optional[float], optional): device pixel ratio, the one of the
+            application if None.
+
+        Returns:
+            QPixmap: the icon
+        """
+        key = (svg_name, color, size, dpr or get_device_pixel_ratio())
+        if (pixmap := self.pixmaps.get(key)) is not None:
+            self.hits += 1
+            self.pixmaps.move_to_end(key)
+            return pixmap
+
+        self.misses += 1
+        pixmap = self.render(*key)
+        self.pixmaps[key] = pixmap
+        self.nb_of_bytes += self.get_size(pixmap)
+        # The last icon is kept, even above the budget
+        while self.nb_of_bytes > self.budget and len(self.pixmaps) > 1:
+            _, evicted = self.pixmaps.popitem(last=False)
+            self.nb_of_bytes -= self.get_size(evicted)
+            self.evictions += 1
+        return pixmap
+
+    @staticmethod
+    def get_size(pixmap: QPixmap) -> int:
+        """
+        Memory used by a pixmap
+
+        Args:
+            pixmap (QPixmap): the pixmap
+
+        Returns:
+            int: the size in bytes
+        """
+        return pixmap.width() * pixmap.height() * max(pixmap.depth() // 8, 1)
+
+    def prewarm(
+        self,
+        svg_names: Iterable[str],
+        colors: Iterable[Optional[str]],
+        size: int,
+    ) -> None:
+        """
+        Rasterize the icons of a theme before they are displayed
+
+        Args:
+            svg_names (Iterable[str]): the names of the svg
+            colors (Iterable[Optional[str]]): the colors of the theme
+            size (int): width and height, in logical pixels
+        """
+        colors = tuple(colors)
+        hits, misses = self.hits, self.misses
+        for svg_name in svg_names:
+            for color in colors:
+                self.get(svg_name, color, size)
+        # Prewarming is not a lookup of the application
+        self.hits, self.misses = hits, misses
+
+    def get_stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Stats of the cache
+
+        Returns:
+            Dict[str, Union[int, float]]: lookups, hit rate and memory used
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.pixmaps),
+            "bytes": self.nb_of_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        """
+        Drop the icons, after a theme change
+        """
+        self.pixmaps.clear()
+        self.nb_of_bytes = 0
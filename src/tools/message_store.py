@@ -0,0 +1,354 @@
+"""Module for storing the messages of the user on disk."""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.tools.constant import MAX_STORED_MESSAGES, MESSAGE_STORE_DIR
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    message_id INTEGER PRIMARY KEY,
+    conversation TEXT NOT NULL,
+    sender TEXT NOT NULL,
+    receiver TEXT NOT NULL,
+    message TEXT NOT NULL,
+    reaction_nb INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT,
+    is_readed INTEGER,
+    response_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS messages_conversation
+    ON messages (conversation, message_id);
+CREATE TABLE IF NOT EXISTS conversations (
+    conversation TEXT PRIMARY KEY,
+    first_id INTEGER NOT NULL,
+    last_id INTEGER NOT NULL,
+    is_complete INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+COLUMNS = (
+    "message_id",
+    "sender",
+    "receiver",
+    "message",
+    "reaction_nb",
+    "created_at",
+    "is_readed",
+    "response_id",
+)
+
+
+class MessageStore:
+    """
+    Local store of the messages of a user.
+
+    For each conversation, every message between first_id and last_id
+    is stored, is_complete means that first_id is the first message of the
+    conversation. Messages are returned as the backend returns them.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        path: Optional[str] = None,
+        max_messages: int = MAX_STORED_MESSAGES,
+    ) -> None:
+        self.username = username
+        self.max_messages = max_messages
+        if path is None:
+            os.makedirs(MESSAGE_STORE_DIR, exist_ok=True)
+            path = os.path.join(MESSAGE_STORE_DIR, f"{username}.sqlite3")
+
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+        # Conversations synced during this session, live messages extend them
+        self.synced_conversations: Set[str] = set()
+
+    def conversation_of(self, message: dict) -> str:
+        """
+        Name of the conversation of a message for the user
+
+        Args:
+            message (dict): the message
+
+        Returns:
+            str: the room or the other user of the direct message
+        """
+        if message["receiver"] == self.username:
+            return message["sender"]
+        return message["receiver"]
+
+    def get_coverage(self, conversation: str) -> Optional[Tuple[int, int, bool]]:
+        """
+        Range of the messages stored for a conversation
+
+        Args:
+            conversation (str): the conversation
+
+        Returns:
+            Optional[Tuple[int, int, bool]]: first id, last id and is complete
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT first_id, last_id, is_complete FROM conversations "
+                "WHERE conversation = ?",
+                (conversation,),
+            ).fetchone()
+        return (row[0], row[1], bool(row[2])) if row else None
+
+    def get_last_message_id(self) -> Optional[int]:
+        """
+        Highest message id synced
+
+        Returns:
+            Optional[int]: the message id, None if the store is empty
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT MAX(last_id) FROM conversations"
+            ).fetchone()
+        return row[0]
+
+    def get_last_messages(self, conversation: str, number: int) -> List[dict]:
+        """
+        Last messages stored for a conversation
+
+        Args:
+            conversation (str): the conversation
+            number (int): number of messages
+
+        Returns:
+            List[dict]: the messages, newest first
+        """
+        if not (coverage := self.get_coverage(conversation)):
+            return []
+        return self._select(conversation, coverage[1] + 1, coverage[0], number)
+
+    def get_older_messages(
+        self, start: int, number: int, conversation: str
+    ) -> Optional[List[dict]]:
+        """
+        Messages older than start, if the store has all of them
+
+        Args:
+            start (int): the messages are older than this id
+            number (int): number of messages
+            conversation (str): the conversation
+
+        Returns:
+            Optional[List[dict]]: the messages newest first, None if not stored
+        """
+        coverage = self.get_coverage(conversation)
+        if not coverage or not coverage[0] < start <= coverage[1] + 1:
+            return None
+        first_id, _, is_complete = coverage
+        messages = self._select(conversation, start, first_id, number)
+        if len(messages) == number or is_complete:
+            return messages
+        return None
+
+    def get_messages(self, message_ids: List[int]) -> Dict[int, dict]:
+        """
+        Messages stored by id, in or out of the synced ranges
+
+        Args:
+            message_ids (List[int]): ids of the messages
+
+        Returns:
+            Dict[int, dict]: the messages found by id
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM messages "
+                f"WHERE message_id IN ({', '.join('?' * len(message_ids))})",
+                message_ids,
+            ).fetchall()
+        return {
+            message["message_id"]: message for message in map(self._to_message, rows)
+        }
+
+    @staticmethod
+    def _to_message(row: tuple) -> dict:
+        message = dict(zip(COLUMNS, row))
+        if message["is_readed"] is not None:
+            message["is_readed"] = bool(message["is_readed"])
+        return message
+
+    def _select(
+        self, conversation: str, start: int, first_id: int, number: int
+    ) -> List[dict]:
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM messages "
+                "WHERE conversation = ? AND message_id < ? AND message_id >= ? "
+                "ORDER BY message_id DESC LIMIT ?",
+                (conversation, start, first_id, number),
+            ).fetchall()
+        return [self._to_message(row) for row in rows]
+
+    def add_page(
+        self, conversation: str, messages: List[dict], start: int, number: int
+    ) -> None:
+        """
+        Store a page of the backend, all the messages of the conversation
+        older than start, up to number
+
+        Args:
+            conversation (str): the conversation
+            messages (List[dict]): the messages, newest first
+            start (int): the messages are older than this id
+            number (int): number of messages requested
+        """
+        if not number:
+            return
+        is_complete = len(messages) < number
+        first_id = 0 if is_complete else min(m["message_id"] for m in messages)
+        last_id = start - 1
+
+        with self.lock, self.connection:
+            self._insert(conversation, messages)
+            row = self.connection.execute(
+                "SELECT first_id, last_id, is_complete FROM conversations "
+                "WHERE conversation = ?",
+                (conversation,),
+            ).fetchone()
+            if row and first_id <= row[1] + 1 and row[0] <= last_id + 1:
+                # Ranges are contiguous, merge them
+                is_complete = is_complete or (row[2] and row[0] <= first_id)
+                first_id, last_id = min(first_id, row[0]), max(last_id, row[1])
+            elif row and row[1] > last_id:
+                # Keep the most recent range
+                return
+            elif row:
+                # The new range replaces the older one
+                self.connection.execute(
+                    "DELETE FROM messages WHERE conversation = ? AND message_id < ?",
+                    (conversation, first_id),
+                )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO conversations VALUES (?, ?, ?, ?)",
+                (conversation, first_id, last_id, int(is_complete)),
+            )
+            self._enforce_retention()
+
+    def add_messages(self, messages: List[dict]) -> None:
+        """
+        Store messages out of the synced ranges, as the replied ones
+
+        Args:
+            messages (List[dict]): the messages
+        """
+        with self.lock, self.connection:
+            for message in messages:
+                self._insert(self.conversation_of(message), [message])
+            self._enforce_retention()
+
+    def add_live_message(self, message: dict) -> None:
+        """
+        Store a message received from the server
+
+        Args:
+            message (dict): the message
+        """
+        conversation = self.conversation_of(message)
+        with self.lock, self.connection:
+            self._insert(conversation, [message])
+            if conversation in self.synced_conversations:
+                self.connection.execute(
+                    "UPDATE conversations SET last_id = MAX(last_id, ?) "
+                    "WHERE conversation = ?",
+                    (message["message_id"], conversation),
+                )
+            self._enforce_retention()
+
+    def _insert(self, conversation: str, messages: List[dict]) -> None:
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    message["message_id"],
+                    conversation,
+                    message["sender"],
+                    message["receiver"],
+                    message["message"],
+                    int(message["reaction_nb"] or 0),
+                    message["created_at"],
+                    message["is_readed"],
+                    message["response_id"],
+                )
+                for message in messages
+            ],
+        )
+
+    def _enforce_retention(self) -> None:
+        """
+        Drop the oldest messages when the store is full
+        """
+        row = self.connection.execute(
+            "SELECT message_id FROM messages ORDER BY message_id DESC "
+            "LIMIT 1 OFFSET ?",
+            (self.max_messages,),
+        ).fetchone()
+        if not row:
+            return
+        cutoff = row[0] + 1
+        self.connection.execute("DELETE FROM messages WHERE message_id < ?", (cutoff,))
+        self.connection.execute(
+            "DELETE FROM conversations WHERE last_id < ?", (cutoff,)
+        )
+        self.connection.execute(
+            "UPDATE conversations SET first_id = ?, is_complete = 0 "
+            "WHERE first_id < ?",
+            (cutoff, cutoff),
+        )
+
+    def update_reaction(self, message_id: int, reaction_nb: int) -> None:
+        """
+        Update the number of reactions of a message
+
+        Args:
+            message_id (int): id of the message
+            reaction_nb (int): number of reactions
+        """
+        with self.lock, self.connection:
+            self.connection.execute(
+                "UPDATE messages SET reaction_nb = ? WHERE message_id = ?",
+                (reaction_nb, message_id),
+            )
+
+    def mark_as_read(self, sender: str, receiver: str) -> None:
+        """
+        Mark the messages of a conversation as read
+
+        Args:
+            sender (str): sender name
+            receiver (str): receiver name
+        """
+        with self.lock, self.connection:
+            self.connection.execute(
+                "UPDATE messages SET is_readed = 1 WHERE sender = ? AND receiver = ?",
+                (sender, receiver),
+            )
+
+    def clear(self) -> None:
+        """
+        Remove every message of the store
+        """
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM messages")
+            self.connection.execute("DELETE FROM conversations")
+        self.synced_conversations.clear()
+
+    def close(self) -> None:
+        """
+        Close the database
+        """
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,339 @@
+"""Module for running a graph of dependent steps concurrently."""
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum, unique
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, Signal
+
+
+@unique
+class StepState(Enum):
+    """
+    Enum for the state of a pipeline step
+
+    Args:
+        Enum (Enum): Enum class
+    """
+
+    PENDING = 0
+    FETCHING = 1
+    FETCHED = 2
+    DONE = 3
+    FAILED = 4
+    SKIPPED = 5
+
+
+# pylint: disable=too-many-instance-attributes
+# pylint: disable=too-few-public-methods
+class PipelineStep:
+    """
+    A step of the pipeline.
+
+    The fetch callback runs in a worker thread and receives the results of the
+    previous steps, the apply callback runs in the GUI thread with the fetched result.
+    A step which is not critical does not hold back the steps applied after it
+    when it fails.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        name: str,
+        fetch: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        apply: Optional[Callable[[Any], None]] = None,
+        depends_on: Tuple[str, ...] = (),
+        apply_after: Tuple[str, ...] = (),
+        critical: bool = True,
+    ) -> None:
+        self.name = name
+        self.fetch = fetch
+        self.apply = apply
+        self.depends_on = depends_on
+        self.apply_after = apply_after
+        self.critical = critical
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget the result of a previous run
+        """
+        self.state = StepState.PENDING
+        self.result = None
+        self.started_at: Optional[float] = None
+        self.fetched_at: Optional[float] = None
+        self.done_at: Optional[float] = None
+
+
+class Pipeline(QObject):
+    """
+    Run steps as soon as their dependencies are done.
+
+    Each run has its own workers, the pipeline can be started again once
+    finished or cancelled: every step is run again.
+
+    Args:
+        QObject (QObject): the QObject class
+    """
+
+    step_fetched = Signal(int, str, object)
+    step_failed = Signal(int, str, object)
+    finished = Signal(object)
+
+    def __init__(
+        self, name: str, interactive_step: Optional[str] = None, max_workers: int = 8
+    ) -> None:
+        super().__init__()
+        self.name = name
+        self.interactive_step = interactive_step
+        self.steps: Dict[str, PipelineStep] = {}
+        self.results: Dict[str, Any] = {}
+        self.max_workers = max_workers
+        self.executor: Optional[ThreadPoolExecutor] = None
+        # Results of a previous run are dropped
+        self.nb_of_runs = 0
+        self.started_at: Optional[float] = None
+        self.time_to_interactive: Optional[float] = None
+        self.is_cancelled = False
+        self.is_scheduling = False
+        self.is_finished = False
+
+        self.step_fetched.connect(self._on_step_fetched)
+        self.step_failed.connect(self._on_step_failed)
+
+    # pylint: disable=too-many-arguments
+    def add_step(
+        self,
+        name: str,
+        fetch: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        apply: Optional[Callable[[Any], None]] = None,
+        depends_on: Tuple[str, ...] = (),
+        apply_after: Tuple[str, ...] = (),
+        critical: bool = True,
+    ) -> None:
+        """
+        Add a step, steps can be added while the pipeline is running, a step
+        added once finished is run at the next start
+
+        Args:
+            name (str): unique name of the step
+            fetch (Optional[Callable[[Dict[str, Any]], Any]], optional): worker callback.
+            apply (Optional[Callable[[Any], None]], optional): GUI thread callback.
+            depends_on (Tuple[str, ...], optional): steps needed before fetching.
+            apply_after (Tuple[str, ...], optional): steps needed before applying.
+            critical (bool, optional): if False, its failure does not skip the
+            steps applied after it. Defaults to True.
+        """
+        self.steps[name] = PipelineStep(
+            name, fetch, apply, depends_on, apply_after, critical
+        )
+        if self.started_at is not None and not self.is_finished:
+            self._schedule()
+
+    def start(self) -> None:
+        """
+        Start the pipeline, or run it again
+        """
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=self.name
+        )
+        self.nb_of_runs += 1
+        for step in self.steps.values():
+            step.reset()
+        self.results = {}
+        self.time_to_interactive = None
+        self.is_cancelled = False
+        self.is_finished = False
+        self.started_at = time.perf_counter()
+        self._schedule()
+
+    def cancel(self) -> None:
+        """
+        Cancel the pipeline, pending results are dropped
+        """
+        self.is_cancelled = True
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _is_done(self, names: Tuple[str, ...]) -> bool:
+        return all(
+            name in self.steps and self.steps[name].state == StepState.DONE
+            for name in names
+        )
+
+    def _is_settled(self, names: Tuple[str, ...]) -> bool:
+        # A failed step which is not critical is not waited for
+        return all(
+            self._is_done((name,))
+            or (self._is_failed(name) and not self.steps[name].critical)
+            for name in names
+        )
+
+    def _schedule(self) -> None:
+        """
+        Start the fetch of ready steps and apply the fetched ones
+        """
+        if self.is_cancelled or self.is_scheduling:
+            return
+
+        self.is_scheduling = True
+        try:
+            while self._schedule_ready_steps():
+                pass
+        finally:
+            self.is_scheduling = False
+
+        if not self.is_finished and all(
+            step.state in (StepState.DONE, StepState.FAILED, StepState.SKIPPED)
+            for step in self.steps.values()
+        ):
+            self._report()
+
+    def _schedule_ready_steps(self) -> bool:
+        """
+        Move every ready step to its next state
+
+        Returns:
+            bool: True if a step changed its state
+        """
+        progress = False
+        for step in list(self.steps.values()):
+            if step.state == StepState.PENDING:
+                if any(self._is_failed(name) for name in step.depends_on):
+                    self._skip(step)
+                    progress = True
+                elif self._is_done(step.depends_on):
+                    self._fetch(step)
+                    progress = True
+            elif step.state == StepState.FETCHED and self._is_settled(step.apply_after):
+                self._apply(step)
+                progress = True
+            elif step.state == StepState.FETCHED and any(
+                self._is_failed(name) and self.steps[name].critical
+                for name in step.apply_after
+            ):
+                self._skip(step)
+                progress = True
+        return progress
+
+    def _is_failed(self, name: str) -> bool:
+        return name in self.steps and self.steps[name].state in (
+            StepState.FAILED,
+            StepState.SKIPPED,
+        )
+
+    def _skip(self, step: PipelineStep) -> None:
+        step.state = StepState.SKIPPED
+        logging.warning("%s: step %s skipped", self.name, step.name)
+
+    def _fetch(self, step: PipelineStep) -> None:
+        step.state = StepState.FETCHING
+        step.started_at = time.perf_counter()
+        if not step.fetch:
+            step.fetched_at = step.started_at
+            step.state = StepState.FETCHED
+            return
+        future = self.executor.submit(step.fetch, self.results)
+        future.add_done_callback(
+            partial(self._on_future_done, self.nb_of_runs, step.name)
+        )
+
+    def _on_future_done(self, run: int, name: str, future: Future) -> None:
+        """
+        Called in the worker thread, forward the result to the GUI thread
+        """
+        if future.cancelled():
+            return
+        if error := future.exception():
+            self.step_failed.emit(run, name, error)
+        else:
+            self.step_fetched.emit(run, name, future.result())
+
+    def _on_step_fetched(self, run: int, name: str, result: Any) -> None:
+        if self.is_cancelled or run != self.nb_of_runs:
+            return
+        step = self.steps[name]
+        step.fetched_at = time.perf_counter()
+        step.result = result
+        step.state = StepState.FETCHED
+        self._schedule()
+
+    def _on_step_failed(self, run: int, name: str, error: Exception) -> None:
+        if self.is_cancelled or run != self.nb_of_runs:
+            return
+        logging.error("%s: step %s failed: %s", self.name, name, error)
+        self.steps[name].state = StepState.FAILED
+        self._schedule()
+
+    # pylint: disable=broad-exception-caught
+    def _apply(self, step: PipelineStep) -> None:
+        try:
+            if step.apply:
+                step.apply(step.result)
+        except Exception as error:
+            logging.error("%s: step %s failed: %s", self.name, step.name, error)
+            step.state = StepState.FAILED
+            return
+        step.done_at = time.perf_counter()
+        step.state = StepState.DONE
+        self.results[step.name] = step.result
+
+        if step.name == self.interactive_step:
+            self.time_to_interactive = step.done_at - self.started_at
+            logging.info(
+                "%s: time-to-interactive %.0f ms",
+                self.name,
+                self.time_to_interactive * 1000,
+            )
+
+    def timeline(self) -> List[Dict[str, Any]]:
+        """
+        Timeline of the steps, in milliseconds since the start of the pipeline
+
+        Returns:
+            List[Dict[str, Any]]: one entry per step
+        """
+
+        def since_start(timestamp: Optional[float]) -> Optional[float]:
+            if timestamp is None:
+                return None
+            return round((timestamp - self.started_at) * 1000, 1)
+
+        return [
+            {
+                "step": step.name,
+                "state": step.state.name,
+                "started": since_start(step.started_at),
+                "fetched": since_start(step.fetched_at),
+                "done": since_start(step.done_at),
+            }
+            for step in sorted(
+                self.steps.values(), key=lambda step: step.started_at or 0
+            )
+        ]
+
+    def _report(self) -> None:
+        """
+        Log the timeline and emit it
+        """
+        self.is_finished = True
+        timeline = self.timeline()
+        for entry in timeline:
+            logging.info(
+                "%s: %-24s %-8s started %s ms, fetched %s ms, done %s ms",
+                self.name,
+                entry["step"],
+                entry["state"],
+                entry["started"],
+                entry["fetched"],
+                entry["done"],
+            )
+        total = time.perf_counter() - self.started_at
+        logging.info("%s: completed in %.0f ms", self.name, total * 1000)
+        self.executor.shutdown(wait=False)
+        self.finished.emit(timeline)
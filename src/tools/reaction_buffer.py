@@ -0,0 +1,106 @@
+"""Module for buffering the reactions before sending them."""
+
+from typing import Dict, List, Optional, Tuple
+
+from src.tools.commands import Commands
+
+
+# pylint: disable=too-few-public-methods
+class PendingReaction:
+    """
+    Reactions of the user on a message, not sent yet.
+    """
+
+    def __init__(self, receiver: str, was_reacted: bool, started_at: float) -> None:
+        self.receiver = receiver
+        self.was_reacted = was_reacted
+        self.is_reacted = was_reacted
+        self.nb_react = 0
+        self.nb_of_clicks = 0
+        self.started_at = started_at
+
+
+class ReactionBuffer:
+    """
+    Buffer the reactions of each message during a window, only the final
+    state is sent and toggles cancelling each other are dropped.
+    """
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self.pending: Dict[int, PendingReaction] = {}
+        self.frames_sent = 0
+        self.frames_saved = 0
+
+    # pylint: disable=too-many-arguments
+    def add(
+        self,
+        message_id: int,
+        receiver: str,
+        is_reacted: bool,
+        nb_react: int,
+        now: float,
+    ) -> None:
+        """
+        Record a click on the react button
+
+        Args:
+            message_id (int): id of the message
+            receiver (str): room or user of the conversation
+            is_reacted (bool): the user reacts to the message after the click
+            nb_react (int): number of reactions after the click
+            now (float): time of the click, in seconds
+        """
+        if message_id not in self.pending:
+            self.pending[message_id] = PendingReaction(receiver, not is_reacted, now)
+        reaction = self.pending[message_id]
+        reaction.is_reacted = is_reacted
+        reaction.nb_react = nb_react
+        reaction.nb_of_clicks += 1
+
+    def pop_frames(
+        self, now: Optional[float] = None
+    ) -> List[Tuple[Commands, int, int, str]]:
+        """
+        Frames of the messages whose window is over
+
+        Args:
+            now (Optional[float], optional): current time, every message if None.
+
+        Returns:
+            List[Tuple[Commands, int, int, str]]: command, message id, number of
+            reactions and receiver of each frame to send
+        """
+        frames = []
+        for message_id, reaction in list(self.pending.items()):
+            if now is not None and reaction.started_at + self.window > now:
+                continue
+            del self.pending[message_id]
+
+            if reaction.is_reacted == reaction.was_reacted:
+                self.frames_saved += reaction.nb_of_clicks
+                continue
+            self.frames_sent += 1
+            self.frames_saved += reaction.nb_of_clicks - 1
+            frames.append(
+                (
+                    Commands.ADD_REACT if reaction.is_reacted else Commands.RM_REACT,
+                    message_id,
+                    reaction.nb_react,
+                    reaction.receiver,
+                )
+            )
+        return frames
+
+    def next_deadline(self) -> Optional[float]:
+        """
+        End of the first window
+
+        Returns:
+            Optional[float]: the time, None if nothing is buffered
+        """
+        if not self.pending:
+            return None
+        return (
+            min(reaction.started_at for reaction in self.pending.values()) + self.window
+        )
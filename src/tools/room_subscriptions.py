@@ -0,0 +1,140 @@
+"""Module for the rooms whose messages are pushed to the client."""
+
+from typing import Dict, Iterable, Optional, Set, Union
+
+
+# pylint: disable=too-many-instance-attributes
+class RoomSubscriptions:
+    """
+    Rooms subscribed by the client.
+
+    The server only pushes the messages of the subscribed rooms, the direct
+    messages are always pushed. Older servers push every room: the frames of
+    the unsubscribed rooms are dropped and counted, this is the traffic saved
+    by the servers handling the subscriptions. Until the rooms of the server
+    are listed, a frame can only be told apart as a direct message if it is
+    sent to the user.
+    """
+
+    def __init__(self, rooms: Iterable[str] = ()) -> None:
+        self.rooms: Set[str] = set(rooms)
+        self.subscribed: Set[str] = set()
+        self.is_listed = False
+
+        self.bytes_by_room: Dict[str, int] = {}
+        self.nb_of_frames = 0
+        self.nb_of_bytes = 0
+        self.nb_of_dropped_frames = 0
+        self.nb_of_dropped_bytes = 0
+
+    def set_rooms(self, rooms: Iterable[str]) -> None:
+        """
+        Replace the rooms of the server, the subscriptions of removed rooms
+        are forgotten
+
+        Args:
+            rooms (Iterable[str]): the room names
+        """
+        self.rooms = set(rooms)
+        self.subscribed &= self.rooms
+        self.is_listed = True
+
+    def is_room(self, name: str) -> bool:
+        """
+        Check if a conversation is a room
+
+        Args:
+            name (str): the room or the user of the conversation
+
+        Returns:
+            bool: True for a room, False for a direct message
+        """
+        return name in self.rooms
+
+    def subscribe(self, room: str) -> bool:
+        """
+        Subscribe to a room
+
+        Args:
+            room (str): the room
+
+        Returns:
+            bool: True if the server must be told, False if already subscribed
+        """
+        if room in self.subscribed or room not in self.rooms:
+            return False
+        self.subscribed.add(room)
+        return True
+
+    def unsubscribe(self, room: str) -> bool:
+        """
+        Unsubscribe from a room
+
+        Args:
+            room (str): the room
+
+        Returns:
+            bool: True if the server must be told, False if not subscribed
+        """
+        if room not in self.subscribed:
+            return False
+        self.subscribed.discard(room)
+        return True
+
+    def accepts(
+        self, receiver: str, nb_of_bytes: int, username: Optional[str] = None
+    ) -> bool:
+        """
+        Count a frame received from the server and check if it is displayed
+
+        Args:
+            receiver (str): receiver of the frame, a room or a user
+            nb_of_bytes (int): size of the frame
+            username (Optional[str], optional): the user, the only receiver
+            accepted until the rooms are listed.
+
+        Returns:
+            bool: False if the frame is for an unsubscribed room, or may be
+            for a room not listed yet
+        """
+        self.nb_of_frames += 1
+        self.nb_of_bytes += nb_of_bytes
+        is_unsubscribed = self.is_room(receiver) and receiver not in self.subscribed
+        is_unlisted = (
+            username is not None and not self.is_listed and receiver != username
+        )
+        if is_unsubscribed or is_unlisted:
+            self.nb_of_dropped_frames += 1
+            self.nb_of_dropped_bytes += nb_of_bytes
+            return False
+        if self.is_room(receiver):
+            self.bytes_by_room[receiver] = (
+                self.bytes_by_room.get(receiver, 0) + nb_of_bytes
+            )
+        return True
+
+    def get_stats(self) -> Dict[str, Union[int, Dict[str, int]]]:
+        """
+        Traffic received from the server
+
+        Returns:
+            Dict[str, Union[int, Dict[str, int]]]: the stats
+        """
+        return {
+            "frames": self.nb_of_frames,
+            "bytes": self.nb_of_bytes,
+            "dropped_frames": self.nb_of_dropped_frames,
+            "dropped_bytes": self.nb_of_dropped_bytes,
+            "bytes_by_room": dict(self.bytes_by_room),
+        }
+
+    def clear(self) -> None:
+        """
+        Forget the subscriptions and the stats, the rooms are listed again
+        at the next login
+        """
+        self.subscribed.clear()
+        self.is_listed = False
+        self.bytes_by_room.clear()
+        self.nb_of_frames = self.nb_of_bytes = 0
+        self.nb_of_dropped_frames = self.nb_of_dropped_bytes = 0
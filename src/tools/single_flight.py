@@ -0,0 +1,59 @@
+"""Module for sharing the result of concurrent identical requests."""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Iterable, List
+
+
+# pylint: disable=too-few-public-methods
+class SingleFlight:
+    """
+    Deduplicate concurrent requests by key.
+
+    A key requested while a request for it is already in flight waits for
+    that request instead of sending another one.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.calls: Dict[Hashable, Future] = {}
+
+    def do_many(
+        self,
+        keys: Iterable[Hashable],
+        callback: Callable[[List[Hashable]], Dict[Hashable, Any]],
+    ) -> Dict[Hashable, Any]:
+        """
+        Get the value of every key, the keys not in flight are requested
+        with a single call of the callback
+
+        Args:
+            keys (Iterable[Hashable]): the keys
+            callback (Callable[[List[Hashable]], Dict[Hashable, Any]]): batch request
+
+        Returns:
+            Dict[Hashable, Any]: the value by key, None if not returned
+        """
+        keys = list(dict.fromkeys(keys))
+        with self.lock:
+            owned = [key for key in keys if key not in self.calls]
+            for key in owned:
+                self.calls[key] = Future()
+            waiting = {key: self.calls[key] for key in keys}
+
+        if owned:
+            try:
+                values = callback(owned)
+            # pylint: disable=broad-exception-caught
+            except Exception as error:
+                for key in owned:
+                    waiting[key].set_exception(error)
+            else:
+                for key in owned:
+                    waiting[key].set_result(values.get(key))
+            finally:
+                with self.lock:
+                    for key in owned:
+                        del self.calls[key]
+
+        return {key: future.result() for key, future in waiting.items()}
@@ -0,0 +1,115 @@
+"""Module for parsing and localizing the dates of the messages."""
+
+import datetime
+from typing import Dict, Iterable, List, Optional, Union
+
+from tzlocal import get_localzone
+
+from src.tools.constant import TIMESTAMP_CACHE_SIZE
+
+
+class TimestampService:
+    """
+    Dates of the server, in UTC, displayed in the local timezone.
+
+    The local timezone is resolved once. The dates are parsed with
+    fromisoformat, and the formatted dates are cached by minute: the dates of
+    a minute only differ by their seconds, copied from the date of the server.
+    """
+
+    SERVER_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+    MINUTE_FORMAT = "%d/%m/%Y at %H:%M"
+    # "YYYY-MM-DDTHH:MM" then ":SS"
+    MINUTE_LENGTH = 16
+
+    def __init__(
+        self,
+        timezone: Optional[datetime.tzinfo] = None,
+        max_entries: int = TIMESTAMP_CACHE_SIZE,
+    ) -> None:
+        self.timezone = timezone or get_localzone()
+        self.max_entries = max_entries
+        self.minutes: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, date: str) -> datetime.datetime:
+        """
+        Parse a date of the server, always in UTC
+
+        Args:
+            date (str): the date, in ISO-8601
+
+        Returns:
+            datetime.datetime: the date in UTC
+        """
+        try:
+            parsed = datetime.datetime.fromisoformat(date)
+        except ValueError:
+            parsed = datetime.datetime.strptime(date, self.SERVER_FORMAT)
+        return parsed.replace(tzinfo=datetime.timezone.utc)
+
+    def localize(self, date: Union[str, datetime.datetime]) -> datetime.datetime:
+        """
+        Date in the local timezone
+
+        Args:
+            date (Union[str, datetime.datetime]): the date of the server, or a
+            date in UTC
+
+        Returns:
+            datetime.datetime: the local date
+        """
+        if isinstance(date, str):
+            date = self.parse(date)
+        return date.astimezone(self.timezone)
+
+    def format(self, date: str) -> str:
+        """
+        Date of the server formatted in the local timezone
+
+        Args:
+            date (str): the date, in ISO-8601
+
+        Returns:
+            str: the formatted date
+        """
+        length = self.MINUTE_LENGTH
+        if len(date) < length + 3 or date[length] != ":":
+            return self.localize(date).strftime(f"{self.MINUTE_FORMAT}:%S")
+
+        minute = date[:length]
+        if (formatted := self.minutes.get(minute)) is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            formatted = self.localize(date).strftime(self.MINUTE_FORMAT)
+            self.minutes[minute] = formatted
+            # Oldest minute first
+            if len(self.minutes) > self.max_entries:
+                del self.minutes[next(iter(self.minutes))]
+        return f"{formatted}:{date[length + 1 : length + 3]}"
+
+    def format_many(self, dates: Iterable[str]) -> List[str]:
+        """
+        Format the dates of a whole history page, parsed once per minute
+
+        Args:
+            dates (Iterable[str]): the dates, in ISO-8601
+
+        Returns:
+            List[str]: the formatted dates, in the same order
+        """
+        return [self.format(date) for date in dates]
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Stats of the cache
+
+        Returns:
+            Dict[str, int]: minutes cached and lookups
+        """
+        return {"entries": len(self.minutes), "hits": self.hits, "misses": self.misses}
+
+
+timestamps = TimestampService()
@@ -0,0 +1,104 @@
+"""Module for the local copy of the user directory."""
+
+import json
+import logging
+import os
+from typing import FrozenSet, Iterable, List, Optional
+
+from src.tools.constant import MESSAGE_STORE_DIR, USER_DIRECTORY_FILE
+
+
+class UserDirectory:
+    """
+    Local copy of the usernames of the server.
+
+    The copy is versioned by the server, only the changes since the stored
+    version are fetched at login.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        if path is None:
+            path = os.path.join(MESSAGE_STORE_DIR, USER_DIRECTORY_FILE)
+        self.path = path
+        self.version: Optional[int] = None
+        self.usernames: FrozenSet[str] = frozenset()
+
+    def load(self) -> None:
+        """
+        Read the directory from disk, empty if missing or corrupted
+        """
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+            version, usernames = data["version"], data["usernames"]
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            if not isinstance(error, FileNotFoundError):
+                logging.error("Unable to read the user directory: %s", error)
+            version, usernames = None, []
+
+        self.version = version
+        self.usernames = frozenset(usernames)
+
+    def save(self) -> None:
+        """
+        Write the directory on disk
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            with open(f"{self.path}.tmp", "w", encoding="utf-8") as file:
+                json.dump(
+                    {"version": self.version, "usernames": sorted(self.usernames)},
+                    file,
+                )
+            os.replace(f"{self.path}.tmp", self.path)
+        except OSError as error:
+            logging.error("Unable to write the user directory: %s", error)
+
+    def apply_delta(self, delta: dict) -> None:
+        """
+        Apply the changes sent by the server
+
+        Args:
+            delta (dict): version, added and removed usernames, is_full when
+            the server sends the whole directory
+        """
+        if delta.get("is_full"):
+            usernames = set(delta.get("added", ()))
+        else:
+            usernames = set(self.usernames)
+            usernames.difference_update(delta.get("removed", ()))
+            usernames.update(delta.get("added", ()))
+
+        self.usernames = frozenset(usernames)
+        self.version = delta["version"]
+
+    def replace(self, usernames: Iterable[str]) -> None:
+        """
+        Replace the whole directory, without version
+
+        Args:
+            usernames (Iterable[str]): the usernames
+        """
+        self.usernames = frozenset(usernames)
+        self.version = None
+
+    def search(self, text: str, limit: int, excluded: Iterable[str] = ()) -> List[str]:
+        """
+        Usernames containing a text
+
+        Args:
+            text (str): the searched text
+            limit (int): maximum number of usernames
+            excluded (Iterable[str], optional): usernames never returned.
+
+        Returns:
+            List[str]: the usernames, sorted
+        """
+        excluded = set(excluded)
+        return sorted(
+            username
+            for username in self.usernames
+            if text in username and username not in excluded
+        )[:limit]
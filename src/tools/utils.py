@@ -2,15 +2,16 @@
 
 import configparser
 import logging
-import os
-import sys
 from enum import Enum, unique
-from typing import List, Tuple
+from io import BytesIO
+from typing import Callable, List, Tuple
 
-from PIL import Image, ImageDraw
-from PySide6.QtGui import QColor, QIcon, QPainter, QPixmap
+from PIL import Image, ImageDraw, ImageOps
+from PySide6.QtGui import QColor, QIcon
 
 from resources.icon.icon_path import ICON_PATH
+from src.tools.constant import ICON_CACHE_BUDGET, ICON_SIZE, THEME_CONFIG_FILE
+from src.tools.icon_cache import IconCache
 
 LM_USE_SVG = 1
 
@@ -111,7 +112,11 @@ class GenericColor(Enum):
 # pylint: disable=too-many-instance-attributes
 class Themes:
     """
-    Theme class
+    Theme class, shared by the widgets.
+
+    The colors are switched in place and the listeners restyle the live
+    widgets, the QColor are updated in place too: the widgets keep a
+    reference to them.
 
     Raises:
         NotImplementedError: Theme not found
@@ -129,11 +134,12 @@ class Themes:
         WHITE = 1
         CUSTOM = 2
 
-    def __init__(self):
+    def __init__(self, config_file: str = THEME_CONFIG_FILE):
+        self.config_file = config_file
         self.config = configparser.ConfigParser()
-        self.config.read("./config.ini")
+        self.config.read(self.config_file)
+        self.listeners: List[Callable[["Themes"], None]] = []
 
-        self.theme_name = self.config["THEME"]["theme"]
         self.list_colors = [
             "text_color",
             "title_color",
@@ -144,6 +150,13 @@ class Themes:
             "rooms_color",
             "emoji_color",
         ]
+        self.load_colors()
+
+    def load_colors(self) -> None:
+        """
+        Load the colors of the theme selected in the config
+        """
+        self.theme_name = self.config["THEME"]["theme"]
 
         if self.theme_name == Themes.ThemeColor.BLACK.name:
             self.color = BlackColor.BLACK.value
@@ -151,17 +164,9 @@ class Themes:
             self.title_color = BlackColor.LIGHT_GREY.value
             self.inner_color = BlackColor.DARK_GREY.value
             self.background_color = BlackColor.GREY.value
-            self.rgb_background_color_innactif = QColor(
-                *self.hex_to_rgb(self.background_color)
-            )
-            self.rgb_background_color_actif = QColor(*self.hex_to_rgb(self.inner_color))
             self.nav_color = BlackColor.MIDDLE_GREY.value
             self.search_color = BlackColor.LIGHT_BLACK.value
-            self.rgb_background_color_actif_footer = QColor(
-                *self.hex_to_rgb(self.search_color)
-            )
             self.rooms_color = BlackColor.BLACK.value
-            self.rgb_background_color_rooms = QColor(*self.hex_to_rgb(self.rooms_color))
             self.emoji_color = BlackColor.YELLOW.value
         elif self.theme_name == Themes.ThemeColor.WHITE.name:
             self.color = WhiteColor.WHITE.value
@@ -169,39 +174,35 @@ class Themes:
             self.title_color = WhiteColor.BLACK.value
             self.inner_color = WhiteColor.LIGHT_GREY.value
             self.background_color = WhiteColor.WHITE.value
-            self.rgb_background_color_innactif = QColor(
-                *self.hex_to_rgb(self.background_color)
-            )
-            self.rgb_background_color_actif = QColor(*self.hex_to_rgb(self.inner_color))
             self.nav_color = WhiteColor.WHITE.value
             self.search_color = WhiteColor.GREY.value
-            self.rgb_background_color_actif_footer = QColor(
-                *self.hex_to_rgb(self.search_color)
-            )
             self.rooms_color = WhiteColor.DARK_GREY.value
-            self.rgb_background_color_rooms = QColor(*self.hex_to_rgb(self.rooms_color))
             self.emoji_color = WhiteColor.BLACK.value
         elif self.theme_name == Themes.ThemeColor.CUSTOM.name:
             self.color = self.config["THEME"]["inner_color"]
-            self.text_color = self.config["THEME"]["text_color"]
-            self.title_color = self.config["THEME"]["title_color"]
-            self.inner_color = self.config["THEME"]["inner_color"]
-            self.background_color = self.config["THEME"]["background_color"]
-            self.rgb_background_color_innactif = QColor(
-                *self.hex_to_rgb(self.background_color)
-            )
-            self.rgb_background_color_actif = QColor(*self.hex_to_rgb(self.inner_color))
-            self.nav_color = self.config["THEME"]["nav_color"]
-            self.search_color = self.config["THEME"]["search_color"]
-            self.rgb_background_color_actif_footer = QColor(
-                *self.hex_to_rgb(self.search_color)
-            )
-            self.rooms_color = self.config["THEME"]["rooms_color"]
-            self.rgb_background_color_rooms = QColor(*self.hex_to_rgb(self.rooms_color))
-            self.emoji_color = self.config["THEME"]["emoji_color"]
+            for color_name in self.list_colors:
+                setattr(self, color_name, self.config["THEME"][color_name])
         else:
             raise NotImplementedError("Theme not found")
 
+        self.set_rgb_color("rgb_background_color_innactif", self.background_color)
+        self.set_rgb_color("rgb_background_color_actif", self.inner_color)
+        self.set_rgb_color("rgb_background_color_actif_footer", self.search_color)
+        self.set_rgb_color("rgb_background_color_rooms", self.rooms_color)
+
+    def set_rgb_color(self, name: str, hex_color: str) -> None:
+        """
+        Set a QColor of the theme, the existing QColor is updated in place
+
+        Args:
+            name (str): name of the attribute
+            hex_color (str): hex color
+        """
+        if (color := getattr(self, name, None)) is not None:
+            color.setRgb(*self.hex_to_rgb(hex_color))
+        else:
+            setattr(self, name, QColor(*self.hex_to_rgb(hex_color)))
+
     def hex_to_rgb(self, hex_color: str) -> Tuple[int, int, int]:
         """
         Convert hex color to rgb color
@@ -218,33 +219,46 @@ class Themes:
             int(hex_color[i : i + hlen // 3], 16) for i in range(0, hlen, hlen // 3)
         )
 
-    def switch_theme(self, controller, theme: ThemeColor) -> None:
+    def add_listener(self, listener: Callable[["Themes"], None]) -> None:
         """
-        Switch theme
+        Call a function at each switch of theme, once the colors are loaded
+
+        Args:
+            listener (Callable[[Themes], None]): the function
         """
-        self.config["THEME"]["theme"] = theme.name
-        with open("./config.ini", "w", encoding="utf-8") as configfile:
+        self.listeners.append(listener)
+
+    def switch_theme(self, theme_color: ThemeColor) -> None:
+        """
+        Switch theme, saved in the config and applied to the live widgets
+
+        Args:
+            theme_color (ThemeColor): the theme
+        """
+        self.config["THEME"]["theme"] = theme_color.name
+        with open(self.config_file, "w", encoding="utf-8") as configfile:
             self.config.write(configfile)
 
-        # Restart the app
-        controller.connection_controller.logout()
-        os.execl(sys.executable, os.path.abspath(__file__), *sys.argv)
+        self.load_colors()
+        for listener in self.listeners:
+            listener(self)
 
-    def create_custom_theme(self, controller, list_theme_line_edit: List) -> None:
+    def create_custom_theme(self, list_theme_line_edit: List) -> None:
         """
         Create custom theme
 
         Args:
-            controller (GuiController): the controller of the GUI
             list_theme_line_edit (List[CustomQLineEdit]): list of CustomQLineEdit
         """
+        colors = {}
         for line_edit, color_name in zip(list_theme_line_edit, self.list_colors):
             color = line_edit.text()
             if not color or color[0] != "#" or len(color) != 7:
                 return
-            self.config["THEME"][color_name] = color
+            colors[color_name] = color
 
-        self.switch_theme(controller, Themes.ThemeColor.CUSTOM)
+        self.config["THEME"].update(colors)
+        self.switch_theme(Themes.ThemeColor.CUSTOM)
 
 
 @unique
@@ -261,25 +275,38 @@ class ImageAvatar(Enum):
     EN = "./resources/images/en.png"
 
 
-def icon_from_svg(svg_name: str, color: str) -> QIcon:
+icon_cache = IconCache(ICON_CACHE_BUDGET)
+
+theme = Themes()
+
+
+def icon_from_svg(svg_name: str, color: str, size: int = ICON_SIZE) -> QIcon:
     """
-    Create QIcon from svg
+    Create QIcon from svg, rasterized once for a color and a size
 
     Args:
         svg_name (str): the name of the svg
         color (str): the color of the svg
+        size (int, optional): size of the icon. Defaults to ICON_SIZE.
 
     Returns:
         QIcon: the QIcon
     """
-    path = ICON_PATH
-    pixmap = QPixmap(os.path.join(path, svg_name))
-    painter = QPainter(pixmap)
-    painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
-    if color:
-        painter.fillRect(pixmap.rect(), QColor(color))
-    painter.end()
-    return QIcon(pixmap)
+    return QIcon(icon_cache.get(svg_name, color, size))
+
+
+def prewarm_icons(active_theme: Themes) -> None:
+    """
+    Rasterize the icons in the colors of a theme
+
+    Args:
+        active_theme (Themes): the active theme
+    """
+    icon_cache.prewarm(
+        (icon.value for icon in Icon),
+        (active_theme.text_color, active_theme.title_color, active_theme.emoji_color),
+        ICON_SIZE,
+    )
 
 
 def check_str_len(intput_str: str) -> str:
@@ -297,17 +324,16 @@ def check_str_len(intput_str: str) -> str:
     return f"{intput_str[:13]}.." if len(intput_str) >= len_ else intput_str
 
 
-def round_image(picture_path: str) -> Image:
+def round_image(image: Image) -> Image:
     """
     Round the image
 
     Args:
-        picture_path (str): the path of the image
+        image (Image): the image to round
 
     Returns:
         Image: the rounded image
     """
-    image = Image.open(picture_path)
     mask = Image.new("L", image.size, 0)
     draw = ImageDraw.Draw(mask)
     width, height = image.size
@@ -318,3 +344,29 @@ def round_image(picture_path: str) -> Image:
     rounded_image.paste(image, mask=mask)
 
     return rounded_image
+
+
+def prepare_avatar(picture_path: str, size: int) -> BytesIO:
+    """
+    Decode, downscale, round and encode an avatar in memory
+
+    Args:
+        picture_path (str): the path of the image
+        size (int): the side of the encoded avatar in pixels
+
+    Returns:
+        BytesIO: the PNG encoded avatar
+    """
+    with Image.open(picture_path) as image:
+        # Let the JPEG decoder skip the full resolution decoding
+        image.draft("RGB", (size, size))
+        image = ImageOps.exif_transpose(image)
+        image = ImageOps.fit(
+            image.convert("RGBA"), (size, size), method=Image.Resampling.LANCZOS
+        )
+
+    buffer = BytesIO()
+    round_image(image).save(buffer, "PNG", optimize=True)
+    buffer.seek(0)
+
+    return buffer
@@ -0,0 +1,88 @@
+"""Module for running blocking work outside of the GUI thread."""
+
+import logging
+from typing import Any, Callable, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+# Keep a reference on running workers, Qt does not own the python wrappers
+_running_workers: set = set()
+
+
+# pylint: disable=too-few-public-methods
+class WorkerSignals(QObject):
+    """
+    Signals emitted by a worker, delivered in the thread owning the object.
+
+    Args:
+        QObject (QObject): the QObject class
+    """
+
+    result = Signal(object)
+    error = Signal(object)
+    finished = Signal()
+
+
+# pylint: disable=too-few-public-methods
+class Worker(QRunnable):
+    """
+    Runnable executing a callback in a thread pool.
+
+    Args:
+        QRunnable (QRunnable): the QRunnable class
+    """
+
+    def __init__(self, callback: Callable, *args, **kwargs) -> None:
+        super().__init__()
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    # pylint: disable=broad-exception-caught
+    def run(self) -> None:
+        """
+        Run the callback and emit its result
+        """
+        try:
+            result = self.callback(*self.args, **self.kwargs)
+        except Exception as error:
+            logging.error(error)
+            self.signals.error.emit(error)
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+
+def run_in_background(
+    callback: Callable,
+    *args,
+    on_result: Optional[Callable[[Any], None]] = None,
+    on_error: Optional[Callable[[Exception], None]] = None,
+    pool: Optional[QThreadPool] = None,
+    **kwargs,
+) -> Worker:
+    """
+    Run a callback in a thread pool, the result callbacks are called in the GUI thread
+
+    Args:
+        callback (Callable): blocking function to run
+        on_result (Optional[Callable[[Any], None]], optional): Defaults to None.
+        on_error (Optional[Callable[[Exception], None]], optional): Defaults to None.
+        pool (Optional[QThreadPool], optional): Defaults to the global pool.
+
+    Returns:
+        Worker: the started worker
+    """
+    worker = Worker(callback, *args, **kwargs)
+    if on_result:
+        worker.signals.result.connect(on_result)
+    if on_error:
+        worker.signals.error.connect(on_error)
+
+    _running_workers.add(worker)
+    worker.signals.finished.connect(lambda: _running_workers.discard(worker))
+
+    (pool or QThreadPool.globalInstance()).start(worker)
+    return worker
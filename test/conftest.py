@@ -0,0 +1,8 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+# Created before the test modules, the widgets need a QApplication
+app = QApplication.instance() or QApplication([])
@@ -0,0 +1,104 @@
+import time
+from types import SimpleNamespace
+
+import requests
+from PySide6.QtCore import QCoreApplication
+
+from src.client.controller.messages_controller.avatar_loader_controller import (
+    AvatarLoaderController,
+)
+
+
+class StandInApiController:
+    """
+    Avatar endpoint failing a given number of times
+    """
+
+    def __init__(self, ui, nb_of_failures):
+        self.ui = ui
+        self.nb_of_failures = nb_of_failures
+        self.nb_of_requests = 0
+
+    def fetch_picture(self, username):
+        self.nb_of_requests += 1
+        if self.nb_of_requests <= self.nb_of_failures:
+            raise requests.exceptions.ConnectionError("avatar endpoint down")
+        return f"{username} avatar".encode()
+
+    def set_user_icon(self, username, content):
+        self.ui.users_pict[username] = content or ""
+
+
+class Label:
+    def __init__(self):
+        self.on_visible = None
+        self.content = None
+
+    def paint(self):
+        if self.on_visible is not None:
+            on_visible, self.on_visible = self.on_visible, None
+            on_visible()
+
+    def set_content(self, content):
+        self.content = content
+
+
+def create_loader(nb_of_failures):
+    ui = SimpleNamespace(users_pict={}, users_connected={})
+    api_controller = StandInApiController(ui, nb_of_failures)
+    loader = AvatarLoaderController(SimpleNamespace(api_controller=api_controller), ui)
+    now = [0.0]
+    loader.clock = lambda: now[0]
+    return loader, api_controller, now
+
+
+def wait(loader, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while loader.in_flight and time.perf_counter() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.001)
+    QCoreApplication.processEvents()
+    assert not loader.in_flight
+
+
+def test_failed_fetch_is_retried_after_a_delay():
+    loader, api_controller, now = create_loader(nb_of_failures=2)
+    label = Label()
+    loader.watch("bob", label, label.set_content)
+
+    label.paint()
+    wait(loader)
+    assert not loader.waiting and label.content is None
+    assert loader.failures["bob"].retry_at == loader.RETRY_DELAY
+
+    # Painted again during the delay: nothing is fetched
+    now[0] = 1.0
+    label.paint()
+    assert api_controller.nb_of_requests == 1
+
+    now[0] = 2.0
+    label.paint()
+    wait(loader)
+    # The delay is doubled
+    assert loader.failures["bob"].retry_at == 2.0 + 2 * loader.RETRY_DELAY
+
+    now[0] = 10.0
+    label.paint()
+    wait(loader)
+    assert label.content == b"bob avatar"
+    assert api_controller.nb_of_requests == 3
+    assert not loader.failures
+    assert label.on_visible is None
+
+
+def test_retry_delay_is_bounded():
+    loader, _, now = create_loader(nb_of_failures=10)
+    label = Label()
+    loader.watch("bob", label, label.set_content)
+
+    for _ in range(10):
+        now[0] = loader.failures["bob"].retry_at if loader.failures else 0.0
+        label.paint()
+        wait(loader)
+
+    assert loader.failures["bob"].retry_at - now[0] == loader.MAX_RETRY_DELAY
@@ -0,0 +1,96 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QSize
+from PySide6.QtGui import QColor, QGuiApplication, QImage
+
+from src.client.view.custom_widget.avatar_pixmap_cache import (
+    AvatarPixmapCache,
+    AvatarStatus,
+    decode_avatar,
+)
+
+app = QGuiApplication.instance() or QGuiApplication([])
+
+
+def png(color):
+    image = QImage(64, 64, QImage.Format_ARGB32)
+    image.fill(QColor(color))
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    return data.data()
+
+
+def test_hover_does_not_decode():
+    cache = AvatarPixmapCache(64)
+    avatars = [png(color) for color in ("#ff0000", "#00ff00", "#0000ff")]
+    backgrounds = (QColor("#111111"), QColor("#222222"))
+
+    for avatar in avatars:
+        cache.get(avatar, QSize(30, 30), AvatarStatus.ACTIVATED, backgrounds[0])
+    decodes = cache.get_stats()["decodes"]
+
+    # Enter and leave each entry of the presence list
+    for _ in range(50):
+        for avatar in avatars:
+            for background in backgrounds:
+                cache.get(avatar, QSize(30, 30), AvatarStatus.ACTIVATED, background)
+
+    assert cache.get_stats()["decodes"] == decodes == 3
+
+
+def test_badge_is_composited_on_a_copy():
+    cache = AvatarPixmapCache(64)
+    avatar = png("#00ff00")
+
+    plain = cache.get(avatar, QSize(30, 30), AvatarStatus.IDLE)
+    badged = cache.get(avatar, QSize(30, 30), AvatarStatus.DM, QColor("#000000"))
+
+    corner = (30 - 6, 30 - 6)
+    assert plain.toImage().pixelColor(*corner).name() == "#00ff00"
+    assert badged.toImage().pixelColor(*corner).name() != "#00ff00"
+    assert cache.get_stats()["decodes"] == 1
+
+
+def test_least_recently_used_is_dropped():
+    cache = AvatarPixmapCache(2)
+    avatars = [png(color) for color in ("#ff0000", "#00ff00", "#0000ff")]
+
+    for avatar in avatars:
+        cache.get(avatar, QSize(30, 30), None)
+    cache.get(avatars[0], QSize(30, 30), None)
+
+    assert cache.get_stats()["entries"] == 2
+    assert cache.get_stats()["decodes"] == 4
+
+
+def test_decoded_images_are_converted_without_decoding():
+    cache = AvatarPixmapCache(64)
+    avatar = png("#00ff00")
+
+    cache.add_images(avatar, decode_avatar(avatar, (QSize(30, 30), QSize(15, 15)), 1.0))
+    pixmap = cache.get(avatar, QSize(30, 30), AvatarStatus.ACTIVATED, QColor("#000000"))
+
+    assert pixmap.width() == 30
+    assert pixmap.toImage().pixelColor(5, 5).name() == "#00ff00"
+    assert cache.get_stats()["decodes"] == 0
+    assert cache.get_stats()["pending"] == 1
+
+
+def test_conversion_is_sliced_by_budget():
+    cache = AvatarPixmapCache(64)
+    for color in ("#ff0000", "#00ff00", "#0000ff"):
+        avatar = png(color)
+        cache.add_images(avatar, decode_avatar(avatar, (QSize(30, 30),), 1.0))
+
+    # One image per slice without budget
+    assert cache.convert_images(0)
+    assert cache.convert_images(0)
+    assert not cache.convert_images(0)
+
+    stats = cache.get_stats()
+    assert stats["conversions"] == stats["entries"] == 3
+    assert stats["pending"] == stats["decodes"] == 0
@@ -0,0 +1,51 @@
+import pytest
+
+from src.tools.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_open_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=Clock())
+    for _ in range(3):
+        breaker.before_request()
+        breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_half_open_probe():
+    clock = Clock()
+    states = []
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.add_listener(states.append)
+    breaker.before_request()
+    breaker.record_failure()
+
+    clock.now = 10
+    breaker.before_request()
+    # A single probe at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    clock.now = 20
+    breaker.before_request()
+    breaker.record_success()
+    assert states == [
+        CircuitState.OPEN,
+        CircuitState.HALF_OPEN,
+        CircuitState.OPEN,
+        CircuitState.HALF_OPEN,
+        CircuitState.CLOSED,
+    ]
+    assert breaker.get_stats()["rejections"] == 1
@@ -0,0 +1,40 @@
+from src.tools.history_window import HistoryWindow
+
+
+def test_small_conversation_is_kept():
+    window = HistoryWindow(200)
+
+    assert window.get_window(150, 140, 149) == (0, 150)
+
+
+def test_window_is_centered_and_bounded():
+    window = HistoryWindow(200)
+
+    assert window.get_window(1000, 500, 509) == (405, 605)
+    assert window.get_window(1000, 990, 999) == (800, 1000)
+    assert window.get_window(1000, 0, 9) == (0, 200)
+
+
+def test_visible_rows_are_always_kept():
+    window = HistoryWindow(10)
+
+    assert window.get_window(1000, 100, 149) == (100, 150)
+
+
+def test_scroll_through_long_history():
+    window = HistoryWindow(200)
+    materialized = set()
+    nb_of_rows = 10000
+
+    # Scroll from the bottom to the top and back, 10 rows visible
+    positions = list(range(nb_of_rows - 10, -1, -7)) + list(range(0, nb_of_rows, 7))
+    for first in positions:
+        materialized.update(range(first, min(first + 10, nb_of_rows)))
+        start, end = window.get_window(nb_of_rows, first, first + 9)
+        kept = {row for row in materialized if start <= row < end}
+        window.record_trim(len(materialized) - len(kept), len(materialized))
+        materialized = kept
+        assert len(materialized) <= 200
+
+    assert window.get_stats()["peak_materialized"] <= 210
+    assert window.get_stats()["dematerialized"] > nb_of_rows
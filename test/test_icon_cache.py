@@ -0,0 +1,58 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QGuiApplication
+
+from src.tools.icon_cache import IconCache
+from src.tools.utils import Icon
+
+app = QGuiApplication.instance() or QGuiApplication([])
+
+
+def test_icon_is_rasterized_once():
+    cache = IconCache(1 << 20)
+
+    first = cache.get(Icon.SMILEY.value, "#ff0000", 32, 1.0)
+    second = cache.get(Icon.SMILEY.value, "#ff0000", 32, 1.0)
+
+    assert first.cacheKey() == second.cacheKey()
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_key_includes_color_size_and_ratio():
+    cache = IconCache(1 << 20)
+
+    cache.get(Icon.SMILEY.value, "#ff0000", 32, 1.0)
+    cache.get(Icon.SMILEY.value, "#00ff00", 32, 1.0)
+    cache.get(Icon.SMILEY.value, "#ff0000", 16, 1.0)
+    pixmap = cache.get(Icon.SMILEY.value, "#ff0000", 32, 2.0)
+
+    assert cache.get_stats()["entries"] == 4
+    assert pixmap.width() == 64
+    assert pixmap.toImage().pixelColor(32, 32).name() == "#ff0000"
+
+
+def test_memory_budget():
+    # Room for two 32px icons
+    cache = IconCache(2 * 32 * 32 * 4)
+
+    for icon in (Icon.SMILEY, Icon.REPLY, Icon.CROWN):
+        cache.get(icon.value, "#ff0000", 32, 1.0)
+    cache.get(Icon.SMILEY.value, "#ff0000", 32, 1.0)
+
+    stats = cache.get_stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= 2 * 32 * 32 * 4
+    assert stats["evictions"] == 2
+    assert stats["misses"] == 4
+
+
+def test_prewarm_is_not_counted():
+    cache = IconCache(1 << 20)
+
+    cache.prewarm((Icon.SMILEY.value, Icon.REPLY.value), ("#ff0000",), 32)
+    cache.get(Icon.REPLY.value, "#ff0000", 32, app.devicePixelRatio())
+
+    assert cache.get_stats()["hit_rate"] == 1.0
@@ -0,0 +1,140 @@
+import os
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QRect
+from PySide6.QtWidgets import QApplication, QStyleOptionViewItem
+
+from src.client.view.custom_widget.custom_message_list import MessageListView
+from src.client.view.layout.message_layout import MessageLayout
+
+app = QApplication.instance() or QApplication([])
+
+NB_OF_MESSAGES = 10000
+
+
+class StandInAvatarLoader:
+    placeholder = b""
+
+    def watch(self, *_):
+        pass
+
+
+controller = SimpleNamespace(avatar_loader_controller=StandInAvatarLoader())
+
+
+def create_message(i, response_model=None):
+    return MessageLayout(
+        controller,
+        {"id": ("alice", "bob", "admin")[i % 3], "message": "word " * (i % 40)},
+        nb_react=i % 4,
+        message_id=i,
+        date=f"2024-03-{i % 28 + 1:02d}T10:{i % 60:02d}:00.000000+0000",
+        response_model=response_model,
+    )
+
+
+def create_messages(nb_of_messages):
+    messages = []
+    for i in range(nb_of_messages):
+        response_model = messages[i - 5] if i % 5 == 0 and i else None
+        messages.append(create_message(i, response_model))
+    return messages
+
+
+def create_view(messages):
+    view = MessageListView(controller)
+    view.resize(800, 600)
+    for message in messages:
+        view.model().append_message(message)
+    return view
+
+
+def laid_out_height(delegate, message, width):
+    """
+    Height of a row from the position of its parts, as measured before
+    """
+    geometry = delegate.get_geometry(message, QRect(0, 0, width, 0))
+    bottom = geometry.badge if message.nb_react else geometry.text
+    return max(bottom.bottom() + 1, geometry.avatar.bottom() + 1) + delegate.ROW_SPACING
+
+
+def test_row_is_measured_without_layout(monkeypatch):
+    messages = create_messages(12)
+    view = create_view(messages)
+    delegate = view.itemDelegate()
+    width = view.viewport().width()
+    expected = {
+        message.message_id: laid_out_height(delegate, message, width)
+        for message in messages
+    }
+
+    def lay_out(*_):
+        raise AssertionError("the row is laid out")
+
+    monkeypatch.setattr(delegate, "get_geometry", lay_out)
+    for row, message in enumerate(messages):
+        size = delegate.sizeHint(QStyleOptionViewItem(), view.model().index(row))
+        assert size.height() == expected[message.message_id]
+        assert message.size_cache == (width, size.height())
+        # The date is formatted when the row is painted
+        assert message._date_time is None
+
+    assert messages[0].date_label.startswith("01/03/2024 at")
+
+
+def test_rows_are_numbered():
+    messages = create_messages(6)
+    view = create_view(messages[2:4])
+    model = view.model()
+    model.insert_message(0, messages[1])
+    model.insert_message(0, messages[0])
+    model.append_message(messages[4])
+    model.insert_message(2, messages[5])
+
+    assert [model.row_of(message) for message in messages] == [0, 1, 3, 4, 5, 2]
+
+    record = model.dematerialize(3)
+    assert model.nb_of_materialized == 5
+    assert model.row_of(record) == 3 and model.row_of(messages[2]) == -1
+    model.materializer = lambda _: messages[2]
+    model.materialize(3)
+    assert model.row_of(messages[2]) == 3
+    assert model.nb_of_materialized == 6
+
+    model.remove_message(messages[0])
+    model.remove_message(messages[5])
+    assert [model.row_of(message) for message in messages[1:5]] == [0, 1, 2, 3]
+    assert not model.index_of(messages[0]).isValid()
+    assert model.nb_of_materialized == 4
+
+
+def best_of(function, runs=3):
+    timings = []
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings), result
+
+
+def test_10000_messages():
+    messages = create_messages(NB_OF_MESSAGES)
+
+    view = create_view(messages)
+    delegate = view.itemDelegate()
+    width = view.viewport().width()
+    measured, heights = best_of(
+        lambda: [delegate.get_height(message, width) for message in messages]
+    )
+    layout, laid_out = best_of(
+        lambda: [laid_out_height(delegate, message, width) for message in messages]
+    )
+
+    # Formatted in the constructor before, the dates are cached so the time
+    # saved is too small to be measured reliably
+    assert all(message._date_time is None for message in messages)
+    assert heights == laid_out
+    assert measured < layout
@@ -0,0 +1,111 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from src.tools.constant import MESSAGE_STORE_DIR
+from src.tools.message_store import MessageStore
+
+
+def create_message(message_id, receiver="home", sender="bob"):
+    return {
+        "message_id": message_id,
+        "sender": sender,
+        "receiver": receiver,
+        "message": f"message {message_id}",
+        "reaction_nb": 0,
+        "created_at": "2024-03-01T10:00:00.000000+0000",
+        "is_readed": True,
+        "response_id": None,
+    }
+
+
+def page(first_id, last_id, receiver="home"):
+    """
+    Messages of a backend page, newest first
+    """
+    return [
+        create_message(message_id, receiver)
+        for message_id in range(last_id, first_id - 1, -1)
+    ]
+
+
+@pytest.fixture(name="store")
+def fixture_store():
+    store = MessageStore("alice", ":memory:")
+    yield store
+    store.close()
+
+
+def ids(messages):
+    return [message["message_id"] for message in messages]
+
+
+def test_store_is_at_the_root_of_the_package():
+    root = Path(__file__).resolve().parents[1]
+    assert MESSAGE_STORE_DIR == os.path.join(root, ".messages")
+
+
+def test_contiguous_pages_are_merged(store):
+    store.add_page("home", page(81, 100), start=101, number=20)
+    store.add_page("home", page(61, 80), start=81, number=20)
+
+    assert store.get_coverage("home") == (61, 100, False)
+    assert ids(store.get_older_messages(81, 20, "home")) == list(range(80, 60, -1))
+    assert ids(store.get_last_messages("home", 3)) == [100, 99, 98]
+    # Not stored
+    assert store.get_older_messages(70, 20, "home") is None
+    assert store.get_older_messages(200, 20, "home") is None
+
+
+def test_newer_range_replaces_the_older_one(store):
+    store.add_page("home", page(81, 100), start=101, number=20)
+    store.add_page("home", page(181, 200), start=201, number=20)
+
+    assert store.get_coverage("home") == (181, 200, False)
+    assert not store.get_messages([90])
+
+    # An older range never replaces the newer one
+    store.add_page("home", page(101, 120), start=121, number=20)
+    assert store.get_coverage("home") == (181, 200, False)
+
+
+def test_complete_conversation_stays_complete(store):
+    # Fewer messages than requested: the first message of the conversation
+    store.add_page("bob", page(1, 20, receiver="alice"), start=21, number=30)
+    assert store.get_coverage("bob") == (0, 20, True)
+
+    store.add_page("bob", page(21, 40, receiver="alice"), start=41, number=20)
+    assert store.get_coverage("bob") == (0, 40, True)
+    assert ids(store.get_older_messages(10, 20, "bob")) == list(range(9, 0, -1))
+
+
+def test_retention_drops_the_oldest_messages():
+    store = MessageStore("alice", ":memory:", max_messages=30)
+    store.add_page("bob", page(1, 10, receiver="alice"), start=11, number=20)
+    store.add_page("home", page(11, 40), start=41, number=40)
+
+    assert store.get_coverage("bob") is None
+    # The first messages of home were complete, they are not stored anymore
+    assert store.get_coverage("home") == (11, 40, False)
+
+    store.add_page("home", page(41, 50), start=51, number=10)
+    assert store.get_coverage("home") == (21, 50, False)
+    assert not store.get_messages([20])
+    assert store.get_older_messages(21, 10, "home") is None
+    store.close()
+
+
+def test_live_messages_extend_synced_conversations(store):
+    store.add_page("home", page(81, 100), start=101, number=20)
+    store.add_page("dev", page(1, 10, receiver="dev"), start=11, number=20)
+    store.synced_conversations.add("home")
+
+    store.add_live_message(create_message(101))
+    store.add_live_message(create_message(102, receiver="dev"))
+
+    assert store.get_coverage("home") == (81, 101, False)
+    assert ids(store.get_last_messages("home", 1)) == [101]
+    # Messages may have been missed, the range is not extended
+    assert store.get_coverage("dev") == (0, 10, True)
+    assert store.get_messages([102])
@@ -0,0 +1,119 @@
+import time
+from types import SimpleNamespace
+
+from PySide6.QtCore import QCoreApplication
+
+from src.client.controller.messages_controller.pagination_controller import (
+    PaginationController,
+)
+
+
+class StandInApiController:
+    """
+    History of a conversation, the cursor is ignored by a broken server
+    """
+
+    def __init__(self, nb_of_messages, ignores_cursor=False):
+        self.nb_of_messages = nb_of_messages
+        self.ignores_cursor = ignores_cursor
+        self.requests = []
+
+    def get_history_page(self, start, number, conversation):
+        self.requests.append((start, number, conversation))
+        if self.ignores_cursor:
+            start = self.nb_of_messages + 1
+        first_id = max(start - number, 1)
+        return [
+            {"message_id": message_id, "response_id": None}
+            for message_id in range(start - 1, first_id - 1, -1)
+        ]
+
+    def with_reply_targets(self, messages, _):
+        return messages, {}
+
+
+class StandInMessagesController:
+    def __init__(self, pagination_controller):
+        self.pagination_controller = pagination_controller
+        self.displayed = []
+
+    def display_older_messages(self, messages, **_):
+        for message in messages:
+            self.displayed.append(message["message_id"])
+            self.pagination_controller.track_message("home", message["message_id"])
+
+
+def create_controller(nb_of_messages=100, ignores_cursor=False):
+    api_controller = StandInApiController(nb_of_messages, ignores_cursor)
+    parent = SimpleNamespace(api_controller=api_controller)
+    controller = PaginationController(parent, SimpleNamespace(body_gui_dict={}), {})
+    parent.messages_controller = StandInMessagesController(controller)
+    # The last messages are displayed
+    controller.track_message("home", nb_of_messages - 9)
+    return controller, api_controller, parent.messages_controller
+
+
+def fetch(controller, page_size, timeout=5.0):
+    cursor = controller.get_cursor("home")
+    controller.fetch_next_page("home", page_size)
+    deadline = time.perf_counter() + timeout
+    while cursor.is_loading and time.perf_counter() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.001)
+    assert not cursor.is_loading
+
+
+def test_pages_move_the_cursor_until_the_first_message():
+    controller, api_controller, messages_controller = create_controller()
+    cursor = controller.get_cursor("home")
+
+    fetch(controller, 50)
+    assert cursor.oldest_id == 41 and not cursor.is_exhausted
+    # The last page is smaller than requested
+    fetch(controller, 50)
+    assert cursor.oldest_id == 1 and cursor.is_exhausted
+
+    assert [start for start, *_ in api_controller.requests] == [91, 41]
+    assert messages_controller.displayed == list(range(90, 0, -1))
+
+
+def test_empty_page_exhausts_the_conversation():
+    controller, _, messages_controller = create_controller(nb_of_messages=10)
+
+    fetch(controller, 10)
+    cursor = controller.get_cursor("home")
+    assert cursor.is_exhausted and cursor.oldest_id == 1
+    assert not messages_controller.displayed
+
+
+def test_page_behind_the_cursor_is_not_displayed_again():
+    controller, api_controller, messages_controller = create_controller(
+        ignores_cursor=True
+    )
+
+    fetch(controller, 20)
+    # The newest messages, the ones older than the cursor are displayed
+    assert messages_controller.displayed == list(range(90, 80, -1))
+    cursor = controller.get_cursor("home")
+    assert not cursor.is_exhausted
+
+    # The same page again, the pagination stops
+    fetch(controller, 20)
+    assert cursor.is_exhausted and cursor.oldest_id == 81
+    assert len(messages_controller.displayed) == 10
+    assert len(api_controller.requests) == 2
+
+
+def test_page_of_a_previous_session_is_dropped():
+    controller, _, messages_controller = create_controller()
+    cursor = controller.get_cursor("home")
+    controller.fetch_next_page("home", 10)
+    controller.clear()
+
+    deadline = time.perf_counter() + 0.2
+    while time.perf_counter() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.001)
+
+    assert cursor.is_loading
+    assert not messages_controller.displayed
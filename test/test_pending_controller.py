@@ -0,0 +1,117 @@
+import logging
+import time
+from types import SimpleNamespace
+
+from PySide6.QtCore import QCoreApplication
+
+from src.client.controller.messages_controller.pending_controller import (
+    PendingController,
+)
+
+
+class StandInAvatarLoader:
+    placeholder = b"placeholder"
+
+    def watch(self, *_):
+        pass
+
+    def get_avatar(self, _):
+        return self.placeholder
+
+
+class StandInClient:
+    user_name = "alice"
+
+    def __init__(self, is_connected=True):
+        self.is_connected = is_connected
+        self.sent = []
+
+    def send_data(self, header, payload, receiver, response_id):
+        if not self.is_connected:
+            raise OSError("socket closed")
+        self.sent.append((header, payload, receiver, response_id))
+
+
+def create_controller(is_connected=True, ack_timeout=10000):
+    displayed = []
+    parent = SimpleNamespace(
+        avatar_loader_controller=StandInAvatarLoader(),
+        history_window_controller=SimpleNamespace(get_message=lambda *_: None),
+        update_scroll_bar=lambda: None,
+    )
+    ui = SimpleNamespace(
+        client=StandInClient(is_connected),
+        body_gui_dict={
+            room: SimpleNamespace(add_message=displayed.append)
+            for room in ("home", "dev")
+        },
+    )
+    controller = PendingController(parent, ui)
+    controller.ACK_TIMEOUT = ack_timeout
+    return controller, displayed
+
+
+def wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.001)
+
+
+def test_echo_matches_the_oldest_pending_message():
+    controller, displayed = create_controller()
+    controller.send_message("hi", "home")
+    controller.send_message("hi", "home")
+    controller.send_message("hi", "dev")
+    controller.send_message("hi", "home", response_id=3)
+    first, second, dev, reply = displayed
+
+    assert all(layout.is_pending for layout in displayed)
+    assert first.content == StandInAvatarLoader.placeholder
+    assert controller.acknowledge("home", "hi", None, 10) is first
+    assert controller.acknowledge("home", "hi", 3, 11) is reply
+    assert controller.acknowledge("home", "hi", None, 12) is second
+    # Not pending: sent from another client of the user
+    assert controller.acknowledge("home", "hi", None, 13) is None
+    assert controller.acknowledge("home", "bye", None, 14) is None
+
+    assert (first.message_id, second.message_id, reply.message_id) == (10, 12, 11)
+    assert not first.is_pending and dev.is_pending
+    assert controller.get_latency_stats()["count"] == 3
+
+
+def test_message_without_echo_is_failed():
+    controller, displayed = create_controller(ack_timeout=20)
+    controller.send_message("lost", "home")
+    controller.send_message("echoed", "home")
+    controller.acknowledge("home", "echoed", None, 1)
+    wait(0.1)
+    lost, echoed = displayed
+
+    assert lost.is_failed and lost.date_label == "Not sent"
+    assert not echoed.is_failed
+
+    # A late echo is still matched
+    assert controller.acknowledge("home", "lost", None, 2) is lost
+    assert not lost.is_failed and lost.message_id == 2
+    assert not controller.pending
+
+
+def test_message_not_sent_is_failed_at_once():
+    controller, displayed = create_controller(is_connected=False)
+    controller.send_message("hi", "home")
+
+    assert displayed[0].is_failed
+    assert controller.acknowledge("home", "hi", None, 1) is None
+
+
+def test_latency_is_logged_at_the_end_of_the_session(caplog):
+    controller, _ = create_controller()
+    controller.send_message("hi", "home")
+    controller.acknowledge("home", "hi", None, 1)
+
+    with caplog.at_level(logging.INFO):
+        controller.clear()
+
+    assert "Send to ack latency: {'count': 1" in caplog.text
+    assert controller.get_latency_stats() == {"count": 0}
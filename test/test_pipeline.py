@@ -0,0 +1,155 @@
+import os
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication
+
+from src.tools.pipeline import Pipeline, StepState
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+
+def wait(pipeline, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not pipeline.is_finished and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    assert pipeline.is_finished
+
+
+def fail(_):
+    raise ConnectionError("backend down")
+
+
+def test_steps_are_applied_in_order():
+    applied = []
+    pipeline = Pipeline("test")
+    pipeline.add_step(
+        "slow", fetch=lambda _: time.sleep(0.05) or 1, apply=applied.append
+    )
+    pipeline.add_step(
+        "fast", fetch=lambda _: 2, apply=applied.append, apply_after=("slow",)
+    )
+    pipeline.add_step(
+        "sum",
+        fetch=lambda results: results["slow"] + results["fast"],
+        apply=applied.append,
+        depends_on=("slow", "fast"),
+    )
+    pipeline.start()
+    wait(pipeline)
+
+    assert applied == [1, 2, 3]
+    assert all(step.state == StepState.DONE for step in pipeline.steps.values())
+
+
+def test_failure_skips_the_next_steps():
+    applied = []
+    pipeline = Pipeline("test")
+    pipeline.add_step("down", fetch=fail)
+    pipeline.add_step("fetched_after", fetch=lambda _: 1, depends_on=("down",))
+    pipeline.add_step(
+        "applied_after", fetch=lambda _: 2, apply=applied.append, apply_after=("down",)
+    )
+    pipeline.add_step("independent", fetch=lambda _: 3, apply=applied.append)
+    pipeline.start()
+    wait(pipeline)
+
+    states = {step.name: step.state for step in pipeline.steps.values()}
+    assert states == {
+        "down": StepState.FAILED,
+        "fetched_after": StepState.SKIPPED,
+        "applied_after": StepState.SKIPPED,
+        "independent": StepState.DONE,
+    }
+    assert applied == [3]
+
+
+def test_optional_failure_does_not_hold_back():
+    applied = []
+    pipeline = Pipeline("test")
+    pipeline.add_step("avatar", fetch=fail, critical=False)
+    pipeline.add_step(
+        "page", fetch=lambda _: 1, apply=applied.append, apply_after=("avatar",)
+    )
+    pipeline.add_step(
+        "next_page", fetch=lambda _: 2, apply=applied.append, apply_after=("page",)
+    )
+    pipeline.start()
+    wait(pipeline)
+
+    assert pipeline.steps["avatar"].state == StepState.FAILED
+    assert applied == [1, 2]
+
+
+def test_cancel_drops_pending_results():
+    applied = []
+    release = threading.Event()
+    pipeline = Pipeline("test")
+    pipeline.add_step("blocked", fetch=lambda _: release.wait(5), apply=applied.append)
+    pipeline.start()
+    pipeline.cancel()
+    release.set()
+    time.sleep(0.05)
+    app.processEvents()
+
+    assert not applied
+    assert pipeline.steps["blocked"].state == StepState.FETCHING
+
+
+def test_time_to_interactive():
+    pipeline = Pipeline("test", interactive_step="page")
+    pipeline.add_step("page", fetch=lambda _: time.sleep(0.03))
+    pipeline.add_step("later", fetch=lambda _: time.sleep(0.1))
+    pipeline.start()
+    wait(pipeline)
+
+    timeline = {entry["step"]: entry for entry in pipeline.timeline()}
+    assert 0.03 <= pipeline.time_to_interactive < 0.1
+    assert timeline["page"]["done"] == round(pipeline.time_to_interactive * 1000, 1)
+    assert timeline["later"]["done"] > timeline["page"]["done"]
+
+
+def test_pipeline_runs_twice():
+    applied = []
+    pipeline = Pipeline("test", interactive_step="page")
+    pipeline.add_step("page", fetch=lambda _: 1, apply=applied.append)
+    pipeline.start()
+    wait(pipeline)
+
+    # Added once finished, run at the next start
+    pipeline.add_step(
+        "next_page",
+        fetch=lambda results: results["page"] + 1,
+        apply=applied.append,
+        depends_on=("page",),
+    )
+    assert pipeline.steps["next_page"].state == StepState.PENDING
+    pipeline.start()
+    wait(pipeline)
+
+    assert applied == [1, 1, 2]
+    assert pipeline.results == {"page": 1, "next_page": 2}
+    assert pipeline.time_to_interactive is not None
+
+
+def test_cancelled_run_does_not_reach_the_next_one():
+    applied = []
+    release = threading.Event()
+    pipeline = Pipeline("test")
+    pipeline.add_step(
+        "page", fetch=lambda _: release.wait(5) and "stale", apply=applied.append
+    )
+    pipeline.start()
+    pipeline.cancel()
+
+    pipeline.steps["page"].fetch = lambda _: "fresh"
+    pipeline.start()
+    wait(pipeline)
+    release.set()
+    time.sleep(0.05)
+    app.processEvents()
+
+    assert applied == ["fresh"]
@@ -0,0 +1,45 @@
+import random
+
+from src.tools.commands import Commands
+from src.tools.reaction_buffer import ReactionBuffer
+
+
+def test_net_zero_toggle_is_cancelled():
+    buffer = ReactionBuffer(0.4)
+    buffer.add(1, "home", True, 1, 0.0)
+    buffer.add(1, "home", False, 0, 0.1)
+
+    assert buffer.pop_frames(1.0) == []
+    assert buffer.frames_saved == 2
+
+
+def test_only_final_state_is_sent():
+    buffer = ReactionBuffer(0.4)
+    buffer.add(1, "home", True, 1, 0.0)
+    buffer.add(1, "home", False, 0, 0.1)
+    buffer.add(1, "home", True, 1, 0.2)
+
+    assert buffer.pop_frames(0.3) == []
+    assert buffer.pop_frames(0.4) == [(Commands.ADD_REACT, 1, 1, "home")]
+
+
+def test_reaction_storm():
+    rng = random.Random(0)
+    buffer = ReactionBuffer(0.4)
+    is_reacted = {message_id: False for message_id in range(5)}
+    nb_of_clicks, frames = 0, []
+
+    now = 0.0
+    while now < 10:
+        message_id = rng.randrange(5)
+        is_reacted[message_id] = not is_reacted[message_id]
+        buffer.add(message_id, "home", is_reacted[message_id], 1, now)
+        nb_of_clicks += 1
+        now += rng.uniform(0, 0.05)
+        frames += buffer.pop_frames(now)
+    frames += buffer.pop_frames()
+
+    assert buffer.frames_sent == len(frames)
+    assert buffer.frames_sent + buffer.frames_saved == nb_of_clicks
+    # 408 clicks are sent in 48 frames with this seed
+    assert len(frames) / nb_of_clicks < 0.15
@@ -0,0 +1,92 @@
+import time
+from types import SimpleNamespace
+
+import requests
+from PySide6.QtCore import QCoreApplication
+
+from src.client.controller.api_controller import ApiController
+from src.client.controller.messages_controller.read_state_controller import (
+    ReadStateController,
+)
+
+
+class StandInBackend:
+    """
+    Read status endpoints, the batch one is missing on older APIs
+    """
+
+    def __init__(self, has_batch=True, is_down=False):
+        self.has_batch = has_batch
+        self.is_down = is_down
+        self.batches = []
+        self.updates = []
+
+    def update_is_readed_status_batch(self, conversations):
+        if self.is_down:
+            raise requests.exceptions.ConnectionError("backend down")
+        self.batches.append([entry["sender"] for entry in conversations])
+        return 200 if self.has_batch else 404
+
+    def update_is_readed_status(self, sender, receiver, is_readed):
+        self.updates.append((sender, receiver, is_readed))
+
+
+def create_controller(**kwargs):
+    backend = StandInBackend(**kwargs)
+    ui = SimpleNamespace(backend=backend, client=SimpleNamespace(user_name="alice"))
+    parent = SimpleNamespace(api_controller=ApiController(ui, None))
+    controller = ReadStateController(parent, ui)
+    controller.FLUSH_DELAY = 20
+    return controller, backend
+
+
+def wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.001)
+
+
+def test_receipts_are_sent_in_one_batch():
+    controller, backend = create_controller()
+    for room_name in ("bob", "carol", "dave"):
+        controller.set_unread(room_name)
+    controller.mark_as_read("bob")
+    controller.mark_as_read("carol")
+    # Already read, nothing to send
+    controller.mark_as_read("carol")
+    controller.mark_as_read("erin")
+    assert not backend.batches
+
+    wait(0.2)
+    assert backend.batches == [["bob", "carol"]]
+    assert controller.unread == {"dave"}
+
+
+def test_older_api_gets_one_request_per_conversation():
+    controller, backend = create_controller(has_batch=False)
+    for room_name in ("bob", "carol"):
+        controller.set_unread(room_name)
+        controller.mark_as_read(room_name)
+
+    wait(0.2)
+    assert sorted(backend.updates) == [("bob", "alice", True), ("carol", "alice", True)]
+
+
+def test_failed_receipts_are_unread_again():
+    controller, _ = create_controller(is_down=True)
+    controller.set_unread("bob")
+    controller.mark_as_read("bob")
+
+    wait(0.2)
+    assert controller.unread == {"bob"}
+
+
+def test_failure_after_logout_does_not_reach_the_next_session():
+    controller, _ = create_controller(is_down=True)
+    controller.set_unread("bob")
+    controller.mark_as_read("bob")
+    controller.clear()
+
+    wait(0.2)
+    assert not controller.unread
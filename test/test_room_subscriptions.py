@@ -0,0 +1,96 @@
+from src.tools.room_subscriptions import RoomSubscriptions
+
+ROOMS = ("home", "dev", "random")
+
+
+class StandInServer:
+    """
+    Push the messages to every client, or to the subscribers of the room
+    """
+
+    def __init__(self, filter_rooms):
+        self.filter_rooms = filter_rooms
+        self.clients = {}
+
+    def push(self, sender, receiver, message):
+        frame = f"\x001:{sender}:{receiver}:{message}\n".encode("utf-8")
+        displayed = []
+        for username, subscriptions in self.clients.items():
+            if receiver not in ROOMS and username not in (sender, receiver):
+                continue
+            if (
+                self.filter_rooms
+                and receiver in ROOMS
+                and receiver not in subscriptions.subscribed
+            ):
+                continue
+            if subscriptions.accepts(receiver, len(frame)):
+                displayed.append(username)
+        return displayed
+
+
+def run(filter_rooms):
+    server = StandInServer(filter_rooms)
+    for username, rooms in (("alice", ("home",)), ("bob", ("home", "dev"))):
+        subscriptions = RoomSubscriptions(ROOMS)
+        for room in rooms:
+            subscriptions.subscribe(room)
+        server.clients[username] = subscriptions
+
+    displayed = []
+    for i in range(300):
+        displayed.append(server.push("carol", ROOMS[i % 3], f"message {i}"))
+    displayed.append(server.push("bob", "alice", "direct message"))
+    return server.clients, displayed
+
+
+def test_subscribe_only_once():
+    subscriptions = RoomSubscriptions(ROOMS)
+
+    assert subscriptions.subscribe("dev")
+    assert not subscriptions.subscribe("dev")
+    assert not subscriptions.subscribe("unknown")
+    assert subscriptions.unsubscribe("dev")
+    assert not subscriptions.unsubscribe("dev")
+
+
+def test_direct_messages_are_always_accepted():
+    subscriptions = RoomSubscriptions(ROOMS)
+
+    assert subscriptions.accepts("alice", 10)
+    assert not subscriptions.accepts("dev", 10)
+    assert subscriptions.get_stats()["dropped_bytes"] == 10
+
+
+def test_same_messages_displayed_with_less_traffic():
+    old_clients, old_displayed = run(filter_rooms=False)
+    new_clients, new_displayed = run(filter_rooms=True)
+
+    assert old_displayed == new_displayed
+    for username, subscriptions in new_clients.items():
+        old_stats = old_clients[username].get_stats()
+        new_stats = subscriptions.get_stats()
+        assert new_stats["dropped_bytes"] == 0
+        assert new_stats["bytes"] == old_stats["bytes"] - old_stats["dropped_bytes"]
+
+    # Alice only watches one room of three
+    assert (
+        new_clients["alice"].get_stats()["bytes"] * 2
+        < old_clients["alice"].get_stats()["bytes"]
+    )
+
+
+def test_frames_before_the_rooms_are_listed():
+    subscriptions = RoomSubscriptions(("home",))
+
+    # "dev" may be a room, it is not mistaken for a direct message
+    assert not subscriptions.accepts("dev", 10, "alice")
+    assert subscriptions.accepts("alice", 10, "alice")
+
+    subscriptions.set_rooms(ROOMS)
+    subscriptions.subscribe("dev")
+    assert subscriptions.accepts("dev", 10, "alice")
+    assert subscriptions.accepts("bob", 10, "alice")
+
+    subscriptions.clear()
+    assert not subscriptions.accepts("bob", 10, "alice")
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+from src.client.controller.messages_controller.router_controller import RouterController
+from src.tools.commands import Commands
+
+
+class StandInAvatarController:
+    def __init__(self):
+        self.connected = []
+
+    def add_presence_snapshot(self, payload, _):
+        self.connected += payload.split(":")[2].split(",")
+
+    def add_sender_avatar(self, payload, _):
+        self.connected.append(payload.split(":")[0])
+
+
+class StandInClient:
+    user_name = "alice"
+
+    def __init__(self):
+        self.sent = []
+
+    def send_data(self, header, payload, *_):
+        self.sent.append((header, payload))
+
+
+def create_router():
+    avatar_controller = StandInAvatarController()
+    client = StandInClient()
+    router = RouterController(
+        SimpleNamespace(avatar_controller=avatar_controller),
+        SimpleNamespace(client=client),
+    )
+    return router, avatar_controller, client
+
+
+def test_hello_world_is_not_answered_after_the_snapshot():
+    router, avatar_controller, client = create_router()
+    router.routing_coming_messages(
+        Commands.PRESENCE_SNAPSHOT.value, "server:alice:bob,carol"
+    )
+    for username in ("dave", "erin"):
+        router.routing_coming_messages(
+            Commands.HELLO_WORLD.value, f"{username}:home:HELLO_WORLD"
+        )
+
+    assert avatar_controller.connected == ["bob", "carol", "dave", "erin"]
+    assert not client.sent
+
+
+def test_hello_world_is_answered_without_snapshot():
+    # Older servers do not send the snapshot, the roster is built from replies
+    router, avatar_controller, client = create_router()
+    router.routing_coming_messages(Commands.HELLO_WORLD.value, "bob:home:HELLO_WORLD")
+
+    assert avatar_controller.connected == ["bob"]
+    assert client.sent == [(Commands.WELCOME, Commands.WELCOME.name)]
@@ -0,0 +1,108 @@
+import json
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from src.client.client import Client
+from src.client.controller.api_controller import ApiController, ApiStatus
+from src.tools.backend import Backend
+from src.tools.commands import Commands
+
+LATENCY = 0.05
+
+
+class StandInServer:
+    """
+    REST login and socket server, the user is online from the session frame
+    or from the login status of older APIs
+    """
+
+    def __init__(self, with_session):
+        self.with_session = with_session
+        self.http_requests = []
+        self.online = threading.Event()
+
+        stand_in = self
+
+        class Api(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def reply(self, content):
+                stand_in.http_requests.append((self.command, self.path))
+                time.sleep(LATENCY)
+                body = json.dumps(content).encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                content = {"is_connected": False}
+                if stand_in.with_session:
+                    content["session_token"] = "token"
+                self.reply(content)
+
+            def do_PATCH(self):
+                if "is_connected=True" in self.path:
+                    stand_in.online.set()
+                self.reply({})
+
+        class Socket(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    header = Commands(line[0])
+                    if header == Commands.SESSION and line.endswith(b":token\n"):
+                        stand_in.online.set()
+
+        self.api = ThreadingHTTPServer(("localhost", 0), Api)
+        self.socket = socketserver.ThreadingTCPServer(("localhost", 0), Socket)
+        self.socket.daemon_threads = True
+        for server in (self.api, self.socket):
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def close(self):
+        for server in (self.api, self.socket):
+            server.shutdown()
+            server.server_close()
+
+
+def login(server):
+    ui = SimpleNamespace(
+        backend=Backend("localhost", server.api.server_address[1]),
+        client=Client("localhost", server.socket.server_address[1], "Default"),
+    )
+    api_controller = ApiController(ui, None)
+    api_controller.remove_empty_char_from_entry = lambda: ("alice", "password")
+
+    started_at = time.perf_counter()
+    assert api_controller.send_form(ui.backend.send_login_form) == ApiStatus.SUCCESS
+    ui.client.init_connection()
+    if not ui.client.session_token:
+        ui.client.send_data(Commands.HELLO_WORLD, Commands.HELLO_WORLD.name)
+    assert server.online.wait(5)
+    elapsed = time.perf_counter() - started_at
+
+    ui.client.sock.close()
+    return elapsed
+
+
+@pytest.fixture(name="servers")
+def fixture_servers():
+    servers = {True: StandInServer(True), False: StandInServer(False)}
+    yield servers
+    for server in servers.values():
+        server.close()
+
+
+def test_session_login_is_one_round_trip(servers):
+    old_elapsed = login(servers[False])
+    new_elapsed = login(servers[True])
+
+    assert [method for method, _ in servers[False].http_requests] == ["GET", "PATCH"]
+    assert [method for method, _ in servers[True].http_requests] == ["GET"]
+    assert new_elapsed < 2 * LATENCY <= old_elapsed
@@ -0,0 +1,43 @@
+import threading
+import time
+
+import pytest
+
+from src.tools.single_flight import SingleFlight
+
+
+def test_concurrent_keys_are_requested_once():
+    flight = SingleFlight()
+    requested = []
+
+    def callback(keys):
+        requested.append(sorted(keys))
+        time.sleep(0.05)
+        return {key: key * 10 for key in keys}
+
+    results = [None, None]
+
+    def run(index, keys):
+        results[index] = flight.do_many(keys, callback)
+
+    first = threading.Thread(target=run, args=(0, [1, 2]))
+    first.start()
+    time.sleep(0.01)
+    run(1, [2, 3])
+    first.join()
+
+    assert results == [{1: 10, 2: 20}, {2: 20, 3: 30}]
+    assert requested == [[1, 2], [3]]
+    assert not flight.calls
+
+
+def test_failure_is_shared_and_not_cached():
+    flight = SingleFlight()
+
+    def fail(_):
+        raise ConnectionError("backend down")
+
+    with pytest.raises(ConnectionError):
+        flight.do_many([1], fail)
+
+    assert flight.do_many([1, 2], lambda keys: {1: "one"}) == {1: "one", 2: None}
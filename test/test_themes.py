@@ -0,0 +1,65 @@
+from src.tools.utils import BlackColor, Themes, WhiteColor
+
+
+def write_config(tmp_path, theme="BLACK"):
+    config_file = tmp_path / "config.ini"
+    config_file.write_text(
+        f"""[THEME]
+theme = {theme}
+text_color = #000000
+title_color = #000000
+inner_color = #e4e4e4
+background_color = #FFFFFF
+nav_color = #FFFFFF
+search_color = #CFCFD0
+rooms_color = #A6A6A7
+emoji_color = #000000
+"""
+    )
+    return str(config_file)
+
+
+class FakeLineEdit:
+    def __init__(self, text):
+        self._text = text
+
+    def text(self):
+        return self._text
+
+
+def test_switch_is_saved_and_notified(tmp_path):
+    config_file = write_config(tmp_path)
+    theme = Themes(config_file)
+    notified = []
+    theme.add_listener(notified.append)
+
+    theme.switch_theme(Themes.ThemeColor.WHITE)
+
+    assert notified == [theme]
+    assert theme.text_color == WhiteColor.BLACK.value
+    assert Themes(config_file).theme_name == "WHITE"
+
+
+def test_colors_are_updated_in_place(tmp_path):
+    theme = Themes(write_config(tmp_path))
+    background_color = theme.rgb_background_color_actif
+    assert background_color.name() == BlackColor.DARK_GREY.value.lower()
+
+    theme.switch_theme(Themes.ThemeColor.WHITE)
+
+    assert theme.rgb_background_color_actif is background_color
+    assert background_color.name() == WhiteColor.LIGHT_GREY.value
+
+
+def test_invalid_custom_theme_is_ignored(tmp_path):
+    theme = Themes(write_config(tmp_path))
+    notified = []
+    theme.add_listener(notified.append)
+    colors = ["#123456"] * len(theme.list_colors)
+
+    theme.create_custom_theme([FakeLineEdit(color) for color in colors[:-1] + ["red"]])
+    assert not notified and theme.theme_name == "BLACK"
+
+    theme.create_custom_theme([FakeLineEdit(color) for color in colors])
+    assert notified and theme.theme_name == "CUSTOM"
+    assert theme.emoji_color == "#123456"
@@ -0,0 +1,45 @@
+import datetime
+
+from src.tools.timestamps import TimestampService
+
+PARIS = datetime.timezone(datetime.timedelta(hours=1))
+
+
+def test_date_is_localized_like_strptime():
+    service = TimestampService(PARIS)
+    date = "2024-03-01T23:59:30.123456+0000"
+
+    expected = (
+        datetime.datetime.strptime(date, "%Y-%m-%dT%H:%M:%S.%f%z")
+        .replace(tzinfo=datetime.timezone.utc)
+        .astimezone(PARIS)
+        .strftime("%d/%m/%Y at %H:%M:%S")
+    )
+    assert service.format(date) == expected == "02/03/2024 at 00:59:30"
+
+
+def test_dates_are_cached_by_minute():
+    service = TimestampService(PARIS)
+    page = [f"2024-03-01T10:20:{second:02d}.000000+0000" for second in range(60)]
+
+    formatted = service.format_many(page)
+
+    assert formatted[0] == "01/03/2024 at 11:20:00"
+    assert formatted[59] == "01/03/2024 at 11:20:59"
+    assert service.get_stats() == {"entries": 1, "hits": 59, "misses": 1}
+
+
+def test_oldest_minute_is_dropped():
+    service = TimestampService(PARIS, max_entries=2)
+
+    for minute in range(3):
+        service.format(f"2024-03-01T10:{minute:02d}:00.000000+0000")
+
+    assert service.get_stats()["entries"] == 2
+    assert "2024-03-01T10:00" not in service.minutes
+
+
+def test_short_dates_are_parsed():
+    service = TimestampService(PARIS)
+
+    assert service.format("2024-03-01T10:20") == "01/03/2024 at 11:20:00"
@@ -0,0 +1,125 @@
+import os
+from types import SimpleNamespace
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from src.client.controller.api_controller import ApiController
+from src.tools.user_directory import UserDirectory
+
+app = QApplication.instance() or QApplication([])
+
+
+class StandInServer:
+    """
+    Serve the user directory, with or without the delta endpoint
+    """
+
+    def __init__(self, usernames, has_delta=True):
+        self.has_delta = has_delta
+        self.version = 1
+        self.usernames = set(usernames)
+        self.changes = []
+        self.sent_usernames = 0
+
+    def add(self, username):
+        self.version += 1
+        self.usernames.add(username)
+        self.changes.append((self.version, username, True))
+
+    def remove(self, username):
+        self.version += 1
+        self.usernames.discard(username)
+        self.changes.append((self.version, username, False))
+
+    def get_users_delta(self, version):
+        if not self.has_delta:
+            return False
+        if version is None or version < self.version - len(self.changes):
+            self.sent_usernames += len(self.usernames)
+            return {"version": self.version, "is_full": True, "added": self.usernames}
+
+        added, removed = set(), set()
+        for change_version, username, is_added in self.changes:
+            if change_version <= version:
+                continue
+            (added if is_added else removed).add(username)
+            (removed if is_added else added).discard(username)
+        self.sent_usernames += len(added) + len(removed)
+        return {"version": self.version, "added": added, "removed": removed}
+
+    def get_all_users_username(self):
+        self.sent_usernames += len(self.usernames)
+        return list(self.usernames)
+
+
+def sync(server, path):
+    api_controller = ApiController(SimpleNamespace(backend=server), None)
+    api_controller.user_directory = UserDirectory(str(path))
+    return api_controller.sync_user_directory()
+
+
+def test_directory_is_saved_and_loaded(tmp_path):
+    path = tmp_path / "users.json"
+    directory = UserDirectory(str(path))
+    directory.apply_delta({"version": 3, "is_full": True, "added": ["bob", "alice"]})
+    directory.save()
+
+    loaded = UserDirectory(str(path))
+    loaded.load()
+    assert loaded.version == 3
+    assert loaded.usernames == {"alice", "bob"}
+
+
+def test_corrupted_directory_is_empty(tmp_path):
+    path = tmp_path / "users.json"
+    path.write_text("{not json")
+    directory = UserDirectory(str(path))
+    directory.load()
+
+    assert directory.version is None
+    assert not directory.usernames
+
+
+def test_search():
+    directory = UserDirectory("unused")
+    directory.replace(["alice", "alicia", "bob", "malik"])
+
+    assert directory.search("li", limit=2) == ["alice", "alicia"]
+    assert directory.search("li", limit=10, excluded=["alice"]) == ["alicia", "malik"]
+
+
+def test_only_changes_are_fetched(tmp_path):
+    path = tmp_path / "users.json"
+    server = StandInServer(f"user_{i}" for i in range(500))
+    assert len(sync(server, path).usernames) == 500
+    assert server.sent_usernames == 500
+
+    server.sent_usernames = 0
+    server.add("carol")
+    server.remove("user_0")
+    server.add("dave")
+    server.remove("dave")
+    directory = sync(server, path)
+
+    assert directory.usernames == server.usernames
+    assert directory.version == server.version
+    assert server.sent_usernames == 3
+
+    # Up to date
+    server.sent_usernames = 0
+    assert sync(server, path).usernames == server.usernames
+    assert server.sent_usernames == 0
+
+
+def test_older_api_sends_the_whole_directory(tmp_path):
+    path = tmp_path / "users.json"
+    server = StandInServer(["alice", "bob"], has_delta=False)
+    sync(server, path)
+    server.usernames.add("carol")
+    directory = sync(server, path)
+
+    assert directory.usernames == {"alice", "bob", "carol"}
+    assert directory.version is None
+    assert server.sent_usernames == 5